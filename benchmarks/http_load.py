@@ -0,0 +1,535 @@
+"""
+Нагрузочный тест страниц блога: задержки p50/p95/p99, RPS и SQL-запросы.
+
+По умолчанию создает временную базу SQLite, заполняет ее командой
+seed_blog и вызывает blogicum.wsgi.application в том же процессе из
+нескольких потоков. С --url запросы идут по HTTP на запущенный локальный
+сервер (runserver, gunicorn, uvicorn для ASGI); данные для сценариев
+берутся из базы проекта.
+
+Число SQL-запросов на запрос берется из /metrics/ (см.
+blogicum.instrumentation) как разница счетчиков до и после сценария,
+поэтому сервер должен отвечать на /metrics/ клиенту из INTERNAL_IPS
+или с токеном METRICS_TOKEN из настроек.
+
+Результаты сохраняются в JSON (--output) и сравниваются с прошлым
+прогоном (--compare).
+
+Запуск из корня репозитория:
+    python benchmarks/http_load.py --posts 100000 --output before.json
+    python benchmarks/http_load.py --posts 100000 --compare before.json
+    python benchmarks/http_load.py --url http://127.0.0.1:8000
+"""
+import argparse
+import http.client
+import io
+import json
+import platform
+import re
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from query_plans import setup_django
+
+BENCH_USERNAME = 'bench-load'
+BENCH_PASSWORD = 'bench-load-password'
+# Ссылка «>>» пагинатора: курсор или номер следующей страницы
+_NEXT_PAGE = re.compile(r'href="\?((?:cursor|page)=[^"]*)">\s*>>')
+_SAMPLE = re.compile(r'^(\w+)\{view="([^"]*)"\} (\S+)$', re.MULTILINE)
+# Ключи результатов, которые выводятся и сравниваются
+COLUMNS = ('rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')
+
+
+class Session:
+    """
+    Клиент с cookie одного пользователя: сессия и CSRF-токен.
+
+    Редиректы не выполняются — замеряется ровно один запрос.
+    """
+
+    def __init__(self):
+        self.cookies = {}
+
+    def request(self, method, path, data=None, headers=None):
+        """
+        Выполняет запрос.
+
+        Args:
+            method: 'GET' или 'POST'
+            path: путь с параметрами
+            data: поля формы для POST (CSRF-токен добавляется сам)
+            headers: дополнительные заголовки
+
+        Returns:
+            tuple: (статус, тело ответа)
+        """
+        body = b''
+        headers = dict(headers or {})
+        if method == 'POST':
+            data = {
+                **(data or {}),
+                'csrfmiddlewaretoken': self.cookies.get('csrftoken', ''),
+            }
+            body = urlencode(data).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(
+                f'{name}={value}' for name, value in self.cookies.items()
+            )
+        status, response_headers, content = self.send(
+            method, path, body, headers
+        )
+        for name, value in response_headers:
+            if name.lower() == 'set-cookie':
+                for morsel in SimpleCookie(value).values():
+                    self.cookies[morsel.key] = morsel.value
+        return status, content
+
+    def send(self, method, path, body, headers):
+        raise NotImplementedError
+
+    def login(self, username, password):
+        """Входит на сайт; вызывается при подготовке, не замеряется."""
+        self.request('GET', '/auth/login/')
+        status, _ = self.request('POST', '/auth/login/', {
+            'username': username, 'password': password,
+        })
+        if status != 302:
+            raise RuntimeError(f'Не удалось войти как {username}: {status}')
+
+    def close(self):
+        pass
+
+
+class WsgiSession(Session):
+    """Вызов WSGI-приложения в текущем процессе."""
+
+    def __init__(self, application):
+        super().__init__()
+        self.application = application
+
+    def send(self, method, path, body, headers):
+        path, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'REMOTE_ADDR': '127.0.0.1',
+            'SERVER_NAME': 'localhost',
+            'HTTP_HOST': 'localhost',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body),
+        }
+        for name, value in headers.items():
+            key = name.upper().replace('-', '_')
+            if key != 'CONTENT_TYPE':
+                key = f'HTTP_{key}'
+            environ[key] = value
+        setup_testing_defaults(environ)
+        started = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            started['status'] = int(status.split()[0])
+            started['headers'] = response_headers
+
+        result = self.application(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return started['status'], started['headers'], content
+
+
+class HttpSession(Session):
+    """Запросы по HTTP с keep-alive к запущенному серверу."""
+
+    def __init__(self, url):
+        super().__init__()
+        parts = urlsplit(url)
+        self.connection = http.client.HTTPConnection(
+            parts.hostname, parts.port or 80, timeout=60
+        )
+
+    def send(self, method, path, body, headers):
+        self.connection.request(method, path, body or None, headers)
+        response = self.connection.getresponse()
+        return response.status, response.getheaders(), response.read()
+
+    def close(self):
+        self.connection.close()
+
+
+@dataclass
+class Scenario:
+    """Сценарий: один вид запроса, повторяемый всеми клиентами."""
+    name: str
+    path: str
+    method: str = 'GET'
+    data: dict = None
+    login: bool = False
+    expected: int = 200
+
+
+@dataclass
+class Result:
+    """Замеры сценария."""
+    name: str
+    requests: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    latencies: list = field(default_factory=list)
+    queries: int = None
+
+    def summary(self):
+        latencies = sorted(self.latencies) or [0.0]
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        else:
+            cuts = latencies * 99
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'rps': round(self.requests / self.seconds, 1)
+            if self.seconds else 0.0,
+            'mean_ms': round(statistics.fmean(latencies) * 1000, 2),
+            'p50_ms': round(cuts[49] * 1000, 2),
+            'p95_ms': round(cuts[94] * 1000, 2),
+            'p99_ms': round(cuts[98] * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2),
+            'queries_per_request': (
+                round(self.queries / self.requests, 2)
+                if self.queries is not None and self.requests else None
+            ),
+        }
+
+
+def query_counters(session):
+    """
+    Суммарные счетчики /metrics/ без запросов к самим метрикам.
+
+    Returns:
+        tuple | None: (запросов, SQL-запросов) или None без /metrics/
+    """
+    from django.conf import settings
+
+    headers = {}
+    if settings.METRICS_TOKEN:
+        headers['Authorization'] = f'Bearer {settings.METRICS_TOKEN}'
+    status, content = session.request('GET', '/metrics/', headers=headers)
+    if status != 200:
+        return None
+    totals = {'blogicum_requests_total': 0, 'blogicum_db_queries_total': 0}
+    for name, view, value in _SAMPLE.findall(content.decode()):
+        if name in totals and view != 'metrics':
+            totals[name] += float(value)
+    return (
+        totals['blogicum_requests_total'],
+        totals['blogicum_db_queries_total'],
+    )
+
+
+def deep_page(session, depth):
+    """Путь страницы главной, до которой depth раз нажали «>>»."""
+    path = '/'
+    for _ in range(depth):
+        _, content = session.request('GET', path)
+        match = _NEXT_PAGE.search(content.decode())
+        if not match:
+            break
+        path = f'/?{match.group(1)}'
+    return path
+
+
+def build_scenarios(session, depth):
+    """Сценарии на данных текущей базы."""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count, Q
+    from django.urls import reverse
+
+    from blog.models import Category
+    from blog.utils import query_post
+
+    category = Category.objects.filter(is_published=True).annotate(
+        total=Count('posts', filter=Q(posts__is_published=True))
+    ).order_by('-total').first()
+    author = get_user_model().objects.annotate(
+        total=Count('posts')
+    ).order_by('-total').first()
+    # Пост с самым длинным обсуждением
+    thread = query_post().order_by('-comment_count').first()
+    login = {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}
+    return [
+        Scenario('index', '/'),
+        Scenario('deep_pagination', deep_page(session, depth)),
+        Scenario('category', reverse(
+            'blog:category_posts', args=[category.slug]
+        )),
+        Scenario('profile', reverse('blog:profile', args=[author.username])),
+        Scenario('post_detail', reverse(
+            'blog:post_detail', args=[thread.pk]
+        )),
+        Scenario(
+            'add_comment',
+            reverse('blog:add_comment', args=[thread.pk]),
+            method='POST',
+            data={'text': 'Комментарий нагрузочного теста'},
+            login=True,
+            expected=302,
+        ),
+        Scenario(
+            'login', '/auth/login/', method='POST', data=login,
+            expected=302,
+        ),
+    ]
+
+
+def prepare_client(session, scenario, warmup):
+    """Вход или получение CSRF-cookie и прогрев клиента перед замером."""
+    if scenario.login:
+        session.login(BENCH_USERNAME, BENCH_PASSWORD)
+    else:
+        session.request('GET', '/auth/login/')
+    for _ in range(warmup):
+        session.request(scenario.method, scenario.path, scenario.data)
+
+
+def timed_requests(session, scenario, result, counter, lock):
+    """
+    Выполняет запросы сценария, пока не исчерпан общий счетчик,
+    и записывает их время в result.
+    """
+    while True:
+        with lock:
+            if next(counter, None) is None:
+                return
+        started = time.perf_counter()
+        status, _ = session.request(
+            scenario.method, scenario.path, scenario.data
+        )
+        elapsed = time.perf_counter() - started
+        with lock:
+            result.requests += 1
+            result.latencies.append(elapsed)
+            result.errors += status != scenario.expected
+
+
+def measure(result, threads, barrier, metrics_session):
+    """
+    Засекает время работы клиентов и снимает счетчики /metrics/ до
+    и после замера.
+    """
+    try:
+        barrier.wait()
+        before = query_counters(metrics_session)
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        return
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    result.seconds = time.perf_counter() - started
+    after = query_counters(metrics_session)
+    if before and after and after[0] - before[0] == result.requests:
+        result.queries = int(after[1] - before[1])
+
+
+def run_scenario(scenario, make_session, concurrency, requests, warmup):
+    """
+    Выполняет сценарий: concurrency клиентов делят requests запросов.
+
+    Подготовка (вход, CSRF-cookie) и warmup запросов каждого клиента
+    не входят в замер.
+    """
+    from django.db import connections
+
+    result = Result(scenario.name)
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+    failures = []
+
+    def client():
+        session = make_session()
+        try:
+            prepare_client(session, scenario, warmup)
+            # Все готовы; старт после того, как сняты счетчики /metrics/
+            barrier.wait()
+            barrier.wait()
+            timed_requests(session, scenario, result, counter, lock)
+        except Exception as error:
+            failures.append(error)
+            barrier.abort()
+        finally:
+            session.close()
+            connections.close_all()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    metrics_session = make_session()
+    measure(result, threads, barrier, metrics_session)
+    for thread in threads:
+        thread.join()
+    metrics_session.close()
+    if failures:
+        raise failures[0]
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    """Таблица результатов; с baseline — изменение в процентах."""
+    print(f'\n{"сценарий":<16}{"RPS":>9}{"p50 мс":>10}{"p95 мс":>10}'
+          f'{"p99 мс":>10}{"SQL/запр":>10}{"ошибки":>8}')
+    for name, summary in results.items():
+        cells = []
+        for column in COLUMNS:
+            value = summary[column]
+            cells.append(f'{"—" if value is None else value:>9}')
+        print(f'{name:<16}' + ' '.join(cells) + f'{summary["errors"]:>8}')
+        old = (baseline or {}).get(name)
+        if old:
+            changes = []
+            for column in COLUMNS:
+                if old.get(column) and summary[column] is not None:
+                    change = (summary[column] / old[column] - 1) * 100
+                    changes.append(f'{change:>+8.1f}%')
+                else:
+                    changes.append(f'{"—":>9}')
+            print(f'{"  изменение":<16}' + ' '.join(changes))
+
+
+def prepare_database(args):
+    """Создает и заполняет временную базу, возвращает ее каталог."""
+    tmp = tempfile.TemporaryDirectory()
+    setup_django(str(Path(tmp.name) / 'bench.sqlite3'))
+    from django.conf import settings
+
+    # Файловые кеши — во временном каталоге: записи прошлых прогонов
+    # на другой базе не должны попадать в замер
+    for alias in (settings.PAGE_CACHE_ALIAS, settings.POST_CARD_CACHE_ALIAS):
+        settings.CACHES[alias] = {
+            **settings.CACHES[alias],
+            'LOCATION': Path(tmp.name) / 'cache' / alias,
+        }
+    if args.no_page_cache:
+        settings.CACHES['pages'] = {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+    import logging
+
+    from django.core.management import call_command
+
+    # Превышения бюджета ожидаемы под нагрузкой и засоряют вывод
+    logging.getLogger('blogicum.instrumentation').setLevel(logging.ERROR)
+    call_command('migrate', verbosity=0)
+    started = time.perf_counter()
+    call_command(
+        'seed_blog', users=args.users, posts=args.posts,
+        comments=args.comments, seed=1, verbosity=0,
+    )
+    print(f'Заполнение базы: {time.perf_counter() - started:.1f} с')
+    return tmp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', help='Адрес запущенного сервера.')
+    parser.add_argument('--users', type=int, default=1_000)
+    parser.add_argument('--posts', type=int, default=20_000)
+    parser.add_argument('--comments', type=int, default=100_000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400,
+                        help='Запросов на сценарий.')
+    parser.add_argument('--warmup', type=int, default=2,
+                        help='Незамеряемых запросов каждого клиента.')
+    parser.add_argument('--depth', type=int, default=50,
+                        help='Глубина листания для deep_pagination.')
+    parser.add_argument('--scenario', action='append',
+                        help='Запустить только указанные сценарии.')
+    parser.add_argument('--no-page-cache', action='store_true',
+                        help='Отключить кеш страниц (только в процессе).')
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    parser.add_argument('--compare', help='JSON прошлого прогона.')
+    args = parser.parse_args()
+
+    tmp = None
+    if args.url:
+        setup_django(None)
+
+        def make_session():
+            return HttpSession(args.url)
+    else:
+        tmp = prepare_database(args)
+        from blogicum.wsgi import application
+
+        def make_session():
+            return WsgiSession(application)
+
+    from django.contrib.auth import get_user_model
+
+    bench_user, _ = get_user_model().objects.get_or_create(
+        username=BENCH_USERNAME
+    )
+    bench_user.set_password(BENCH_PASSWORD)
+    bench_user.save()
+
+    scenarios = build_scenarios(make_session(), args.depth)
+    if args.scenario:
+        scenarios = [s for s in scenarios if s.name in args.scenario]
+    results = {}
+    for scenario in scenarios:
+        print(f'{scenario.name}: {scenario.method} {scenario.path}')
+        results[scenario.name] = run_scenario(
+            scenario, make_session, args.concurrency, args.requests,
+            args.warmup,
+        ).summary()
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())['results']
+    print_results(results, baseline)
+    if args.output:
+        document = {
+            'revision': git_revision(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'target': args.url or 'wsgi',
+            'options': {
+                name: value for name, value in vars(args).items()
+                if name not in ('output', 'compare')
+            },
+            'results': results,
+        }
+        Path(args.output).write_text(
+            json.dumps(document, ensure_ascii=False, indent=2)
+        )
+    if tmp is not None:
+        from django.db import connections
+
+        connections.close_all()
+        tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
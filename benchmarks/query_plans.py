@@ -0,0 +1,192 @@
+"""
+Планы запросов лент блога до и после индексов из миграции 0003.
+
+Создает временную базу SQLite со всеми миграциями, удаляет индексы лент
+(FEED_INDEXES), заполняет ее постами, выводит EXPLAIN QUERY PLAN и время
+запросов лент, затем создает индексы заново и повторяет замеры.
+
+Схема остается текущей: модели, через которые строятся запросы, всегда
+совпадают с таблицами, какие бы миграции ни добавлялись после 0003.
+
+Запуск из корня репозитория:
+    python benchmarks/query_plans.py --posts 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+BATCH_SIZE = 50_000
+# Индексы лент из миграции 0003, без которых делается первый замер
+FEED_INDEXES = (
+    'post_published_feed_idx',
+    'post_category_feed_idx',
+    'post_author_feed_idx',
+)
+
+
+def setup_django(db_path):
+    """Настраивает Django на временную базу (None — база проекта)."""
+    from django.conf import settings
+
+    if db_path is not None:
+        settings.DATABASES['default']['NAME'] = db_path
+    settings.DEBUG = False
+    import django
+
+    django.setup()
+
+
+def seed(n_posts, n_users, n_categories, n_locations):
+    """Заполняет базу пакетными INSERT без ORM-объектов."""
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    rnd = random.Random(0)
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO auth_user (password, is_superuser, username,'
+            ' first_name, last_name, email, is_staff, is_active,'
+            ' date_joined) VALUES (?, 0, ?, "", "", "", 0, 1, ?)',
+            [('!', f'user{i}', now) for i in range(n_users)],
+        )
+        cursor.executemany(
+            'INSERT INTO blog_category (is_published, created_at,'
+            ' updated_at, title, description, slug)'
+            ' VALUES (?, ?, ?, ?, "", ?)',
+            [
+                (i % 10 != 0, now, now, f'Категория {i}', f'category-{i}')
+                for i in range(n_categories)
+            ],
+        )
+        cursor.executemany(
+            'INSERT INTO blog_location (is_published, created_at,'
+            ' updated_at, name) VALUES (1, ?, ?, ?)',
+            [(now, now, f'Место {i}') for i in range(n_locations)],
+        )
+        for start in range(0, n_posts, BATCH_SIZE):
+            rows = []
+            for i in range(start, min(start + BATCH_SIZE, n_posts)):
+                # Около 2% постов в будущем, около 5% скрыты
+                pub_date = now + timedelta(
+                    minutes=rnd.randint(-5 * 365 * 24 * 60, 30 * 24 * 60)
+                )
+                rows.append((
+                    rnd.random() > 0.05,
+                    now,
+                    now,
+                    f'Пост {i}',
+                    'Текст',
+                    pub_date,
+                    rnd.randint(1, n_users),
+                    rnd.randint(1, n_locations),
+                    rnd.randint(1, n_categories),
+                ))
+            cursor.executemany(
+                'INSERT INTO blog_post (is_published, created_at,'
+                ' updated_at, title, text, pub_date, author_id,'
+                ' location_id, category_id, image, image_variants,'
+                ' comment_count)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, "", "{}", 0)',
+                rows,
+            )
+        cursor.execute('ANALYZE')
+
+
+def feed_indexes():
+    """Индексы лент из Meta.indexes модели Post."""
+    from blog.models import Post
+
+    return [
+        index for index in Post._meta.indexes if index.name in FEED_INDEXES
+    ]
+
+
+def feed_querysets():
+    """Возвращает запросы лент в том виде, в каком их строят представления."""
+    from django.contrib.auth.models import User
+
+    from blog.constants import MAX_OFFSET_POSTS, POSTS_ON_PAGE
+    from blog.models import Category
+    from blog.utils import query_post
+
+    category = Category.objects.filter(is_published=True).first()
+    author = User.objects.first()
+    newest = query_post().first()
+    return {
+        'index': query_post()[:POSTS_ON_PAGE],
+        'index, курсор': query_post().filter(
+            pub_date__lt=newest.pub_date
+        ).order_by('-pub_date', '-id')[:POSTS_ON_PAGE],
+        'category': query_post(manager=category.posts)[:POSTS_ON_PAGE],
+        'profile (чужой)': query_post(manager=author.posts)[:POSTS_ON_PAGE],
+        'profile (свой)': query_post(
+            manager=author.posts, filters=False
+        )[:POSTS_ON_PAGE],
+        'probe пагинации': query_post().values_list(
+            'id', flat=True
+        )[:MAX_OFFSET_POSTS + 1],
+    }
+
+
+def report(title, repeat):
+    """Выводит план и среднее время каждого запроса ленты."""
+    print(f'\n=== {title} ===')
+    for name, queryset in feed_querysets().items():
+        print(f'\n--- {name}')
+        print(queryset.explain())
+        start = time.perf_counter()
+        for _ in range(repeat):
+            list(queryset.all())
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f'время: {elapsed * 1000:.2f} мс')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--locations', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / 'bench.sqlite3'))
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+        from django.db import connection
+
+        from blog.models import Post
+
+        with connection.schema_editor() as editor:
+            for index in feed_indexes():
+                editor.remove_index(Post, index)
+
+        start = time.perf_counter()
+        seed(args.posts, args.users, args.categories, args.locations)
+        print(f'Заполнение {args.posts} постов: '
+              f'{time.perf_counter() - start:.1f} с')
+        report('До индексов', args.repeat)
+
+        start = time.perf_counter()
+        with connection.schema_editor() as editor:
+            for index in feed_indexes():
+                editor.add_index(Post, index)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        print(f'\nПостроение индексов: {time.perf_counter() - start:.1f} с')
+        report('После индексов', args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+"""
+Время рендера шаблонов ленты и поста без базы данных.
+
+Каждый шаблон рендерится отдельно на заранее собранном контексте
+(несохраненные модели, страница пагинатора, форма комментария) через
+тот же бэкенд и контекст-процессоры, что и в представлениях. Обращение
+к базе во время замера — ошибка.
+
+Замеры повторяются с кеширующим загрузчиком шаблонов (как при
+DEBUG = False) и без него: без кеша каждый get_template и include
+заново читает и разбирает файл. Затем профилировщик раскладывает время
+рендера по тегам и фильтрам (собственное время без вложенных узлов).
+
+Кеш карточек постов ({% post_card %}) по умолчанию отключен, чтобы
+замерялся сам рендер; --card-cache оставляет его включенным.
+
+Запуск из корня репозитория:
+    python benchmarks/rendering.py --output before.json
+    python benchmarks/rendering.py --compare before.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import timeit
+from collections import defaultdict
+from contextlib import ExitStack
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+
+from http_load import git_revision
+from query_plans import setup_django
+
+UNCACHED_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+LOADERS = {
+    'cached': [('django.template.loaders.cached.Loader', UNCACHED_LOADERS)],
+    'uncached': UNCACHED_LOADERS,
+}
+TEXT = (
+    'Утром мы вышли к реке, когда туман еще лежал над водой. '
+    'Дорога шла через лес, и к полудню показался старый мост.\n'
+) * 4
+
+
+@dataclass
+class Case:
+    """Шаблон с контекстом и запросом, на которых он рендерится."""
+    name: str
+    template: str
+    context: dict
+    request: object
+
+
+def build_cases():
+    """Контексты страниц из несохраненных объектов."""
+    from django.contrib.auth.models import AnonymousUser
+    from django.core.paginator import Paginator
+    from django.test import RequestFactory
+    from django.urls import resolve
+    from django.utils import timezone as django_timezone
+
+    from blog.forms import CommentForm
+    from blog.models import Category, Comment, Location, Post, User
+    from blog.utils import KeysetPage
+
+    now = django_timezone.now()
+    author = User(id=1, username='author')
+    category = Category(
+        id=1, title='Путешествия', slug='travel', is_published=True
+    )
+    location = Location(id=1, name='Москва', is_published=True)
+    posts = []
+    for number in range(1, 101):
+        post = Post(
+            id=number,
+            title=f'Поездка номер {number}',
+            text=TEXT,
+            pub_date=now - timedelta(hours=number),
+            author=author,
+            category=category,
+            location=location if number % 2 else None,
+            is_published=True,
+            comment_count=number * 3,
+        )
+        # У каждого третьего поста готовые производные изображения
+        if number % 3 == 1:
+            post.image = f'post_images/{number}.jpg'
+            post.image_variants = {
+                'source': post.image.name,
+                **{
+                    variant: [
+                        {
+                            'width': width,
+                            'height': width * 9 // 16,
+                            'webp': f'post_images/{number}-{width}.webp',
+                            'jpeg': f'post_images/{number}-{width}.jpg',
+                        }
+                        for width in (320, 640, 960)
+                    ]
+                    for variant in ('card', 'detail')
+                },
+            }
+        posts.append(post)
+    comments = KeysetPage(
+        [
+            Comment(
+                id=number, text=TEXT, post=posts[0],
+                author=User(id=number + 1, username=f'reader{number}'),
+                created_at=now - timedelta(minutes=number),
+            )
+            for number in range(20)
+        ],
+        has_previous=False,
+        has_next=True,
+        field='created_at',
+    )
+
+    def request(path, user):
+        request = RequestFactory().get(path)
+        request.user = user
+        request.resolver_match = resolve(path)
+        return request
+
+    anonymous = AnonymousUser()
+    feed = Paginator(posts, 10)
+    return [
+        Case('base', 'base.html', {}, request('/', anonymous)),
+        Case(
+            'post_card', 'includes/post_card.html', {'post': posts[0]},
+            request('/', anonymous),
+        ),
+        Case(
+            'paginator', 'includes/paginator.html',
+            {'page_obj': feed.page(5)}, request('/', anonymous),
+        ),
+        Case(
+            'index', 'blog/index.html', {'page_obj': feed.page(1)},
+            request('/', anonymous),
+        ),
+        # Автор видит форму комментария и ссылки редактирования
+        Case(
+            'detail', 'blog/detail.html',
+            {'post': posts[0], 'form': CommentForm(), 'comments': comments},
+            request(f'/posts/{posts[0].id}/', author),
+        ),
+    ]
+
+
+def backend():
+    """Бэкенд шаблонов проекта (псевдоним зависит от его класса)."""
+    from django.template import engines
+
+    return engines.all()[0]
+
+
+def render(case):
+    return backend().get_template(case.template).render(
+        case.context, case.request
+    )
+
+
+def forbid_queries(execute, sql, params, many, context):
+    raise RuntimeError(f'Запрос к базе во время рендера: {sql}')
+
+
+def configure(stack, loaders, card_cache):
+    """
+    Подменяет настройки шаблонов и кеша на время замера.
+
+    Изменение TEMPLATES через override_settings пересоздает движок,
+    поэтому каждый режим начинает с пустого кеша шаблонов.
+    """
+    from django.conf import settings
+    from django.db import connections
+    from django.test import override_settings
+
+    templates = deepcopy(settings.TEMPLATES)
+    templates[0]['APP_DIRS'] = False
+    templates[0]['OPTIONS']['loaders'] = loaders
+    overrides = {'TEMPLATES': templates}
+    if not card_cache:
+        overrides['CACHES'] = {
+            **settings.CACHES,
+            settings.POST_CARD_CACHE_ALIAS: {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+            },
+        }
+    stack.enter_context(override_settings(**overrides))
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(forbid_queries))
+
+
+def measure(case, number, repeat):
+    """
+    Время одного рендера в микросекундах.
+
+    Returns:
+        dict: лучшее и медианное время из repeat серий по number рендеров
+    """
+    render(case)
+    runs = timeit.Timer(lambda: render(case)).repeat(repeat, number)
+    per_render = [run / number * 1_000_000 for run in runs]
+    return {
+        'min_us': round(min(per_render), 1),
+        'median_us': round(statistics.median(per_render), 1),
+    }
+
+
+class Profiler:
+    """
+    Собственное время узлов шаблона и фильтров: из времени узла
+    вычитается время вложенных узлов и вызванных в нем фильтров.
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.stats = defaultdict(lambda: [0, 0.0])
+
+    def call(self, label, function, *args, **kwargs):
+        children = [0.0]
+        self.stack.append(children)
+        started = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - started
+            self.stack.pop()
+            stats = self.stats[label]
+            stats[0] += 1
+            stats[1] += elapsed - children[0]
+            if self.stack:
+                self.stack[-1][0] += elapsed
+
+    def install(self, stack):
+        """
+        Подключает замеры к Node.render_annotated и к фильтрам всех
+        библиотек движка; при выходе из stack все возвращается.
+
+        Фильтры подменяются до первого разбора шаблонов: разобранный
+        шаблон хранит ссылки на функции фильтров.
+        """
+        from django.template.base import Node, VariableNode
+
+        render_annotated = Node.render_annotated
+
+        def label(node):
+            if isinstance(node, VariableNode):
+                return '{{ переменная }}'
+            token = getattr(node, 'token', None)
+            if token is not None and token.contents:
+                return '{% ' + token.contents.split()[0] + ' %}'
+            return type(node).__name__
+
+        def timed_render(node, context):
+            return self.call(label(node), render_annotated, node, context)
+
+        Node.render_annotated = timed_render
+        stack.callback(setattr, Node, 'render_annotated', render_annotated)
+
+        engine = backend().engine
+        for library in {
+            *engine.template_builtins, *engine.template_libraries.values()
+        }:
+            originals = dict(library.filters)
+            for name, function in originals.items():
+                library.filters[name] = self.wrap(f'|{name}', function)
+            stack.callback(library.filters.update, originals)
+
+    def wrap(self, label, function):
+        @wraps(function)
+        def timed(*args, **kwargs):
+            return self.call(label, function, *args, **kwargs)
+        return timed
+
+    def top(self, renders, limit):
+        total = sum(seconds for _, seconds in self.stats.values()) or 1
+        rows = sorted(
+            self.stats.items(), key=lambda item: item[1][1], reverse=True
+        )
+        return [
+            {
+                'name': name,
+                'calls': round(calls / renders, 1),
+                'self_us': round(seconds / renders * 1_000_000, 1),
+                'share': round(seconds / total * 100, 1),
+            }
+            for name, (calls, seconds) in rows[:limit]
+        ]
+
+
+def profile(case, renders, limit, card_cache):
+    """Раскладывает время рендера шаблона по тегам и фильтрам."""
+    profiler = Profiler()
+    with ExitStack() as stack:
+        configure(stack, LOADERS['cached'], card_cache)
+        profiler.install(stack)
+        render(case)
+        profiler.stats.clear()
+        for _ in range(renders):
+            render(case)
+    return profiler.top(renders, limit)
+
+
+def print_results(results, profiles, baseline=None):
+    print(f'\n{"шаблон":<12}{"кеш, мкс":>12}{"без кеша, мкс":>16}'
+          f'{"разница":>10}')
+    for name, timings in results.items():
+        cached = timings['cached']['median_us']
+        uncached = timings['uncached']['median_us']
+        print(f'{name:<12}{cached:>12}{uncached:>16}'
+              f'{uncached / cached:>9.1f}x')
+        old = (baseline or {}).get(name)
+        if old:
+            changes = []
+            for mode in ('cached', 'uncached'):
+                change = timings[mode]['median_us'] / old[mode]['median_us']
+                changes.append(f'{(change - 1) * 100:+.1f}%')
+            print(f'{"  изменение":<12}{changes[0]:>12}{changes[1]:>16}')
+    for name, rows in profiles.items():
+        print(f'\n--- {name}: собственное время на один рендер')
+        for row in rows:
+            print(f'{row["name"]:<28}{row["calls"]:>8} выз.'
+                  f'{row["self_us"]:>10} мкс{row["share"]:>7}%')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=200,
+                        help='Рендеров в одной серии.')
+    parser.add_argument('--repeat', type=int, default=7,
+                        help='Количество серий.')
+    parser.add_argument('--profile-renders', type=int, default=100,
+                        help='Рендеров каждого шаблона под профилировщиком.')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Строк профиля на шаблон.')
+    parser.add_argument('--case', action='append',
+                        help='Замерить только указанные шаблоны.')
+    parser.add_argument('--card-cache', action='store_true',
+                        help='Не отключать кеш карточек постов.')
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    parser.add_argument('--compare', help='JSON прошлого прогона.')
+    args = parser.parse_args()
+
+    setup_django(None)
+    import django
+
+    cases = build_cases()
+    if args.case:
+        cases = [case for case in cases if case.name in args.case]
+    results = {case.name: {} for case in cases}
+    for mode, loaders in LOADERS.items():
+        with ExitStack() as stack:
+            configure(stack, loaders, args.card_cache)
+            for case in cases:
+                results[case.name][mode] = measure(
+                    case, args.number, args.repeat
+                )
+    profiles = {
+        case.name: profile(
+            case, args.profile_renders, args.top, args.card_cache
+        )
+        for case in cases
+    }
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())['results']
+    print_results(results, profiles, baseline)
+    if args.output:
+        document = {
+            'revision': git_revision(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'options': {
+                name: value for name, value in vars(args).items()
+                if name not in ('output', 'compare')
+            },
+            'results': results,
+            'profile': profiles,
+        }
+        Path(args.output).write_text(
+            json.dumps(document, ensure_ascii=False, indent=2)
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Время полнотекстового поиска по постам на большом корпусе.
+
+Создает временную базу SQLite со всеми миграциями, заполняет ее постами
+со случайным текстом (FTS5-индекс наполняют триггеры) и замеряет первую
+и следующую страницу поиска для редких и частых слов.
+
+Запуск из корня репозитория:
+    python benchmarks/search.py --posts 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from query_plans import BATCH_SIZE, setup_django
+
+LETTERS = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+# Частота слова в корпусе примерно обратна его номеру в словаре (закон
+# Ципфа); у слов случайные буквы, чтобы префиксы не совпадали чаще, чем
+# в живом тексте
+_rnd = random.Random(1)
+VOCABULARY = [
+    ''.join(_rnd.choices(LETTERS, k=_rnd.randint(4, 10)))
+    for _ in range(5_000)
+]
+# Частое, среднее, редкое слово, префикс и два слова сразу
+QUERIES = (
+    VOCABULARY[0],
+    VOCABULARY[100],
+    VOCABULARY[4999],
+    VOCABULARY[10][:3],
+    f'{VOCABULARY[1]} {VOCABULARY[2]}',
+)
+
+
+def seed(n_posts):
+    """Заполняет базу постами пакетными INSERT без ORM-объектов."""
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    rnd = random.Random(0)
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO auth_user (password, is_superuser, username,'
+            ' first_name, last_name, email, is_staff, is_active,'
+            ' date_joined) VALUES ("!", 0, "author", "", "", "", 0, 1, ?)',
+            [now],
+        )
+        cursor.execute(
+            'INSERT INTO blog_category (is_published, created_at, updated_at,'
+            ' title, description, slug) VALUES (1, ?, ?, "Категория", "",'
+            ' "category")',
+            [now, now],
+        )
+        for start in range(0, n_posts, BATCH_SIZE):
+            rows = []
+            for i in range(start, min(start + BATCH_SIZE, n_posts)):
+                words = rnd.choices(VOCABULARY, weights, k=40)
+                rows.append((
+                    now, now, ' '.join(words[:4]), ' '.join(words), now,
+                ))
+            cursor.executemany(
+                'INSERT INTO blog_post (is_published, created_at, updated_at,'
+                ' title, text, pub_date, author_id, category_id, image,'
+                ' image_variants, comment_count)'
+                ' VALUES (1, ?, ?, ?, ?, ?, 1, 1, "", "{}", 0)',
+                rows,
+            )
+        cursor.execute('ANALYZE')
+
+
+def report(repeat):
+    """Выводит время первой и второй страницы поиска."""
+    from blog.search import search_posts
+    from blog.utils import query_post
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            page = search_posts(query_post(), query)
+        first = (time.perf_counter() - start) / repeat
+        start = time.perf_counter()
+        for _ in range(repeat):
+            search_posts(query_post(), query, page.next_cursor)
+        second = (time.perf_counter() - start) / repeat
+        print(f'{query!r}: первая страница {first * 1000:.1f} мс,'
+              f' вторая {second * 1000:.1f} мс')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / 'bench.sqlite3'))
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+        start = time.perf_counter()
+        seed(args.posts)
+        print(f'Заполнение {args.posts} постов с индексом: '
+              f'{time.perf_counter() - start:.1f} с')
+        report(args.repeat)
+
+
+if __name__ == '__main__':
+    main()
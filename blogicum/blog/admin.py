@@ -1,10 +1,187 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import ValidationError
 
-from blog.models import Category, Comment, Location, Post
+from blog import deletion
+from blog.admin_performance import PerformanceAdminMixin
+from blog.admin_search import IndexedSearchMixin, TrigramSearchBackend
+from blog.models import Category, Comment, Deletion, Location, Post, User
+from blog.moderation import (
+    move_posts,
+    set_comments_published,
+    set_published,
+)
+
+
+class PostActionForm(ActionForm):
+    """
+    Форма действий над постами с выбором категории для переноса.
+    """
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(),
+        required=False,
+        label='Категория',
+    )
+
+
+@admin.action(description='Опубликовать выбранные объекты')
+def publish(modeladmin, request, queryset):
+    """Публикует выбранные объекты одним UPDATE."""
+    updated = set_published(queryset, True)
+    modeladmin.message_user(request, f'Опубликовано объектов: {updated}')
+
+
+@admin.action(description='Снять с публикации выбранные объекты')
+def unpublish(modeladmin, request, queryset):
+    """Снимает выбранные объекты с публикации одним UPDATE."""
+    updated = set_published(queryset, False)
+    modeladmin.message_user(
+        request, f'Снято с публикации объектов: {updated}'
+    )
+
+
+@admin.action(description='Перенести выбранные посты в категорию')
+def recategorize(modeladmin, request, queryset):
+    """Переносит выбранные посты в категорию из формы действия."""
+    try:
+        category = PostActionForm.base_fields['category'].clean(
+            request.POST.get('category')
+        )
+    except ValidationError:
+        category = None
+    if category is None:
+        modeladmin.message_user(
+            request, 'Выберите категорию для переноса.', messages.WARNING
+        )
+        return
+    updated = move_posts(queryset, category)
+    modeladmin.message_user(
+        request, f'Перенесено в «{category}» постов: {updated}'
+    )
+
+
+@admin.action(description='Скрыть комментарии к выбранным постам')
+def hide_post_comments(modeladmin, request, queryset):
+    """Скрывает все комментарии выбранных постов."""
+    updated = set_comments_published(
+        Comment.objects.filter(post__in=queryset), False
+    )
+    modeladmin.message_user(request, f'Скрыто комментариев: {updated}')
+
+
+@admin.action(description='Скрыть выбранные комментарии')
+def hide_comments(modeladmin, request, queryset):
+    """Скрывает выбранные комментарии и пересчитывает счетчики постов."""
+    updated = set_comments_published(queryset, False)
+    modeladmin.message_user(request, f'Скрыто комментариев: {updated}')
+
+
+@admin.action(description='Опубликовать выбранные комментарии')
+def show_comments(modeladmin, request, queryset):
+    """Публикует выбранные комментарии и пересчитывает счетчики постов."""
+    updated = set_comments_published(queryset, True)
+    modeladmin.message_user(
+        request, f'Опубликовано комментариев: {updated}'
+    )
+
+
+class BackgroundDeletionMixin:
+    """
+    Примесь, удаляющая объекты с большим каскадом в фоне (blog/deletion.py).
+
+    Страница подтверждения для таких объектов не собирает список всех
+    зависимых строк, а удаление только ставит задачу: ход удаления виден
+    в разделе «Удаления». Пока удаление идет, объект нельзя изменить
+    ни в форме, ни в редактируемом списке.
+
+    Атрибуты:
+    - deletion_target: тип объекта (Deletion.Target)
+    """
+    deletion_target = None
+
+    def _in_deletion(self, obj):
+        if self.deletion_target == Deletion.Target.POST:
+            return deletion.post_in_deletion(obj)
+        return deletion.active_deletion(
+            self.deletion_target, obj.pk
+        ) is not None
+
+    def has_change_permission(self, request, obj=None):
+        if obj is not None and self._in_deletion(obj):
+            return False
+        return super().has_change_permission(request, obj)
+
+    def save_model(self, request, obj, form, change):
+        """Не сохраняет изменения объекта, который удаляется в фоне."""
+        if change and self._in_deletion(obj):
+            self.message_user(
+                request,
+                f'«{obj}» удаляется в фоне, изменения не сохранены.',
+                messages.ERROR,
+            )
+            return
+        super().save_model(request, obj, form, change)
+
+    def delete_model(self, request, obj):
+        """Удаляет объект сразу или ставит фоновое удаление."""
+        if self.deletion_target == Deletion.Target.POST:
+            scheduled = deletion.delete_post(obj)
+        else:
+            scheduled = deletion.delete_user(obj)
+        if scheduled is not None:
+            self.message_user(
+                request,
+                f'«{obj}» скрыт, связанные объекты удаляются в фоне.',
+                messages.WARNING,
+            )
+
+    def delete_queryset(self, request, queryset):
+        """
+        Удаляет небольшие объекты одним delete() выборки, а объекты
+        с большим каскадом ставит в фоновое удаление.
+        """
+        scheduled = deletion.delete_many(self.deletion_target, queryset)
+        if scheduled:
+            self.message_user(
+                request,
+                f'Скрыто объектов: {len(scheduled)}, связанные объекты '
+                'удаляются в фоне.',
+                messages.WARNING,
+            )
+
+    def get_deleted_objects(self, objs, request):
+        """
+        Для объектов с большим каскадом возвращает только сами объекты
+        и проверяет права на удаление зависимых моделей.
+        """
+        objs = list(objs)
+        if not deletion.large_ids(
+            self.deletion_target, [obj.pk for obj in objs]
+        ):
+            return super().get_deleted_objects(objs, request)
+        models = {
+            queryset.model
+            for queryset in deletion.dependents(self.deletion_target, None)
+        }
+        perms_needed = {
+            model._meta.verbose_name
+            for model in models
+            if not request.user.has_perm(
+                f'{model._meta.app_label}.delete_{model._meta.model_name}'
+            )
+        }
+        return [str(obj) for obj in objs], {}, perms_needed, []
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(
+    BackgroundDeletionMixin,
+    PerformanceAdminMixin,
+    IndexedSearchMixin,
+    admin.ModelAdmin,
+):
     """
     Админская панель для модели Post.
 
@@ -14,7 +191,7 @@ class PostAdmin(admin.ModelAdmin):
     - category: категория
     - author: автор
     - location: местоположение
-    - text: текст поста
+    - text_preview: начало текста поста (обрезается в SQL)
     - pub_date: дата публикации
     - created_at: дата создания
 
@@ -22,7 +199,14 @@ class PostAdmin(admin.ModelAdmin):
     - is_published: можно изменить статус публикации
     - category: можно изменить категорию
 
-    Поля для поиска: title
+    Автор, категория и местоположение выбираются через автодополнение.
+
+    Массовые действия (одним UPDATE): публикация, снятие с публикации,
+    перенос в категорию, скрытие комментариев.
+
+    Посты с большим числом комментариев удаляются в фоне.
+
+    Поля для поиска: title (по триграммному индексу blog_post_trigram)
     Фильтры: category, is_published
     """
     list_display = (
@@ -31,21 +215,28 @@ class PostAdmin(admin.ModelAdmin):
         'category',
         'author',
         'location',
-        'text',
+        'text_preview',
         'pub_date',
         'created_at',
     )
+    list_select_related = ('author', 'location', 'category')
+    text_preview_field = 'text'
+    autocomplete_fields = ('author', 'category', 'location')
+    actions = (publish, unpublish, recategorize, hide_post_comments)
+    action_form = PostActionForm
     list_editable = (
         'is_published',
         'category'
     )
     search_fields = ('title',)
+    search_backend = TrigramSearchBackend('blog_post_trigram')
     list_filter = ('category', 'is_published',)
+    deletion_target = Deletion.Target.POST
     list_display_links = ('title',)  # Поле, по которому можно перейти к редактированию
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(IndexedSearchMixin, admin.ModelAdmin):
     """
     Админская панель для модели Category.
 
@@ -58,6 +249,9 @@ class CategoryAdmin(admin.ModelAdmin):
 
     Поля, доступные для редактирования в списке:
     - is_published: можно изменить статус публикации
+
+    Поля для поиска: title (по триграммному индексу blog_category_trigram)
+    Массовые действия: публикация и снятие с публикации одним UPDATE
     """
     list_display = (
         'title',
@@ -70,12 +264,14 @@ class CategoryAdmin(admin.ModelAdmin):
         'is_published',
     )
     search_fields = ('title',)
+    search_backend = TrigramSearchBackend('blog_category_trigram')
+    actions = (publish, unpublish)
     list_filter = ('is_published',)
     list_display_links = ('title',)
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(IndexedSearchMixin, admin.ModelAdmin):
     """
     Админская панель для модели Location.
 
@@ -86,6 +282,9 @@ class LocationAdmin(admin.ModelAdmin):
 
     Поля, доступные для редактирования в списке:
     - is_published: можно изменить статус публикации
+
+    Поля для поиска: name (по триграммному индексу blog_location_trigram)
+    Массовые действия: публикация и снятие с публикации одним UPDATE
     """
     list_display = (
         'name',
@@ -96,27 +295,113 @@ class LocationAdmin(admin.ModelAdmin):
         'is_published',
     )
     search_fields = ('name',)
+    search_backend = TrigramSearchBackend('blog_location_trigram')
+    actions = (publish, unpublish)
     list_filter = ('is_published',)
     list_display_links = ('name',)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(PerformanceAdminMixin, admin.ModelAdmin):
     """
     Админская панель для модели Comment.
 
     Поля, отображаемые в списке:
-    - text: текст комментария
+    - text_preview: начало текста комментария (обрезается в SQL)
     - post: пост, к которому относится комментарий
     - created_at: дата создания
     - author: автор комментария
+    - is_published: статус публикации
+
+    Поля, доступные для редактирования в списке:
+    - is_published: можно скрыть комментарий — он пропадет из обсуждения
+      на странице поста, а счетчик поста обновится
+
+    Пост и автор выбираются через автодополнение.
+
+    Массовые действия: скрытие и публикация комментариев одним UPDATE
+    с пересчетом счетчиков постов.
     """
     list_display = (
-        'text',
+        'text_preview',
         'post',
         'created_at',
-        'author'
+        'author',
+        'is_published',
     )
+    list_select_related = ('author', 'post')
+    # Для колонки post нужен только заголовок
+    list_defer = ('post__text', 'post__image_variants')
+    text_preview_field = 'text'
+    autocomplete_fields = ('post', 'author')
+    actions = (hide_comments, show_comments)
+    list_editable = (
+        'is_published',
+    )
+    list_filter = ('is_published',)
+
+
+@admin.register(Deletion)
+class DeletionAdmin(admin.ModelAdmin):
+    """
+    Админская панель для модели Deletion (только просмотр).
+
+    Поля, отображаемые в списке:
+    - label: удаляемый объект
+    - target: тип объекта
+    - status: состояние
+    - progress: удалено связанных объектов из общего числа
+    - created_at: дата постановки
+    - updated_at: дата изменения
+
+    Фильтры: status, target
+    """
+    list_display = (
+        'label',
+        'target',
+        'status',
+        'progress',
+        'created_at',
+        'updated_at',
+    )
+    list_filter = ('status', 'target')
+    readonly_fields = (
+        'target',
+        'object_id',
+        'label',
+        'status',
+        'total',
+        'deleted',
+        'progress',
+        'created_at',
+        'updated_at',
+    )
+
+    @admin.display(description='Прогресс')
+    def progress(self, obj):
+        """Удалено объектов из общего числа и процент."""
+        if obj.status == Deletion.Status.PENDING:
+            return '—'
+        percent = 100 if not obj.total else obj.deleted * 100 // obj.total
+        return f'{obj.deleted} из {obj.total} ({min(percent, 100)}%)'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class UserAdmin(BackgroundDeletionMixin, BaseUserAdmin):
+    """
+    Админская панель пользователей: пользователи с большим числом
+    постов и комментариев удаляются в фоне.
+    """
+    deletion_target = Deletion.Target.USER
 
 
 # Устанавливает отображение для пустых значений в админке
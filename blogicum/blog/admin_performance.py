@@ -0,0 +1,123 @@
+from functools import partial
+
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db.models import ForeignKey, Max
+from django.db.models.functions import Substr
+from django.utils.functional import cached_property
+
+from blog.constants import ADMIN_TEXT_PREVIEW, EXACT_COUNT_LIMIT
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор, который не считает COUNT(*) по всей большой таблице.
+
+    Строки считаются точно только до EXACT_COUNT_LIMIT (подзапрос
+    с LIMIT). Если их больше, количество всей таблицы оценивается сверху
+    по максимальному id — это один запрос по первичному ключу. Для
+    отфильтрованного списка максимальный id ничего не говорит о числе
+    строк, поэтому количество остается EXACT_COUNT_LIMIT + 1: список
+    показывает «более EXACT_COUNT_LIMIT», а число страниц ограничено.
+
+    Атрибуты:
+    - count_is_lower_bound: True, если count — нижняя граница
+    """
+    count_is_lower_bound = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        bounded = queryset[:EXACT_COUNT_LIMIT + 1].count()
+        if bounded <= EXACT_COUNT_LIMIT:
+            return bounded
+        if queryset.query.has_filters():
+            self.count_is_lower_bound = True
+            return bounded
+        estimate = queryset.model._default_manager.aggregate(
+            last_id=Max('pk')
+        )['last_id'] or 0
+        return max(bounded, estimate)
+
+    @property
+    def exact_count_limit(self):
+        return EXACT_COUNT_LIMIT
+
+
+class PerformanceChangeList(ChangeList):
+    """Список объектов, в котором длинный текст обрезается в SQL."""
+
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        deferred = list(self.model_admin.list_defer)
+        field = self.model_admin.text_preview_field
+        if field is not None:
+            # Берем на символ больше, чтобы знать, нужно ли многоточие
+            queryset = queryset.annotate(
+                text_preview_value=Substr(field, 1, ADMIN_TEXT_PREVIEW + 1)
+            )
+            deferred.append(field)
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class PerformanceAdminMixin:
+    """
+    Примесь для ModelAdmin с большими таблицами.
+
+    - длинное поле text_preview_field не загружается целиком: в колонке
+      text_preview выводится его начало, обрезанное в SQL;
+    - поля из list_defer (например, тексты связанных объектов из
+      list_select_related) не загружаются в списке;
+    - количество строк оценивается EstimatedCountPaginator, общее
+      количество без фильтров не считается, а большой отфильтрованный
+      список выводится как «более EXACT_COUNT_LIMIT»
+      (templates/admin/pagination.html).
+
+    Связанные объекты подгружаются через list_select_related, а выбор
+    связанных объектов в формах — через autocomplete_fields самой
+    админки. В строках list_editable автодополнение не используется:
+    оно запрашивало бы выбранный объект отдельно для каждой строки.
+    """
+    text_preview_field = None
+    list_defer = ()
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return PerformanceChangeList
+
+    def get_changelist_formset(self, request, **kwargs):
+        kwargs.setdefault('formfield_callback', partial(
+            self.changelist_formfield, request=request, choices={}
+        ))
+        return super().get_changelist_formset(request, **kwargs)
+
+    def changelist_formfield(self, db_field, request, choices, **kwargs):
+        """
+        Поле формы list_editable: внешние ключи выводятся обычным
+        <select>, варианты которого выбираются один раз на всю страницу,
+        а не отдельным запросом в каждой строке.
+        """
+        if not isinstance(db_field, ForeignKey):
+            return self.formfield_for_dbfield(db_field, request, **kwargs)
+        kwargs['widget'] = forms.Select
+        formfield = self.formfield_for_dbfield(db_field, request, **kwargs)
+        if db_field.name not in choices:
+            # iter, чтобы list не запрашивал COUNT для длины
+            choices[db_field.name] = list(iter(formfield.choices))
+        formfield.choices = choices[db_field.name]
+        # RelatedFieldWidgetWrapper выводит вложенный виджет
+        if hasattr(formfield.widget, 'widget'):
+            formfield.widget.widget.choices = choices[db_field.name]
+        return formfield
+
+    @admin.display(description='Текст')
+    def text_preview(self, obj):
+        preview = getattr(obj, 'text_preview_value', None)
+        if preview is None:
+            preview = getattr(obj, self.text_preview_field)
+        if len(preview) > ADMIN_TEXT_PREVIEW:
+            return preview[:ADMIN_TEXT_PREVIEW] + '…'
+        return preview
@@ -0,0 +1,65 @@
+from django.db.models.expressions import RawSQL
+
+# Триграммный индекс не находит подстроки короче трех символов
+MIN_TRIGRAM_LENGTH = 3
+
+
+class SearchBackend:
+    """
+    Стратегия поиска в списке объектов админки.
+
+    search возвращает отфильтрованный QuerySet или None, если запрос
+    нужно передать стандартному поиску Django по search_fields.
+    """
+
+    def search(self, queryset, search_term):
+        return None
+
+
+class TrigramSearchBackend(SearchBackend):
+    """
+    Поиск подстроки через триграммный FTS5-индекс модели.
+
+    Как и стандартный поиск по search_fields, каждое слово запроса
+    должно найтись без учета регистра хотя бы в одном проиндексированном
+    поле. Индексы и триггеры их синхронизации создает миграция
+    0008_admin_search.
+
+    Args:
+        index: имя FTS5-таблицы, rowid которой совпадает с id модели
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    def search(self, queryset, search_term):
+        terms = search_term.split()
+        if not terms or min(map(len, terms)) < MIN_TRIGRAM_LENGTH:
+            return None
+        # Каждое слово — фраза FTS5: кавычки внутри удваиваются
+        match = ' AND '.join(
+            '"{}"'.format(term.replace('"', '""')) for term in terms
+        )
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {self.index} WHERE {self.index} MATCH %s',
+            [match],
+        ))
+
+
+class IndexedSearchMixin:
+    """
+    Примесь для ModelAdmin, направляющая поиск в search_backend.
+
+    Фильтры list_filter применяются к QuerySet до поиска, поэтому
+    работают вместе с ним. Если бэкенд не может обработать запрос
+    (например, слишком короткое слово), используется стандартный поиск
+    по search_fields.
+    """
+    search_backend = SearchBackend()
+
+    def get_search_results(self, request, queryset, search_term):
+        results = self.search_backend.search(queryset, search_term)
+        if results is None:
+            return super().get_search_results(request, queryset, search_term)
+        # Подзапрос по id не размножает строки, distinct не нужен
+        return results, False
@@ -11,4 +11,8 @@ class BlogConfig(AppConfig):
     """
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
-    verbose_name = 'Блог'
\ No newline at end of file
+    verbose_name = 'Блог'
+
+    def ready(self):
+        # Подключаем обработчики сигналов (счетчик комментариев и т.д.)
+        from blog import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,238 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from blog.constants import MAX_OFFSET_POSTS, POSTS_ON_PAGE
+from blog.models import Post
+from blog.utils import decode_cursor
+
+# Области кеша: ленты (главная и категории), отдельный пост и весь сайт
+SCOPE_FEEDS = 'feeds'
+SCOPE_POST = 'post:{post_id}'
+SCOPE_SITE = 'site'
+# Параметры запроса, от которых зависит содержимое страницы
+PAGE_PARAMS = ('page', 'cursor')
+# Последний номер страницы, который может существовать: большие ленты
+# листаются по курсору (см. blog.utils.posts_pagination)
+MAX_PAGE_NUMBER = math.ceil(MAX_OFFSET_POSTS / POSTS_ON_PAGE)
+
+
+def page_cache():
+    """Возвращает бэкенд кеша страниц, заданный в PAGE_CACHE_ALIAS."""
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def post_scope(post_id):
+    """Область кеша страницы отдельного поста."""
+    return SCOPE_POST.format(post_id=post_id)
+
+
+def _generation_key(scope):
+    return f'page-cache:generation:{scope}'
+
+
+def cache_version(scopes):
+    """
+    Возвращает версию содержимого, зависящего от указанных областей.
+
+    Версия меняется при каждом сбросе любой из областей, поэтому ключи
+    с ней не требуют явного удаления. Все поколения читаются одним
+    обращением к кешу.
+
+    Args:
+        scopes: области кеша (SCOPE_SITE добавляется всегда)
+
+    Returns:
+        str: версия вида '3.0.12'
+    """
+    keys = [_generation_key(scope) for scope in (SCOPE_SITE, *scopes)]
+    generations = page_cache().get_many(keys)
+    return '.'.join(str(generations.get(key, 0)) for key in keys)
+
+
+def _page_params(request):
+    """
+    Приводит параметры PAGE_PARAMS к каноническому виду для ключа кеша.
+
+    Номер страницы должен быть числом от 1 до MAX_PAGE_NUMBER, курсор —
+    раскодироваться. Иначе страница не кешируется: произвольные значения
+    параметров не должны порождать новые записи в кеше.
+
+    Returns:
+        str | None: параметры для ключа или None, если они неверные
+    """
+    params = []
+    if 'page' in request.GET:
+        try:
+            page = int(request.GET['page'])
+        except ValueError:
+            return None
+        if not 1 <= page <= MAX_PAGE_NUMBER:
+            return None
+        params.append(f'page={page}')
+    if 'cursor' in request.GET:
+        position = decode_cursor(request.GET['cursor'])
+        if position is None:
+            return None
+        direction, moment, pk = position
+        params.append(f'cursor={direction}:{moment.isoformat()}:{pk}')
+    return '&'.join(params)
+
+
+def _page_key(request, params, version):
+    return (
+        f'page-cache:{request.resolver_match.view_name}:'
+        f'{request.path}?{params}:{version}'
+    )
+
+
+def next_publication(now=None):
+    """
+    Возвращает дату выхода ближайшего отложенного поста.
+
+    Запрос обслуживается частичным индексом post_published_feed_idx.
+
+    Args:
+        now: момент отсчета (по умолчанию текущее время)
+
+    Returns:
+        datetime | None: дата выхода или None, если отложенных постов нет
+    """
+    return Post.objects.filter(
+        is_published=True,
+        pub_date__gt=now or timezone.now(),
+    ).order_by('pub_date').values_list('pub_date', flat=True).first()
+
+
+def next_scheduled_change():
+    """
+    Возвращает момент, когда ленты изменятся без правок в базе, —
+    выход ближайшего отложенного поста.
+
+    Значение хранится в кеше под версией лент: любое сохранение поста
+    сбрасывает его вместе со страницами. Запись живет не дольше
+    PAGE_CACHE_TIMEOUT и не дольше самого момента изменения.
+
+    Returns:
+        datetime | None: момент изменения или None
+    """
+    cache = page_cache()
+    key = f'page-cache:next-change:{cache_version([SCOPE_FEEDS])}'
+    timestamp = cache.get(key)
+    if timestamp is None:
+        now = timezone.now()
+        moment = next_publication(now)
+        # 0 — отложенных постов нет
+        timestamp = moment.timestamp() if moment else 0
+        timeout = settings.PAGE_CACHE_TIMEOUT
+        if moment is not None:
+            timeout = min(
+                timeout, math.ceil((moment - now).total_seconds())
+            )
+        cache.set(key, timestamp, timeout)
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+
+
+def page_cache_timeout():
+    """
+    Время жизни страницы в кеше: PAGE_CACHE_TIMEOUT, но не дольше,
+    чем до выхода ближайшего отложенного поста.
+
+    Returns:
+        int: таймаут в секундах (0 — страницу не кешировать)
+    """
+    timeout = settings.PAGE_CACHE_TIMEOUT
+    moment = next_scheduled_change()
+    if moment is not None:
+        remaining = (moment - timezone.now()).total_seconds()
+        timeout = min(timeout, max(0, math.ceil(remaining)))
+    return timeout
+
+
+def invalidate_page_cache(*scopes):
+    """
+    Сбрасывает закешированные страницы указанных областей.
+
+    Вместо удаления страниц (файловый и локальный кеши не умеют удалять
+    по шаблону) увеличивает поколение области: ключи старых страниц
+    перестают совпадать, а сами они истекают по таймауту. Внутри
+    транзакции сброс повторяется после ее фиксации, чтобы параллельный
+    запрос не положил в кеш страницу со старыми данными.
+    """
+    def bump():
+        cache = page_cache()
+        for scope in scopes:
+            key = _generation_key(scope)
+            # add не перезапишет существующий счетчик
+            cache.add(key, 0, timeout=None)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Счетчик успели вытеснить из кеша
+                cache.set(key, 1, timeout=None)
+
+    bump()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump)
+
+
+def cache_page_for_anonymous(*scopes):
+    """
+    Декоратор, кеширующий страницу для неавторизованных посетителей.
+
+    Страницы, зависящие от лент, кешируются не дольше, чем до выхода
+    ближайшего отложенного поста. Кешируются только ответы 200 на
+    запросы с верными параметрами page и cursor (см. _page_params).
+
+    Args:
+        scopes: области кеша, от которых зависит страница; строки
+            форматируются именованными аргументами представления,
+            например 'post:{post_id}'
+
+    Returns:
+        function: декоратор представления
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+
+            params = _page_params(request)
+            if params is None:
+                return view(request, *args, **kwargs)
+            cache = page_cache()
+            key = _page_key(
+                request,
+                params,
+                cache_version([scope.format(**kwargs) for scope in scopes]),
+            )
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view(request, *args, **kwargs)
+            if (
+                response.status_code == 200
+                and not response.streaming
+                and not response.cookies
+            ):
+                timeout = settings.PAGE_CACHE_TIMEOUT
+                if SCOPE_FEEDS in scopes:
+                    # Лента меняется и с выходом отложенного поста
+                    timeout = page_cache_timeout()
+                if timeout:
+                    cache.set(key, response, timeout)
+            return response
+        return wrapper
+    return decorator
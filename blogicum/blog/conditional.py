@@ -0,0 +1,115 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Max, Subquery
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from blog.cache import PAGE_PARAMS, cache_version
+from blog.models import Post
+from blog.utils import query_post
+
+
+def feed_last_modified(scope, posts):
+    """
+    Возвращает время последнего изменения ленты одним запросом.
+
+    Это позднее из двух значений: последнего изменения постов области
+    (индекс по updated_at) и даты самого свежего видимого поста (индекс
+    по pub_date), которая сдвигается, когда выходят отложенные посты.
+
+    Args:
+        scope: QuerySet всех постов области (вся лента, категория, автор)
+        posts: QuerySet видимой ленты, построенный query_post
+
+    Returns:
+        datetime | None: время изменения или None для пустой ленты
+    """
+    row = scope.order_by('-updated_at').annotate(
+        newest_pub_date=Subquery(posts.values('pub_date')[:1])
+    ).values_list('updated_at', 'newest_pub_date').first()
+    if row is None:
+        return None
+    return max(moment for moment in row if moment is not None)
+
+
+def index_last_modified(request):
+    """Время последнего изменения главной страницы."""
+    return feed_last_modified(Post.objects.all(), query_post())
+
+
+def category_last_modified(request, category_slug):
+    """Время последнего изменения страницы категории."""
+    scope = Post.objects.filter(category__slug=category_slug)
+    return feed_last_modified(scope, query_post(manager=scope))
+
+
+def profile_last_modified(request, username):
+    """Время последнего изменения страницы пользователя."""
+    scope = Post.objects.filter(author__username=username)
+    return feed_last_modified(scope, query_post(
+        manager=scope,
+        filters=username != request.user.get_username(),
+    ))
+
+
+def post_last_modified(request, post_id):
+    """
+    Время последнего изменения страницы поста: правка или выход поста,
+    изменение его комментариев. Удаление комментария отражается
+    в updated_at поста вместе со счетчиком. Считается одним запросом,
+    MAX по комментариям обслуживает индекс (post, updated_at).
+    """
+    row = Post.objects.filter(pk=post_id).annotate(
+        last_comment=Max('comments__updated_at')
+    ).values_list('updated_at', 'pub_date', 'last_comment').first()
+    if row is None:
+        return None
+    now = timezone.now()
+    return max(
+        moment for moment in row
+        if moment is not None and moment <= now
+    )
+
+
+def conditional_page(last_modified_func, *scopes):
+    """
+    Декоратор, добавляющий странице ETag и Last-Modified и отвечающий 304
+    без запроса ленты и рендера шаблона.
+
+    ETag складывается из адреса и параметров страницы, пользователя,
+    версии кеша по областям scopes (меняется при любом сохранении моделей,
+    см. blog/signals.py) и даты из last_modified_func.
+
+    Args:
+        last_modified_func: функция (request, **kwargs) -> datetime | None,
+            выполняющая небольшой агрегирующий запрос
+        scopes: области кеша, от которых зависит страница
+
+    Returns:
+        function: декоратор представления
+    """
+    def last_modified(request, *args, **kwargs):
+        # condition вызывает обе функции, запрос выполняем один раз
+        if not hasattr(request, '_blog_last_modified'):
+            request._blog_last_modified = last_modified_func(
+                request, *args, **kwargs
+            )
+        return request._blog_last_modified
+
+    def etag(request, *args, **kwargs):
+        modified = last_modified(request, *args, **kwargs)
+        parts = [
+            request.path,
+            *(request.GET.get(name, '') for name in PAGE_PARAMS),
+            str(request.user.pk),
+            # Форма комментария содержит CSRF-токен, привязанный к cookie
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+            cache_version([scope.format(**kwargs) for scope in scopes]),
+            modified.isoformat() if modified else '',
+        ]
+        return hashlib.md5(
+            '|'.join(parts).encode(), usedforsecurity=False
+        ).hexdigest()
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
@@ -1,5 +1,41 @@
 DEFAULT_NUM_PAGE = 1
 POSTS_ON_PAGE = 10
+COMMENTS_ON_PAGE = 20
 MAX_LENGTH = 256
 MAX_WORDS_LENGTH = 4
 MAX_TEXT = 50
+# Порог, до которого ленты листаются по номерам страниц (OFFSET),
+# дальше — по курсору (pub_date, id)
+MAX_OFFSET_POSTS = 100
+# Ширина производных изображений поста (px); для retina дополнительно
+# создается вариант вдвое шире
+POST_IMAGE_WIDTHS = {
+    'card': 608,
+    'detail': 912,
+}
+RETINA_FACTOR = 2
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+# Полнотекстовый поиск: вес совпадения в заголовке относительно текста
+# для BM25, длина фрагмента в словах и максимум слов в запросе
+SEARCH_TITLE_WEIGHT = 10.0
+SEARCH_SNIPPET_WORDS = 24
+MAX_SEARCH_TERMS = 8
+# По BM25 ранжируются только столько самых новых совпадений: время
+# запроса с частым словом не растет вместе с корпусом
+MAX_SEARCH_CANDIDATES = 1000
+# Админка: длина текста в списке объектов и порог, после которого
+# количество строк оценивается, а не считается точно
+ADMIN_TEXT_PREVIEW = 80
+EXACT_COUNT_LIMIT = 10_000
+# Удаление с большими каскадами: до INLINE_DELETE_LIMIT связанных
+# объектов удаляется сразу, больше — в фоне порциями по DELETE_CHUNK_SIZE
+INLINE_DELETE_LIMIT = 500
+DELETE_CHUNK_SIZE = 500
+DELETE_CHUNKS_PER_JOB = 20
+# Планировщик отложенных публикаций: самая долгая пауза между проверками
+# (за нее замечаются новые отложенные посты) и запас при сверке окна
+SCHEDULER_MAX_SLEEP = 30
+SCHEDULER_OVERLAP = 5
+# Генерация данных (seed_blog): объектов в одной пачке bulk_create
+SEED_BATCH_SIZE = 5_000
@@ -0,0 +1,329 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from blog import tasks
+from blog.cache import SCOPE_SITE, invalidate_page_cache
+from blog.constants import DELETE_CHUNK_SIZE, INLINE_DELETE_LIMIT
+from blog.images import delete_variant_files, variant_files
+from blog.models import Comment, Deletion, Post, User
+from blog.moderation import set_comments_published, set_published
+
+# Удаление постов и пользователей с большим числом связанных объектов.
+# Каскад Django загружает все зависимые строки в память и удаляет их
+# одной транзакцией, отправляя сигналы по каждому комментарию. Поэтому
+# корневой объект сразу скрывается, а зависимые строки удаляются в фоне
+# порциями по DELETE_CHUNK_SIZE, каждая в своей короткой транзакции.
+
+
+def dependents(target, object_id):
+    """
+    Возвращает выборки зависимых строк в порядке удаления.
+
+    Args:
+        target: тип объекта (Deletion.Target)
+        object_id: id объекта
+
+    Returns:
+        list[QuerySet]: выборки, которые нужно очистить до удаления объекта
+    """
+    if target == Deletion.Target.POST:
+        return [Comment.objects.filter(post_id=object_id)]
+    return [
+        Comment.objects.filter(author_id=object_id),
+        Comment.objects.filter(post__author_id=object_id).exclude(
+            author_id=object_id
+        ),
+        Post.objects.filter(author_id=object_id),
+    ]
+
+
+def _grouped_dependents(target, object_ids):
+    """
+    Возвращает зависимые строки нескольких объектов вместе с полем,
+    в котором хранится id объекта.
+
+    Returns:
+        list[tuple[str, QuerySet]]: пары (поле с id объекта, выборка)
+    """
+    if target == Deletion.Target.POST:
+        return [('post_id', Comment.objects.filter(post_id__in=object_ids))]
+    return [
+        ('author_id', Comment.objects.filter(author_id__in=object_ids)),
+        ('post__author_id', Comment.objects.filter(
+            post__author_id__in=object_ids
+        ).exclude(author_id=F('post__author_id'))),
+        ('author_id', Post.objects.filter(author_id__in=object_ids)),
+    ]
+
+
+def large_ids(target, object_ids):
+    """
+    Выбирает объекты, которые нужно удалять в фоне.
+
+    Зависимые строки всех объектов считаются одним запросом с GROUP BY
+    на выборку, а не отдельной проверкой для каждого объекта.
+
+    Args:
+        target: тип объектов (Deletion.Target)
+        object_ids: id объектов или подзапрос с ними
+
+    Returns:
+        set: id объектов, у которых связанных строк больше
+        INLINE_DELETE_LIMIT
+    """
+    totals = Counter()
+    for field, queryset in _grouped_dependents(target, object_ids):
+        totals.update(dict(
+            queryset.order_by().values_list(field).annotate(Count('pk'))
+        ))
+    return {
+        object_id for object_id, total in totals.items()
+        if total > INLINE_DELETE_LIMIT
+    }
+
+
+def active_deletion(target, object_id):
+    """
+    Возвращает незавершенное удаление объекта.
+
+    Returns:
+        Deletion | None: запись удаления или None, если объект не удаляется
+    """
+    return Deletion.objects.filter(
+        target=target, object_id=object_id
+    ).exclude(status=Deletion.Status.DONE).first()
+
+
+def post_in_deletion(post):
+    """
+    Проверяет, что пост или его автор удаляются в фоне.
+
+    Такой пост нельзя редактировать и публиковать: его комментарии
+    уже удаляются.
+    """
+    return Deletion.objects.filter(
+        Q(target=Deletion.Target.POST, object_id=post.pk)
+        | Q(target=Deletion.Target.USER, object_id=post.author_id)
+    ).exclude(status=Deletion.Status.DONE).exists()
+
+
+def _exceeds(querysets, limit):
+    """
+    Проверяет ограниченными выборками ключей, что строк больше limit.
+    """
+    for queryset in querysets:
+        limit -= len(queryset.order_by().values_list('pk', flat=True)[
+            :limit + 1
+        ])
+        if limit < 0:
+            return True
+    return False
+
+
+def is_large(target, object_id):
+    """
+    Проверяет, нужно ли удалять объект в фоне.
+
+    Args:
+        target: тип объекта (Deletion.Target)
+        object_id: id объекта
+
+    Returns:
+        bool: True, если связанных строк больше INLINE_DELETE_LIMIT
+    """
+    return _exceeds(dependents(target, object_id), INLINE_DELETE_LIMIT)
+
+
+def _schedule(target, obj):
+    """
+    Создает запись удаления и ставит фоновую задачу.
+
+    Если объект уже удаляется, возвращает существующую запись.
+    """
+    deletion = active_deletion(target, obj.pk)
+    if deletion is not None:
+        return deletion
+    deletion = Deletion.objects.create(
+        target=target,
+        object_id=obj.pk,
+        label=str(obj)[:Deletion._meta.get_field('label').max_length],
+    )
+    tasks.run_deletion.delay(deletion_id=deletion.pk)
+    return deletion
+
+
+def delete_post(post):
+    """
+    Удаляет пост.
+
+    Пост с небольшим числом комментариев удаляется сразу. Иначе он
+    снимается с публикации и скрывается даже от автора, а комментарии
+    и сам пост удаляются в фоне.
+
+    Args:
+        post: объект поста
+
+    Returns:
+        Deletion | None: запись фонового удаления или None,
+        если пост удален сразу
+    """
+    scheduled = active_deletion(Deletion.Target.POST, post.pk)
+    if scheduled is not None:
+        return scheduled
+    if not is_large(Deletion.Target.POST, post.pk):
+        post.delete()
+        return None
+    return _hide_post(post)
+
+
+def _hide_post(post):
+    with transaction.atomic():
+        set_published(Post.objects.filter(pk=post.pk), False)
+        return _schedule(Deletion.Target.POST, post)
+
+
+def delete_user(user):
+    """
+    Удаляет пользователя вместе с постами и комментариями.
+
+    Если связанных объектов немного, пользователь удаляется сразу.
+    Иначе он деактивируется, его посты и комментарии скрываются
+    (счетчики комментариев других постов пересчитываются), а строки
+    удаляются в фоне.
+
+    Args:
+        user: объект пользователя
+
+    Returns:
+        Deletion | None: запись фонового удаления или None,
+        если пользователь удален сразу
+    """
+    scheduled = active_deletion(Deletion.Target.USER, user.pk)
+    if scheduled is not None:
+        return scheduled
+    if not is_large(Deletion.Target.USER, user.pk):
+        user.delete()
+        return None
+    return _hide_user(user)
+
+
+def _hide_user(user):
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        set_published(Post.objects.filter(author=user), False)
+        set_comments_published(Comment.objects.filter(author=user), False)
+        invalidate_page_cache(SCOPE_SITE)
+        return _schedule(Deletion.Target.USER, user)
+
+
+def delete_many(target, queryset):
+    """
+    Удаляет выборку постов или пользователей.
+
+    Выборка один раз делится на объекты с небольшим и с большим
+    каскадом (large_ids): первые удаляются одним delete() выборки,
+    вторые скрываются и удаляются в фоне. Объекты, которые уже
+    удаляются, пропускаются.
+
+    Args:
+        target: тип объектов (Deletion.Target)
+        queryset: QuerySet постов или пользователей
+
+    Returns:
+        list[Deletion]: записи поставленных фоновых удалений
+    """
+    queryset = queryset.exclude(pk__in=Deletion.objects.hidden_ids(target))
+    large = large_ids(target, queryset.values('pk'))
+    queryset.exclude(pk__in=large).delete()
+    hide = _hide_post if target == Deletion.Target.POST else _hide_user
+    return [hide(obj) for obj in queryset.model.objects.filter(pk__in=large)]
+
+
+def _delete_rows(model, ids):
+    """
+    Удаляет строки по списку ключей одним DELETE без сигналов и каскада.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM {table} WHERE {pk} IN ({ids})'.format(
+                table=connection.ops.quote_name(model._meta.db_table),
+                pk=connection.ops.quote_name(model._meta.pk.column),
+                ids=', '.join(['%s'] * len(ids)),
+            ),
+            ids,
+        )
+        return cursor.rowcount
+
+
+def delete_chunk(deletion):
+    """
+    Удаляет очередную порцию зависимых строк, а когда их не осталось —
+    сам объект.
+
+    Args:
+        deletion: запись удаления
+
+    Returns:
+        bool: True, если удаление завершено
+    """
+    for queryset in dependents(deletion.target, deletion.object_id):
+        ids = list(queryset.order_by().values_list('pk', flat=True)[
+            :DELETE_CHUNK_SIZE
+        ])
+        if ids:
+            with transaction.atomic():
+                if queryset.model is Post:
+                    # DELETE без сигналов: файлы производных удаляем сами
+                    delete_variant_files(set().union(*map(
+                        variant_files,
+                        Post.objects.filter(pk__in=ids).values_list(
+                            'image_variants', flat=True
+                        ),
+                    )))
+                deleted = _delete_rows(queryset.model, ids)
+                Deletion.objects.filter(pk=deletion.pk).update(
+                    deleted=F('deleted') + deleted,
+                    updated_at=timezone.now(),
+                )
+            return False
+
+    model = Post if deletion.target == Deletion.Target.POST else User
+    with transaction.atomic():
+        root = model.objects.filter(pk=deletion.object_id).first()
+        if root is not None:
+            # Связанных строк не осталось, каскад и сигналы дешевы
+            root.delete()
+        Deletion.objects.filter(pk=deletion.pk).update(
+            status=Deletion.Status.DONE,
+            updated_at=timezone.now(),
+        )
+        invalidate_page_cache(SCOPE_SITE)
+    return True
+
+
+def start_deletion(deletion_id):
+    """
+    Переводит удаление в работу, при первом запуске считая объем.
+
+    Args:
+        deletion_id: id записи удаления
+
+    Returns:
+        Deletion | None: запись удаления или None, если оно уже завершено
+    """
+    deletion = Deletion.objects.exclude(
+        status=Deletion.Status.DONE
+    ).filter(pk=deletion_id).first()
+    if deletion is None:
+        return None
+    if deletion.status == Deletion.Status.PENDING:
+        deletion.total = sum(
+            queryset.count()
+            for queryset in dependents(deletion.target, deletion.object_id)
+        )
+        deletion.status = Deletion.Status.RUNNING
+        deletion.save(update_fields=('total', 'status', 'updated_at'))
+    return deletion
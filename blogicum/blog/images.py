@@ -0,0 +1,175 @@
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from blog.cache import SCOPE_FEEDS, invalidate_page_cache, post_scope
+from blog.constants import (
+    JPEG_QUALITY,
+    POST_IMAGE_WIDTHS,
+    RETINA_FACTOR,
+    WEBP_QUALITY,
+)
+
+logger = logging.getLogger(__name__)
+
+# Форматы производных: WebP и JPEG для браузеров без поддержки WebP
+FORMATS = (
+    ('webp', 'WEBP', {'quality': WEBP_QUALITY, 'method': 6}),
+    ('jpeg', 'JPEG', {
+        'quality': JPEG_QUALITY,
+        'optimize': True,
+        'progressive': True,
+    }),
+)
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+
+def variants_ready(post):
+    """
+    Проверяет, что производные созданы для текущего изображения поста.
+    """
+    return bool(post.image) and (
+        post.image_variants.get('source') == post.image.name
+    )
+
+
+def variant_files(variants):
+    """
+    Возвращает имена файлов производных из описания Post.image_variants.
+
+    Returns:
+        set: имена файлов в хранилище (без оригинала)
+    """
+    return {
+        candidate[key]
+        for variant in POST_IMAGE_WIDTHS
+        for candidate in (variants or {}).get(variant, ())
+        for key in EXTENSIONS
+        if key in candidate
+    }
+
+
+def delete_variant_files(names):
+    """
+    Удаляет файлы производных после фиксации транзакции.
+
+    Если транзакция откатится, описание в базе останется прежним,
+    поэтому файлы удаляются только после ее фиксации.
+
+    Args:
+        names: имена файлов из variant_files
+    """
+    from blog.models import Post
+
+    storage = Post._meta.get_field('image').storage
+
+    def delete():
+        for name in names:
+            storage.delete(name)
+
+    if names:
+        transaction.on_commit(delete)
+
+
+def _flatten(image):
+    """Приводит изображение к RGB, подкладывая белый фон под прозрачность."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, pil_format, options):
+    buffer = BytesIO()
+    image.save(buffer, pil_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def build_image_variants(image_field):
+    """
+    Создает уменьшенные копии изображения рядом с оригиналом.
+
+    Для каждого варианта из POST_IMAGE_WIDTHS сохраняются обычная и
+    retina-ширина в форматах WebP и JPEG. Изображение не увеличивается:
+    ширины больше исходной пропускаются, а если исходник уже меньше
+    варианта, копия делается в исходной ширине. EXIF-поворот
+    применяется, метаданные не переносятся.
+
+    Args:
+        image_field: FieldFile с загруженным изображением поста
+
+    Returns:
+        dict: описание производных для Post.image_variants
+    """
+    storage = image_field.storage
+    root = posixpath.splitext(image_field.name)[0]
+    with image_field.open('rb') as source:
+        original = Image.open(source)
+        original = _flatten(ImageOps.exif_transpose(original))
+    width, height = original.size
+    variants = {'source': image_field.name, 'width': width, 'height': height}
+
+    for variant, base_width in POST_IMAGE_WIDTHS.items():
+        candidates = []
+        for factor in range(1, RETINA_FACTOR + 1):
+            target = base_width * factor
+            if target > width and factor > 1:
+                break
+            target = min(target, width)
+            target_height = max(1, round(height * target / width))
+            resized = original.resize(
+                (target, target_height), Image.Resampling.LANCZOS
+            )
+            suffix = variant if factor == 1 else f'{variant}-{factor}x'
+            candidate = {'width': target, 'height': target_height}
+            for key, pil_format, options in FORMATS:
+                candidate[key] = storage.save(
+                    f'{root}.{suffix}.{EXTENSIONS[key]}',
+                    _encode(resized, pil_format, options),
+                )
+            candidates.append(candidate)
+        variants[variant] = candidates
+    return variants
+
+
+def update_image_variants(post):
+    """
+    Пересоздает производные изображения поста и сохраняет их описание.
+
+    Ошибка чтения изображения, в том числе слишком большого
+    (DecompressionBombError), не повторяется в очереди: описание
+    сохраняется без производных, и шаблоны выводят оригинал. Файлы
+    прежних производных удаляются.
+
+    Args:
+        post: пост с новым или удаленным изображением
+    """
+    from blog.models import Post
+
+    previous = variant_files(post.image_variants)
+    variants = {}
+    if post.image:
+        try:
+            variants = build_image_variants(post.image)
+        except (Image.DecompressionBombError, OSError, ValueError):
+            logger.exception(
+                'Не удалось обработать изображение поста %s', post.pk
+            )
+            # Отмечаем файл обработанным, чтобы выводить оригинал
+            variants = {'source': post.image.name}
+    post.image_variants = variants
+    # update вместо save, чтобы не запускать сигналы повторно; кеш страниц
+    # и карточек сбрасываем сами, чтобы заглушка сменилась изображением
+    Post.objects.filter(pk=post.pk).update(
+        image_variants=variants,
+        updated_at=timezone.now(),
+    )
+    invalidate_page_cache(SCOPE_FEEDS, post_scope(post.pk))
+    delete_variant_files(previous - variant_files(variants))
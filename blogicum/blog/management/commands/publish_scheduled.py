@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from blog.constants import SCHEDULER_MAX_SLEEP
+from blog.publication import PublicationScheduler
+
+
+class Command(BaseCommand):
+    """
+    Запускает планировщик отложенных публикаций.
+    """
+    help = 'Выпускает отложенные посты в момент наступления pub_date.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=SCHEDULER_MAX_SLEEP,
+            help='Самая долгая пауза между проверками в секундах.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выпустить посты, дата которых наступила, и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        scheduler = PublicationScheduler(max_sleep=options['max_sleep'])
+        self.stdout.write('Планировщик публикаций запущен')
+        try:
+            scheduler.run(once=options['once'])
+        except KeyboardInterrupt:
+            scheduler.stop()
+        self.stdout.write('Планировщик публикаций остановлен')
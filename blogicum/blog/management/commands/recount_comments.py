@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from blog.models import Post
+from blog.utils import published_comment_count
+
+
+class Command(BaseCommand):
+    """
+    Сверяет Post.comment_count с фактическим числом опубликованных
+    комментариев и исправляет расхождения.
+    """
+    help = 'Пересчитывает денормализованные счетчики комментариев постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать количество постов с неверным счетчиком.',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = Post.objects.annotate(
+                actual=published_comment_count()
+            ).exclude(comment_count=F('actual'))
+            if options['dry_run']:
+                total = drifted.count()
+            else:
+                # Один UPDATE с подзапросом только для разошедшихся постов
+                total = Post.objects.filter(
+                    pk__in=drifted.values('pk')
+                ).update(
+                    comment_count=published_comment_count(),
+                    updated_at=timezone.now(),
+                )
+        self.stdout.write(f'Постов с неверным счетчиком: {total}')
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import SEED_BATCH_SIZE
+from blog.seeding import Seeder
+
+
+class Command(BaseCommand):
+    """
+    Заполняет базу сгенерированными данными для нагрузочных тестов.
+    """
+    help = (
+        'Создает пользователей, категории, местоположения, посты '
+        'и комментарии пачками bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('users', 1_000),
+            ('categories', 20),
+            ('locations', 100),
+            ('posts', 100_000),
+            ('comments', 1_000_000),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Сколько создать (по умолчанию {default}).',
+            )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SEED_BATCH_SIZE,
+            help='Объектов в одной пачке bulk_create.',
+        )
+        parser.add_argument(
+            '--years',
+            type=int,
+            default=5,
+            help='За сколько лет распределить даты публикации.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Зерно генератора для воспроизводимых данных.',
+        )
+
+    def handle(self, *args, **options):
+        counts = {
+            name: options[name]
+            for name in ('users', 'categories', 'locations', 'posts',
+                         'comments')
+        }
+        if any(count < 0 for count in counts.values()):
+            raise CommandError('Количество не может быть отрицательным.')
+        if options['batch_size'] < 1:
+            raise CommandError('Размер пачки должен быть положительным.')
+        if counts['posts'] and not (counts['users'] and counts['categories']):
+            raise CommandError('Для постов нужны пользователи и категории.')
+        if counts['comments'] and not (counts['users'] and counts['posts']):
+            raise CommandError('Для комментариев нужны пользователи и посты.')
+        seeder = Seeder(
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            years=options['years'],
+            stdout=self.stdout if options['verbosity'] else None,
+        )
+        created = seeder.seed(**counts)
+        self.stdout.write(
+            'Создано: ' + ', '.join(
+                f'{name} — {total}' for name, total in created.items()
+            )
+        )
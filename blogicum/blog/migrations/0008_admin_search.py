@@ -0,0 +1,73 @@
+from django.db import migrations
+
+# Триграммные FTS5-индексы для поиска в админке: находят подстроку, как
+# icontains в search_fields, но по индексу, а не сканированием таблицы
+TRIGRAM_INDEXES = (
+    ('blog_post', ('title',)),
+    ('blog_category', ('title',)),
+    ('blog_location', ('name',)),
+)
+
+
+def create_index(table, columns):
+    """Возвращает SQL создания внешнего индекса и триггеров синхронизации."""
+    index = f'{table}_trigram'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    changed = ' OR '.join(
+        f'old.{column} IS NOT new.{column}' for column in columns
+    )
+    return [
+        f"""
+        CREATE VIRTUAL TABLE {index} USING fts5(
+            {names},
+            content='{table}',
+            content_rowid='id',
+            tokenize='trigram'
+        )
+        """,
+        f"INSERT INTO {index}({index}) VALUES ('rebuild')",
+        f"""
+        CREATE TRIGGER {index}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {index}(rowid, {names}) VALUES (new.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {index}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {index}({index}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {index}_update AFTER UPDATE OF {names} ON {table}
+        WHEN {changed} BEGIN
+            INSERT INTO {index}({index}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+            INSERT INTO {index}(rowid, {names}) VALUES (new.id, {new});
+        END
+        """,
+    ]
+
+
+def drop_index(table):
+    """Возвращает SQL удаления индекса и его триггеров."""
+    index = f'{table}_trigram'
+    return [
+        f'DROP TRIGGER IF EXISTS {index}_update',
+        f'DROP TRIGGER IF EXISTS {index}_delete',
+        f'DROP TRIGGER IF EXISTS {index}_insert',
+        f'DROP TABLE IF EXISTS {index}',
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_search'),
+    ]
+
+    operations = [
+        migrations.RunSQL(create_index(table, columns), drop_index(table))
+        for table, columns in TRIGRAM_INDEXES
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.10 on 2026-10-18 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_admin_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Deletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target', models.CharField(choices=[('post', 'Пост'), ('user', 'Пользователь')], max_length=16, verbose_name='Объект')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('label', models.CharField(blank=True, max_length=256, verbose_name='Название')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Завершено')], default='pending', max_length=16, verbose_name='Состояние')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Связанных объектов')),
+                ('deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Изменено')),
+            ],
+            options={
+                'verbose_name': 'удаление',
+                'verbose_name_plural': 'Удаления',
+                'ordering': ('-created_at',),
+                'indexes': [models.Index(condition=models.Q(('status', 'done'), _negated=True), fields=['target', 'object_id'], name='deletion_active_idx')],
+            },
+        ),
+    ]
@@ -8,6 +8,27 @@ from blog.constants import MAX_LENGTH, MAX_TEXT, MAX_WORDS_LENGTH
 User = get_user_model()
 
 
+class PublishedQuerySet(models.QuerySet):
+    """
+    QuerySet публикаций с быстрым ответом на вопрос «что-нибудь изменилось?».
+    """
+
+    def last_modified(self):
+        """
+        Возвращает время последнего изменения записей выборки.
+
+        Сортировка по updated_at с LIMIT 1 обслуживается индексом, если
+        фильтр выборки совпадает с его префиксом (например, посты категории
+        или комментарии поста).
+
+        Returns:
+            datetime | None: время изменения или None для пустой выборки
+        """
+        return self.order_by('-updated_at').values_list(
+            'updated_at', flat=True
+        ).first()
+
+
 class PublishedBaseModel(models.Model):
     """
     Абстрактная модель, содержащая общие поля для публикаций.
@@ -15,6 +36,7 @@ class PublishedBaseModel(models.Model):
     Поля:
     - is_published: флаг публикации (опубликовано/скрыто)
     - created_at: дата и время создания записи
+    - updated_at: дата и время последнего изменения записи
     """
     is_published = models.BooleanField(
         default=True,
@@ -25,11 +47,26 @@ class PublishedBaseModel(models.Model):
         auto_now_add=True,
         verbose_name='Добавлено',
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Изменено',
+    )
+
+    objects = PublishedQuerySet.as_manager()
 
     class Meta:
         # Указывает, что модель абстрактная и не будет создаваться в базе данных
         abstract = True
 
+    def save(self, *args, update_fields=None, **kwargs):
+        """
+        Сохраняет запись, обновляя updated_at и при частичном сохранении.
+        """
+        if update_fields is not None:
+            update_fields = {*update_fields, 'updated_at'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
 
 class Category(PublishedBaseModel):
     """
@@ -41,6 +78,7 @@ class Category(PublishedBaseModel):
     - slug: уникальный идентификатор для URL
     - is_published: флаг публикации (унаследовано)
     - created_at: дата создания (унаследовано)
+    - updated_at: дата изменения (унаследовано)
     """
     title = models.CharField(
         max_length=MAX_LENGTH,
@@ -78,6 +116,7 @@ class Location(PublishedBaseModel):
     - name: название места
     - is_published: флаг публикации (унаследовано)
     - created_at: дата создания (унаследовано)
+    - updated_at: дата изменения (унаследовано)
     """
     name = models.CharField(
         max_length=MAX_LENGTH,
@@ -108,8 +147,11 @@ class Post(PublishedBaseModel):
     - location: местоположение поста (связь с Location)
     - category: категория поста (связь с Category)
     - image: изображение к посту
+    - image_variants: уменьшенные копии изображения (WebP и JPEG)
+    - comment_count: количество опубликованных комментариев
     - is_published: флаг публикации (унаследовано)
     - created_at: дата создания (унаследовано)
+    - updated_at: дата изменения (унаследовано)
     """
     title = models.CharField(max_length=MAX_LENGTH, verbose_name='Заголовок')
     text = models.TextField(verbose_name='Текст')
@@ -143,12 +185,56 @@ class Post(PublishedBaseModel):
         blank=True,
         verbose_name='Изображение к публикации'
     )
+    # Уменьшенные копии изображения (см. blog/images.py)
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Производные изображения',
+    )
+    # Счетчик поддерживается сигналами в blog/signals.py,
+    # сверяется командой recount_comments
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
 
     class Meta:
         # Указывает имя связанного поля при обращении к постам через связанные модели
         default_related_name = 'posts'
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        # Индексы под ленты из query_post: id входит в каждый индекс SQLite
+        # как rowid, поэтому они обслуживают и сортировку (-pub_date, -id)
+        indexes = (
+            # Главная страница: опубликованные посты по дате
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_published_feed_idx',
+            ),
+            # Страница категории
+            models.Index(
+                fields=('category', 'pub_date'),
+                condition=models.Q(is_published=True),
+                name='post_category_feed_idx',
+            ),
+            # Профиль: автор видит и неопубликованные посты
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_feed_idx',
+            ),
+            # Последние изменения в категории и у автора (last_modified)
+            models.Index(
+                fields=('category', 'updated_at'),
+                name='post_category_updated_idx',
+            ),
+            models.Index(
+                fields=('author', 'updated_at'),
+                name='post_author_updated_idx',
+            ),
+        )
 
     def __str__(self):
         """
@@ -175,6 +261,7 @@ class Comment(PublishedBaseModel):
     - post: пост, к которому относится комментарий (связь с Post)
     - is_published: флаг публикации (унаследовано)
     - created_at: дата создания (унаследовано)
+    - updated_at: дата изменения (унаследовано)
     """
     text = models.TextField(verbose_name='Текст комментария')
     author = models.ForeignKey(
@@ -194,6 +281,18 @@ class Comment(PublishedBaseModel):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарий'
         ordering = ('created_at',)  # Сортировка по дате создания (сначала новые)
+        indexes = (
+            # Порции обсуждения поста по курсору (created_at, id)
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_thread_idx',
+            ),
+            # Последнее изменение в обсуждении поста (last_modified)
+            models.Index(
+                fields=('post', 'updated_at'),
+                name='comment_post_updated_idx',
+            ),
+        )
 
     def __str__(self):
         """
@@ -201,4 +300,102 @@ class Comment(PublishedBaseModel):
         """
         return (f'Комментарий автора {self.author}'
                 f' к посту "{self.post}",'
-                f' текст: {self.text[:MAX_TEXT]}')
\ No newline at end of file
+                f' текст: {self.text[:MAX_TEXT]}')
+
+
+class DeletionQuerySet(models.QuerySet):
+    """
+    QuerySet фоновых удалений.
+    """
+
+    def hidden_ids(self, target):
+        """
+        Возвращает подзапрос с id объектов, удаление которых еще идет.
+
+        Такие объекты скрываются сразу при постановке удаления,
+        не дожидаясь, пока будут удалены связанные с ними записи.
+
+        Args:
+            target: тип объекта (Deletion.Target)
+
+        Returns:
+            QuerySet: выборка значений object_id
+        """
+        return self.filter(target=target).exclude(
+            status=Deletion.Status.DONE
+        ).values('object_id')
+
+
+class Deletion(models.Model):
+    """
+    Фоновое удаление поста или пользователя с большим числом связанных
+    объектов (см. blog/deletion.py).
+
+    Атрибуты:
+    - target: тип удаляемого объекта
+    - object_id: id удаляемого объекта
+    - label: строковое представление объекта на момент удаления
+    - status: состояние удаления
+    - total: количество связанных объектов на момент постановки
+    - deleted: количество уже удаленных объектов
+    - created_at: дата постановки
+    - updated_at: дата изменения
+    """
+
+    class Target(models.TextChoices):
+        POST = 'post', 'Пост'
+        USER = 'user', 'Пользователь'
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Завершено'
+
+    target = models.CharField(
+        max_length=16,
+        choices=Target.choices,
+        verbose_name='Объект',
+    )
+    object_id = models.PositiveBigIntegerField(verbose_name='ID объекта')
+    label = models.CharField(
+        max_length=MAX_LENGTH,
+        blank=True,
+        verbose_name='Название',
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Состояние',
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Связанных объектов',
+    )
+    deleted = models.PositiveIntegerField(default=0, verbose_name='Удалено')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено',
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменено')
+
+    objects = DeletionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'удаление'
+        verbose_name_plural = 'Удаления'
+        ordering = ('-created_at',)
+        indexes = (
+            # Скрытие объектов, удаление которых еще идет
+            models.Index(
+                fields=('target', 'object_id'),
+                condition=~models.Q(status='done'),
+                name='deletion_active_idx',
+            ),
+        )
+
+    def __str__(self):
+        """
+        Возвращает строковое представление удаления.
+        """
+        return f'{self.get_target_display()} «{self.label}»'
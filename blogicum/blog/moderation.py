@@ -0,0 +1,110 @@
+from django.db import transaction
+from django.utils import timezone
+
+from blog.cache import SCOPE_SITE, invalidate_page_cache
+from blog.models import Comment, Deletion, Post
+from blog.utils import published_comment_count
+
+# Массовые операции модерации. QuerySet.update не отправляет сигналы,
+# поэтому updated_at, счетчики комментариев и кеш страниц обновляются
+# здесь явно: один UPDATE на операцию и один сброс кеша всего сайта
+# вместо сохранения и сброса по каждой строке.
+
+
+def _update(queryset, **fields):
+    """
+    Обновляет строки одним UPDATE, сдвигая updated_at, и сбрасывает кеш.
+
+    Returns:
+        int: количество обновленных строк
+    """
+    with transaction.atomic():
+        updated = queryset.update(updated_at=timezone.now(), **fields)
+        if updated:
+            invalidate_page_cache(SCOPE_SITE)
+    return updated
+
+
+def _exclude_deleting(queryset):
+    """
+    Исключает посты и комментарии, которые удаляются в фоне.
+
+    Пост удаляемого пользователя тоже считается удаляемым: его нельзя
+    вернуть в ленту, пока воркер удаляет связанные строки.
+    """
+    posts = Deletion.objects.hidden_ids(Deletion.Target.POST)
+    users = Deletion.objects.hidden_ids(Deletion.Target.USER)
+    if queryset.model is Post:
+        return queryset.exclude(pk__in=posts).exclude(author_id__in=users)
+    if queryset.model is Comment:
+        return queryset.exclude(post_id__in=posts).exclude(
+            author_id__in=users
+        ).exclude(post__author_id__in=users)
+    return queryset
+
+
+def set_published(queryset, is_published):
+    """
+    Публикует или снимает с публикации посты, категории или местоположения.
+
+    Посты, которые удаляются в фоне, не публикуются.
+
+    Args:
+        queryset: QuerySet модели, унаследованной от PublishedBaseModel
+        is_published: новое значение флага публикации
+
+    Returns:
+        int: количество измененных объектов
+    """
+    if is_published:
+        queryset = _exclude_deleting(queryset)
+    return _update(
+        queryset.exclude(is_published=is_published),
+        is_published=is_published,
+    )
+
+
+def move_posts(queryset, category):
+    """
+    Переносит посты в другую категорию.
+
+    Args:
+        queryset: QuerySet постов
+        category: новая категория
+
+    Returns:
+        int: количество перенесенных постов
+    """
+    return _update(queryset.exclude(category=category), category=category)
+
+
+def set_comments_published(queryset, is_published):
+    """
+    Публикует или скрывает комментарии и пересчитывает счетчики постов.
+
+    Счетчики затронутых постов пересчитываются одним UPDATE
+    с подзапросом, вместе с ними сдвигается updated_at постов.
+    Комментарии постов и пользователей, которые удаляются в фоне,
+    не публикуются.
+
+    Args:
+        queryset: QuerySet комментариев
+        is_published: новое значение флага публикации
+
+    Returns:
+        int: количество измененных комментариев
+    """
+    if is_published:
+        queryset = _exclude_deleting(queryset)
+    queryset = queryset.exclude(is_published=is_published)
+    with transaction.atomic():
+        post_ids = list(
+            queryset.order_by().values_list('post_id', flat=True).distinct()
+        )
+        updated = _update(queryset, is_published=is_published)
+        if updated:
+            Post.objects.filter(pk__in=post_ids).update(
+                comment_count=published_comment_count(),
+                updated_at=timezone.now(),
+            )
+    return updated
@@ -0,0 +1,107 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from blog.cache import SCOPE_SITE, invalidate_page_cache, next_publication
+from blog.constants import SCHEDULER_MAX_SLEEP, SCHEDULER_OVERLAP
+from blog.models import Post
+
+logger = logging.getLogger(__name__)
+
+
+def publish_due_posts(now=None, since=None):
+    """
+    Выпускает отложенные посты, дата публикации которых наступила.
+
+    Пост считается еще не выпущенным, пока его updated_at меньше
+    pub_date: с момента наступления даты его никто не сохранял. Выпуск
+    сдвигает updated_at одним UPDATE (ленты и страница поста получают
+    новый Last-Modified) и сбрасывает кеш сайта одной сменой поколения,
+    сколько бы постов ни вышло. Повторный вызов ничего не делает.
+
+    Args:
+        now: момент выпуска (по умолчанию текущее время)
+        since: нижняя граница pub_date для выборки (None — все посты)
+
+    Returns:
+        int: количество выпущенных постов
+    """
+    now = now or timezone.now()
+    due = Post.objects.filter(
+        is_published=True,
+        pub_date__lte=now,
+        updated_at__lt=F('pub_date'),
+    )
+    if since is not None:
+        due = due.filter(pub_date__gt=since)
+    with transaction.atomic():
+        published = due.update(updated_at=now)
+        if published:
+            invalidate_page_cache(SCOPE_SITE)
+    return published
+
+
+class PublicationScheduler:
+    """
+    Выпускает отложенные посты в момент наступления их pub_date.
+
+    Между проверками планировщик спит до выхода ближайшего отложенного
+    поста, но не дольше max_sleep: так замечаются посты, отложенные
+    уже после начала сна. При запуске выпускаются все посты, дата
+    которых наступила, пока планировщик не работал, дальше проверяется
+    только окно с прошлой проверки (с запасом SCHEDULER_OVERLAP).
+
+    Посты остаются скрытыми до pub_date и без планировщика (query_post
+    сравнивает дату с текущим временем), а кеш страниц живет не дольше
+    выхода ближайшего поста (см. blog.cache.page_cache_timeout).
+    Планировщик делает выход поста изменением: сбрасывает кеш
+    и сдвигает даты изменения.
+    """
+
+    def __init__(self, max_sleep=SCHEDULER_MAX_SLEEP):
+        self.max_sleep = max_sleep
+        self.since = None
+        self.stopped = threading.Event()
+
+    def tick(self):
+        """
+        Выполняет одну проверку.
+
+        Returns:
+            float: пауза в секундах до следующей проверки
+        """
+        now = timezone.now()
+        published = publish_due_posts(now, self.since)
+        if published:
+            logger.info('Выпущено отложенных постов: %s', published)
+        self.since = now - timedelta(seconds=SCHEDULER_OVERLAP)
+        moment = next_publication(now)
+        if moment is None:
+            return self.max_sleep
+        return min(
+            self.max_sleep,
+            max(0.0, (moment - timezone.now()).total_seconds()),
+        )
+
+    def run(self, once=False):
+        """
+        Запускает цикл проверок.
+
+        Args:
+            once: выполнить одну проверку и завершиться
+        """
+        if once:
+            self.tick()
+            return
+        while not self.stopped.is_set():
+            self.stopped.wait(self.tick())
+            # Пока планировщик спал, соединение с БД могло устареть
+            close_old_connections()
+
+    def stop(self):
+        """Просит планировщик завершиться."""
+        self.stopped.set()
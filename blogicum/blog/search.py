@@ -0,0 +1,222 @@
+import base64
+import binascii
+import json
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from blog.constants import (
+    MAX_SEARCH_CANDIDATES,
+    MAX_SEARCH_TERMS,
+    POSTS_ON_PAGE,
+    SEARCH_SNIPPET_WORDS,
+    SEARCH_TITLE_WEIGHT,
+)
+from blog.utils import KeysetPage
+
+# FTS5-индекс постов, см. миграцию 0007_post_search
+SEARCH_TABLE = 'blog_post_fts'
+WORD_RE = re.compile(r'\w+')
+
+
+def search_terms(query):
+    """
+    Выделяет слова из строки поиска.
+
+    Args:
+        query: строка поиска
+
+    Returns:
+        list: не более MAX_SEARCH_TERMS слов в нижнем регистре
+    """
+    return WORD_RE.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+
+def build_match_query(query):
+    """
+    Превращает пользовательский запрос в выражение MATCH для FTS5.
+
+    Каждое слово ищется как префикс ("слово"*), чтобы находились разные
+    окончания; все слова должны встретиться в посте. Операторы FTS5 из
+    запроса не передаются.
+
+    Args:
+        query: строка поиска
+
+    Returns:
+        str: выражение MATCH или пустая строка, если слов нет
+    """
+    return ' '.join(f'"{term}"*' for term in search_terms(query))
+
+
+def rank_candidates(query, posts=None, limit=MAX_SEARCH_CANDIDATES):
+    """
+    Выбирает из FTS5-индекса самые новые совпадения с их рангом BM25.
+
+    Совпадения читаются по убыванию rowid, поэтому FTS5 останавливается
+    после limit строк и не ранжирует все посты с частым словом.
+    Видимость проверяется в том же запросе коррелированным EXISTS до
+    LIMIT: скрытые посты не занимают места среди limit совпадений.
+    Запрос выполняется в той же базе, из которой читается posts
+    (например, в реплике у представлений с replica_reads).
+
+    Args:
+        query: строка поиска
+        posts: QuerySet видимых постов (None — без проверки видимости)
+        limit: максимальное количество совпадений
+
+    Returns:
+        list: пары (ранг, id поста); меньший ранг — лучшее совпадение
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    visibility, params = '', []
+    alias = DEFAULT_DB_ALIAS if posts is None else posts.db
+    if posts is not None:
+        visible = posts.filter(
+            id=RawSQL(f'{SEARCH_TABLE}.rowid', [])
+        ).order_by().values('id')
+        sql, params = visible.query.sql_with_params()
+        visibility = f' AND EXISTS ({sql})'
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            f'SELECT bm25({SEARCH_TABLE}, {SEARCH_TITLE_WEIGHT}, 1.0), rowid'
+            f' FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s'
+            f'{visibility} ORDER BY rowid DESC LIMIT %s',
+            [match, *params, limit],
+        )
+        return cursor.fetchall()
+
+
+def highlight_matches(text, terms, words=None):
+    """
+    Экранирует текст и выделяет тегом <mark> слова, начинающиеся
+    с искомых.
+
+    Args:
+        text: заголовок или текст поста
+        terms: слова запроса из search_terms
+        words: если задано, текст сокращается до фрагмента из стольких
+            слов вокруг первого совпадения
+
+    Returns:
+        SafeString: HTML с выделенными совпадениями
+    """
+    pattern = re.compile(
+        r'\b(?:' + '|'.join(map(re.escape, terms)) + r')\w*', re.IGNORECASE
+    )
+    prefix = suffix = ''
+    if words is not None:
+        tokens = list(WORD_RE.finditer(text))
+        first = next(
+            (i for i, token in enumerate(tokens)
+             if pattern.fullmatch(token.group())),
+            0,
+        )
+        start = max(0, first - words // 4)
+        end = min(len(tokens), start + words)
+        if tokens:
+            prefix = '…' if start > 0 else ''
+            suffix = '…' if end < len(tokens) else ''
+            text = text[tokens[start].start():tokens[end - 1].end()]
+    parts, position = [], 0
+    for found in pattern.finditer(text):
+        parts.append(escape(text[position:found.start()]))
+        parts.append(f'<mark>{escape(found.group())}</mark>')
+        position = found.end()
+    parts.append(escape(text[position:]))
+    return mark_safe(prefix + ''.join(parts) + suffix)
+
+
+def encode_search_cursor(post):
+    """Кодирует позицию поста в выдаче (ранг, id) в токен для URL."""
+    payload = json.dumps([post.search_rank, post.pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_search_cursor(token):
+    """
+    Раскодирует токен курсора поиска.
+
+    Returns:
+        tuple | None: (ранг, id) или None, если токен поврежден
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        rank, pk = json.loads(payload)
+    except (binascii.Error, TypeError, ValueError):
+        return None
+    if not isinstance(rank, (int, float)) or not isinstance(pk, int):
+        return None
+    return float(rank), pk
+
+
+class SearchPage(KeysetPage):
+    """
+    Страница результатов поиска, выбранная по курсору (ранг, id).
+
+    Результаты листаются только вперед, как порции комментариев.
+    """
+
+    @property
+    def previous_cursor(self):
+        return None
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return encode_search_cursor(self.object_list[-1])
+        return None
+
+
+def search_posts(posts, query, cursor=None, per_page=POSTS_ON_PAGE):
+    """
+    Ищет посты по заголовку и тексту через FTS5-индекс.
+
+    Ограничения видимости берутся из переданного QuerySet (как правило,
+    query_post), поэтому поиск показывает те же посты, что и ленты.
+    Результаты отсортированы по BM25 (совпадения в заголовке весомее)
+    и id. Запрос к индексу вместе с проверкой видимости и загрузка
+    страницы ограничены MAX_SEARCH_CANDIDATES и размером страницы,
+    OFFSET и COUNT не используются.
+
+    Args:
+        posts: QuerySet постов, например query_post()
+        query: строка поиска
+        cursor: токен курсора (None или поврежденный — первая страница)
+        per_page: количество постов на странице
+
+    Returns:
+        SearchPage: страница постов с атрибутами search_rank,
+            search_title и search_snippet
+    """
+    position = decode_search_cursor(cursor) if cursor else None
+    candidates = sorted(
+        candidate for candidate in rank_candidates(query, posts)
+        if position is None or candidate > position
+    )
+
+    page = candidates[:per_page]
+    found = posts.in_bulk([pk for _, pk in page]) if page else {}
+    terms = search_terms(query)
+    object_list = []
+    for rank, pk in page:
+        post = found.get(pk)
+        if post is None:
+            # Пост удален или скрыт после запроса к индексу
+            continue
+        post.search_rank = rank
+        post.search_title = highlight_matches(post.title, terms)
+        post.search_snippet = highlight_matches(
+            post.text, terms, SEARCH_SNIPPET_WORDS
+        )
+        object_list.append(post)
+    return SearchPage(
+        object_list,
+        has_previous=position is not None,
+        has_next=len(candidates) > per_page,
+    )
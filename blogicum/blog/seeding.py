@@ -0,0 +1,247 @@
+import random
+import uuid
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from blog.cache import SCOPE_SITE, invalidate_page_cache
+from blog.models import Category, Comment, Location, Post, User
+from blog.utils import published_comment_count
+
+# Генерация больших объемов данных для нагрузочных тестов
+# (manage.py seed_blog). Объекты создаются генераторами и пишутся пачками
+# bulk_create, каждая в своей транзакции: в памяти одновременно только
+# одна пачка, а для связей хранятся лишь диапазоны созданных id.
+
+WORDS = (
+    'город утро дорога река лес море солнце ветер дом окно книга время'
+    ' друг работа поезд история музыка вечер зима лето осень весна кофе'
+    ' парк мост улица небо гора поле сад свет тень путь письмо фото'
+    ' встреча праздник ужин завтрак прогулка выставка концерт кино'
+    ' новый старый тихий яркий длинный короткий теплый холодный добрый'
+).split()
+# Доля отложенных и скрытых постов
+FUTURE_SHARE = 0.02
+UNPUBLISHED_SHARE = 0.05
+# Доля постов без местоположения и скрытых комментариев
+NO_LOCATION_SHARE = 0.3
+HIDDEN_COMMENT_SHARE = 0.03
+# Степень перекоса: чем больше, тем сильнее выбор смещен к началу
+# или концу диапазона (популярные авторы, свежие посты)
+AUTHOR_SKEW = 2
+CATEGORY_SKEW = 2
+COMMENT_SKEW = 2
+
+
+def batched(iterable, size):
+    """Разбивает поток объектов на списки длиной size."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class IdRanges:
+    """
+    Id созданных объектов в виде диапазонов — по одному на пачку.
+
+    Позволяет выбирать случайный существующий id, не храня
+    все id в памяти.
+    """
+
+    def __init__(self):
+        self.ranges = []
+        self.total = 0
+
+    def add(self, objects):
+        ids = sorted(obj.pk for obj in objects)
+        # Id пачки идут подряд, кроме редких пропусков
+        start = ids[0]
+        for previous, current in zip(ids, ids[1:] + [None]):
+            if current != previous + 1:
+                self.ranges.append((start, previous))
+                self.total += previous - start + 1
+                start = current
+
+    def pick(self, position):
+        """
+        Возвращает id по позиции в [0, 1): 0 — самый ранний объект.
+        """
+        index = min(int(position * self.total), self.total - 1)
+        for start, end in self.ranges:
+            size = end - start + 1
+            if index < size:
+                return start + index
+            index -= size
+        raise IndexError(position)
+
+
+class Seeder:
+    """
+    Генерирует пользователей, категории, местоположения, посты
+    и комментарии.
+
+    Распределения:
+    - авторы и категории выбираются с перекосом: несколько популярных
+      получают большую часть постов;
+    - даты публикации растут к текущему моменту (блог становится
+      активнее), около 2% постов отложены, около 5% скрыты;
+    - комментарии сосредоточены на свежих постах, у большинства постов
+      их мало, у немногих — сотни.
+    """
+
+    def __init__(self, batch_size, seed=None, years=5, stdout=None):
+        self.batch_size = batch_size
+        self.rnd = random.Random(seed)
+        # Метка запуска делает уникальные поля неповторяющимися при
+        # повторных запусках
+        self.run = uuid.uuid4().hex[:8]
+        self.years = years
+        self.stdout = stdout
+        self.now = timezone.now()
+        self.texts = [self.sentence(8, 60) for _ in range(500)]
+        self.titles = [self.sentence(2, 8).rstrip('.') for _ in range(500)]
+
+    def sentence(self, low, high):
+        words = self.rnd.choices(WORDS, k=self.rnd.randint(low, high))
+        return ' '.join(words).capitalize() + '.'
+
+    def skewed(self, skew):
+        """Случайная позиция в [0, 1), смещенная к 0."""
+        return self.rnd.random() ** skew
+
+    def write(self, model, objects, total):
+        """
+        Пишет объекты пачками bulk_create.
+
+        Returns:
+            IdRanges: диапазоны id созданных объектов
+        """
+        ranges = IdRanges()
+        written = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            ranges.add(batch)
+            written += len(batch)
+            if self.stdout:
+                self.stdout.write(
+                    f'{model._meta.verbose_name_plural}: {written}/{total}'
+                )
+        return ranges
+
+    def users(self, count):
+        # Пароль без хеширования: войти под такими пользователями нельзя
+        password = make_password(None)
+        return (
+            User(
+                username=f'seed{self.run}_{i}',
+                password=password,
+                first_name=self.rnd.choice(WORDS).capitalize(),
+                date_joined=self.now,
+            )
+            for i in range(count)
+        )
+
+    def categories(self, count):
+        return (
+            Category(
+                title=f'{self.rnd.choice(WORDS).capitalize()} {self.run}-{i}',
+                description=self.rnd.choice(self.texts),
+                slug=f'seed-{self.run}-{i}',
+                # Каждая десятая категория скрыта
+                is_published=i % 10 != 9,
+            )
+            for i in range(count)
+        )
+
+    def locations(self, count):
+        return (
+            Location(name=f'{self.rnd.choice(WORDS).capitalize()} {i}')
+            for i in range(count)
+        )
+
+    def pub_date(self):
+        if self.rnd.random() < FUTURE_SHARE:
+            return self.now + timedelta(
+                minutes=self.rnd.randint(1, 30 * 24 * 60)
+            )
+        # Квадратный корень сдвигает даты к настоящему моменту
+        age = 1 - self.rnd.random() ** 0.5
+        return self.now - timedelta(days=age * self.years * 365)
+
+    def posts(self, count, users, categories, locations):
+        for _ in range(count):
+            yield Post(
+                title=self.rnd.choice(self.titles),
+                text=self.rnd.choice(self.texts),
+                pub_date=self.pub_date(),
+                author_id=users.pick(self.skewed(AUTHOR_SKEW)),
+                category_id=categories.pick(self.skewed(CATEGORY_SKEW)),
+                location_id=(
+                    None if not locations.total
+                    or self.rnd.random() < NO_LOCATION_SHARE
+                    else locations.pick(self.rnd.random())
+                ),
+                is_published=self.rnd.random() >= UNPUBLISHED_SHARE,
+            )
+
+    def comments(self, count, users, posts):
+        for _ in range(count):
+            yield Comment(
+                text=self.rnd.choice(self.texts),
+                # Новые посты (конец диапазона) обсуждают больше
+                post_id=posts.pick(1 - self.skewed(COMMENT_SKEW)),
+                author_id=users.pick(self.rnd.random()),
+                is_published=self.rnd.random() >= HIDDEN_COMMENT_SHARE,
+            )
+
+    def recount(self, posts):
+        """
+        Заполняет comment_count созданных постов.
+
+        bulk_create не вызывает сигналы, поэтому счетчики считаются
+        после вставки комментариев — UPDATE на каждую пачку id.
+        """
+        for start, end in posts.ranges:
+            for low in range(start, end + 1, self.batch_size):
+                high = min(low + self.batch_size - 1, end)
+                # update() не трогает updated_at: отложенные посты
+                # остаются невыпущенными для планировщика
+                Post.objects.filter(pk__range=(low, high)).update(
+                    comment_count=published_comment_count()
+                )
+
+    def seed(self, users, categories, locations, posts, comments):
+        """
+        Создает данные и пересчитывает счетчики комментариев.
+
+        Returns:
+            dict: количество созданных объектов по моделям
+        """
+        user_ids = self.write(User, self.users(users), users)
+        category_ids = self.write(
+            Category, self.categories(categories), categories
+        )
+        location_ids = self.write(
+            Location, self.locations(locations), locations
+        )
+        post_ids = self.write(
+            Post,
+            self.posts(posts, user_ids, category_ids, location_ids),
+            posts,
+        )
+        comment_ids = self.write(
+            Comment, self.comments(comments, user_ids, post_ids), comments
+        )
+        self.recount(post_ids)
+        invalidate_page_cache(SCOPE_SITE)
+        return {
+            'users': user_ids.total,
+            'categories': category_ids.total,
+            'locations': location_ids.total,
+            'posts': post_ids.total,
+            'comments': comment_ids.total,
+        }
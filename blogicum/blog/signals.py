@@ -0,0 +1,212 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog import tasks
+from blog.cache import (
+    SCOPE_FEEDS,
+    SCOPE_SITE,
+    invalidate_page_cache,
+    post_scope,
+)
+from blog.images import (
+    delete_variant_files,
+    update_image_variants,
+    variant_files,
+    variants_ready,
+)
+from blog.models import Category, Comment, Location, Post, User
+from blog.utils import published_comment_count
+from jobs.models import Job
+
+# Отметка для объектов, загруженных без отслеживаемых полей
+UNKNOWN = object()
+# Поля пользователя, которые выводятся в карточках и на странице поста
+AUTHOR_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def counted_post_id(comment):
+    """
+    Возвращает id поста, в счетчике которого учтен комментарий.
+
+    Args:
+        comment: объект комментария
+
+    Returns:
+        int | None: id поста или None, если комментарий не опубликован
+    """
+    return comment.post_id if comment.is_published else None
+
+
+def shift_comment_count(post_id, delta):
+    """
+    Атомарно изменяет счетчик комментариев поста на delta одним UPDATE.
+
+    Вместе со счетчиком обновляется updated_at поста: так удаление
+    комментария тоже оставляет след для кешей и HTTP-валидаторов.
+    """
+    if post_id is not None:
+        Post.objects.filter(pk=post_id).update(
+            comment_count=F('comment_count') + delta,
+            updated_at=timezone.now(),
+        )
+
+
+def recount_comments(post_id):
+    """
+    Пересчитывает счетчик комментариев поста по таблице комментариев.
+    """
+    if post_id is not None:
+        Post.objects.filter(pk=post_id).update(
+            comment_count=published_comment_count(),
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(post_init, sender=Comment)
+def remember_counted_post(sender, instance, **kwargs):
+    """
+    Запоминает, в каком счетчике учтен комментарий на момент загрузки.
+    """
+    if {'is_published', 'post_id'} & instance.get_deferred_fields():
+        # Не догружаем отложенные поля: сверим счетчик при сохранении
+        instance._counted_post_id = UNKNOWN
+    else:
+        instance._counted_post_id = counted_post_id(instance)
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, **kwargs):
+    """
+    Переносит комментарий между счетчиками при создании и модерации.
+    """
+    previous = instance._counted_post_id
+    current = counted_post_id(instance)
+    if previous is UNKNOWN:
+        recount_comments(current or instance.post_id)
+    elif previous != current:
+        shift_comment_count(previous, -1)
+        shift_comment_count(current, 1)
+    instance._counted_post_id = current
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, **kwargs):
+    """
+    Уменьшает счетчик поста при удалении опубликованного комментария.
+    """
+    if instance._counted_post_id is UNKNOWN:
+        recount_comments(instance.post_id)
+    else:
+        shift_comment_count(instance._counted_post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+def process_post_image(sender, instance, raw=False, **kwargs):
+    """
+    Ставит в очередь создание производных после загрузки нового файла
+    и сразу очищает их описание, если изображение удалено.
+
+    Обработка изображения не выполняется в запросе: пока воркер
+    (manage.py run_jobs) не создал производные, шаблоны выводят заглушку.
+    """
+    if raw or {'image', 'image_variants'} & instance.get_deferred_fields():
+        return
+    if instance.image and not variants_ready(instance):
+        if not image_job_pending(instance.pk):
+            tasks.process_post_image.delay(post_id=instance.pk)
+    elif not instance.image and instance.image_variants:
+        update_image_variants(instance)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_image_variants(sender, instance, **kwargs):
+    """
+    Удаляет файлы производных изображения удаленного поста.
+    """
+    if 'image_variants' not in instance.get_deferred_fields():
+        delete_variant_files(variant_files(instance.image_variants))
+
+
+def image_job_pending(post_id):
+    """Проверяет, ждет ли уже пост обработки изображения в очереди."""
+    return Job.objects.filter(
+        name=tasks.process_post_image.name,
+        status=Job.Status.PENDING,
+        payload__post_id=post_id,
+    ).exists()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    """
+    Сбрасывает кеш лент и страницы поста при его изменении.
+    """
+    invalidate_page_cache(SCOPE_FEEDS, post_scope(instance.pk))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """
+    Сбрасывает кеш страницы поста и лент, где выводится счетчик комментариев.
+    """
+    invalidate_page_cache(SCOPE_FEEDS, post_scope(instance.post_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_site_pages(sender, instance, **kwargs):
+    """
+    Сбрасывает кеш всех страниц: категория и местоположение выводятся
+    в карточках и определяют видимость постов.
+    """
+    invalidate_page_cache(SCOPE_SITE)
+
+
+def author_name(user):
+    """
+    Возвращает поля пользователя, которые выводятся на страницах.
+
+    Returns:
+        tuple | UNKNOWN: значения AUTHOR_FIELDS или UNKNOWN, если
+        какие-то из них не загружены
+    """
+    if set(AUTHOR_FIELDS) & user.get_deferred_fields():
+        return UNKNOWN
+    return tuple(getattr(user, field) for field in AUTHOR_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_author_name(sender, instance, **kwargs):
+    """
+    Запоминает имя пользователя на момент загрузки.
+    """
+    instance._author_name = author_name(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(
+        sender, instance, created=False, update_fields=None, **kwargs
+):
+    """
+    Сбрасывает кеш всех страниц при изменении имени пользователя: оно
+    выводится в карточках и на странице поста. Новый пользователь еще
+    нигде не выводится, а вход (last_login), смена пароля и другие поля
+    на страницы не влияют — такие сохранения пропускаются.
+    """
+    previous = instance._author_name
+    instance._author_name = author_name(instance)
+    if created:
+        return
+    if update_fields is not None and not set(AUTHOR_FIELDS) & set(
+        update_fields
+    ):
+        return
+    if previous is not UNKNOWN and previous == instance._author_name:
+        return
+    invalidate_page_cache(SCOPE_SITE)
@@ -0,0 +1,45 @@
+from blog import deletion
+from blog.constants import DELETE_CHUNKS_PER_JOB
+from blog.images import update_image_variants, variants_ready
+from blog.models import Post
+from jobs.registry import task
+
+
+@task('blog.process_post_image', queue='images')
+def process_post_image(post_id):
+    """
+    Создает производные изображения поста.
+
+    Задача идемпотентна: пост перечитывается из базы, и если изображение
+    уже обработано или удалено, ничего не делается.
+
+    Args:
+        post_id: id поста
+    """
+    post = Post.objects.filter(pk=post_id).only(
+        'pk', 'image', 'image_variants'
+    ).first()
+    if post is None or not post.image or variants_ready(post):
+        return
+    update_image_variants(post)
+
+
+@task('blog.run_deletion', queue='deletions')
+def run_deletion(deletion_id):
+    """
+    Удаляет связанные с объектом строки порциями, затем сам объект.
+
+    За один запуск удаляется не больше DELETE_CHUNKS_PER_JOB порций,
+    после чего задача ставит себя снова: большое удаление не занимает
+    воркер надолго, а сбой повторяет только последнюю порцию.
+
+    Args:
+        deletion_id: id записи Deletion
+    """
+    record = deletion.start_deletion(deletion_id)
+    if record is None:
+        return
+    for _ in range(DELETE_CHUNKS_PER_JOB):
+        if deletion.delete_chunk(record):
+            return
+    run_deletion.delay(deletion_id=deletion_id)
@@ -0,0 +1,61 @@
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from blog.cache import cache_version, post_scope
+
+register = template.Library()
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+
+
+def is_public_card(post):
+    """
+    Проверяет, что карточка поста выглядит одинаково для всех посетителей.
+
+    Предупреждения о снятии с публикации видит только автор, поэтому
+    кешируется лишь карточка опубликованного поста в опубликованной
+    категории.
+    """
+    return (
+        post.is_published
+        and post.category is not None
+        and post.category.is_published
+    )
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    """
+    Выводит includes/post_card.html, кешируя публичный вариант карточки.
+
+    Ключ содержит id поста, его updated_at и версию, которая меняется
+    при сохранении поста, его комментариев, категорий, местоположений
+    и авторов (см. blog/signals.py), поэтому карточка общая для всех
+    лент. updated_at берется из базы: его сдвигают и воркер после
+    обработки изображения, и планировщик при выходе поста, даже если
+    их сброс кеша не дошел до этого процесса.
+
+    Пример: {% post_card post %}
+    """
+    card_template = get_template(POST_CARD_TEMPLATE).template
+
+    def render():
+        with context.push(post=post):
+            return card_template.render(context)
+
+    if not is_public_card(post):
+        return render()
+
+    cache = caches[settings.POST_CARD_CACHE_ALIAS]
+    key = (
+        f'post-card:{post.pk}:{post.updated_at.timestamp()}:'
+        f'{cache_version([post_scope(post.pk)])}'
+    )
+    card = cache.get(key)
+    if card is None:
+        card = render()
+        cache.set(key, card, settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(card)
@@ -0,0 +1,64 @@
+from django import template
+from django.utils.html import format_html
+
+from blog.images import variants_ready
+
+register = template.Library()
+
+# Ширина слота карточки: 40rem минус внутренние отступы card-body
+IMAGE_SIZES = '(max-width: 40rem) 100vw, 38rem'
+IMAGE_CLASS = 'border-3 rounded img-fluid img-thumbnail mb-2 mx-auto d-block'
+# Заглушка 16:9, пока воркер не создал производные изображения
+PLACEHOLDER = (
+    'data:image/svg+xml,%3Csvg xmlns=%22http://www.w3.org/2000/svg%22'
+    ' viewBox=%220 0 16 9%22%3E%3Crect width=%2216%22 height=%229%22'
+    ' fill=%22%23dee2e6%22/%3E%3C/svg%3E'
+)
+
+
+def _srcset(storage, candidates, key):
+    return ', '.join(
+        f'{storage.url(candidate[key])} {candidate["width"]}w'
+        for candidate in candidates
+    )
+
+
+@register.simple_tag
+def post_image(post, variant):
+    """
+    Выводит изображение поста через <picture> с WebP, JPEG, srcset и sizes.
+
+    Размеры width и height берутся из Post.image_variants, поэтому файлы
+    при рендере не открываются. Пока производные не готовы, выводится
+    заглушка: оригинал остается доступен по ссылке вокруг изображения.
+    Если изображение не удалось обработать, выводится оригинал.
+
+    Пример: {% post_image post 'card' %}
+    """
+    if not variants_ready(post):
+        return format_html(
+            '<img class="{}" src="{}" width="16" height="9" alt="{}"'
+            ' style="width: 100%" data-image-pending>',
+            IMAGE_CLASS, PLACEHOLDER, post.title,
+        )
+
+    candidates = post.image_variants.get(variant)
+    if not candidates:
+        return format_html(
+            '<img class="{}" src="{}" alt="{}">',
+            IMAGE_CLASS, post.image.url, post.title,
+        )
+
+    storage = post.image.storage
+    base = candidates[0]
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img class="{}" src="{}" srcset="{}" sizes="{}" width="{}"'
+        ' height="{}" alt="{}" loading="lazy" decoding="async">'
+        '</picture>',
+        _srcset(storage, candidates, 'webp'), IMAGE_SIZES,
+        IMAGE_CLASS, storage.url(base['jpeg']),
+        _srcset(storage, candidates, 'jpeg'), IMAGE_SIZES,
+        base['width'], base['height'], post.title,
+    )
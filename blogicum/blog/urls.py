@@ -8,6 +8,7 @@ app_name = 'blog'
 # Подмаршруты для работы с постами
 posts = [
     path('<int:post_id>/', views.post_detail, name='post_detail'),
+    path('<int:post_id>/comments/', views.post_comments, name='post_comments'),
     path('create/', views.create_post, name='create_post'),
     path('<int:post_id>/edit/', views.edit_post, name='edit_post'),
     path('<int:post_id>/delete/', views.delete_post, name='delete_post'),
@@ -26,6 +27,7 @@ profile = [
 urlpatterns = [
     path('', views.index, name='index'),  # Главная страница
     path('category/<slug:category_slug>/', views.category_posts, name='category_posts'),  # Посты по категории
+    path('search/', views.search, name='search'),  # Поиск по постам
     path('posts/', include(posts)),  # Включаем подмаршруты для постов
     path('profile/', include(profile)),  # Включаем подмаршруты для профилей
 ]
\ No newline at end of file
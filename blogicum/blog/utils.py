@@ -1,45 +1,363 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timezone as dt_timezone
+
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
-from blog.constants import DEFAULT_NUM_PAGE, POSTS_ON_PAGE
-from blog.models import Post
+from blog.constants import (
+    COMMENTS_ON_PAGE,
+    DEFAULT_NUM_PAGE,
+    MAX_OFFSET_POSTS,
+    POSTS_ON_PAGE,
+)
+from blog.models import Comment, Deletion, Post
+
+# Направления перехода по курсору
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+# Наибольшее значение первичного ключа в SQLite (64-битное целое)
+MAX_PK = 2 ** 63 - 1
+
+
+def encode_cursor(direction, obj, field='pub_date'):
+    """
+    Кодирует позицию объекта в ленте в непрозрачный токен для URL.
+
+    Args:
+        direction: направление перехода (CURSOR_NEXT или CURSOR_PREVIOUS)
+        obj: пост или комментарий, от которого отсчитывается страница
+        field: поле даты, по которому отсортирована лента
+
+    Returns:
+        str: токен курсора
+    """
+    payload = json.dumps(
+        [direction, getattr(obj, field).isoformat(), obj.pk],
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Раскодирует токен курсора.
+
+    Args:
+        token: токен из GET-параметра cursor
+
+    Returns:
+        tuple | None: (направление, дата, id) или None,
+        если токен поврежден или его значения не помещаются в поля базы
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, pub_date, pk = json.loads(payload)
+        pub_date = datetime.fromisoformat(pub_date)
+    except (binascii.Error, TypeError, ValueError):
+        return None
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+        return None
+    if not isinstance(pk, int) or not 1 <= pk <= MAX_PK:
+        return None
+    if timezone.is_naive(pub_date):
+        return None
+    try:
+        # Дата сравнивается в базе в UTC и должна в нем помещаться
+        pub_date.astimezone(dt_timezone.utc)
+    except OverflowError:
+        return None
+    return direction, pub_date, pk
+
+
+class KeysetPage:
+    """
+    Страница ленты, выбранная по курсору (дата, id) без OFFSET и COUNT.
+
+    Повторяет ту часть интерфейса Page, которую используют шаблоны:
+    итерацию, has_other_pages, has_previous и has_next. Вместо номеров
+    страниц отдает токены previous_cursor и next_cursor.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, has_previous, has_next, field='pub_date'):
+        self.object_list = object_list
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self.field = field
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return encode_cursor(
+                CURSOR_PREVIOUS, self.object_list[0], self.field
+            )
+        return None
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return encode_cursor(
+                CURSOR_NEXT, self.object_list[-1], self.field
+            )
+        return None
+
+
+def keyset_pagination(posts, cursor=None, per_page=POSTS_ON_PAGE):
+    """
+    Выбирает страницу постов по курсору, отсортированную по (-pub_date, -id).
+
+    Args:
+        posts: QuerySet с постами
+        cursor: токен курсора (None или поврежденный — первая страница)
+        per_page: количество постов на странице
+
+    Returns:
+        KeysetPage: страница постов с токенами соседних страниц
+    """
+    position = decode_cursor(cursor) if cursor else None
+    if position is None:
+        # Берем на один пост больше, чтобы узнать, есть ли следующая страница
+        object_list = list(posts.order_by('-pub_date', '-id')[:per_page + 1])
+        return KeysetPage(
+            object_list[:per_page],
+            has_previous=False,
+            has_next=len(object_list) > per_page,
+        )
+
+    direction, pub_date, pk = position
+    if direction == CURSOR_NEXT:
+        object_list = list(
+            posts.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+            ).order_by('-pub_date', '-id')[:per_page + 1]
+        )
+        return KeysetPage(
+            object_list[:per_page],
+            has_previous=True,
+            has_next=len(object_list) > per_page,
+        )
+
+    # Назад идем в обратном порядке и разворачиваем результат
+    object_list = list(
+        posts.filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+        ).order_by('pub_date', 'id')[:per_page + 1]
+    )
+    return KeysetPage(
+        object_list[:per_page][::-1],
+        has_previous=len(object_list) > per_page,
+        has_next=True,
+    )
 
 
 def posts_pagination(request, posts):
     """
     Функция для пагинации постов.
 
+    Небольшие ленты (до MAX_OFFSET_POSTS постов) листаются по номерам
+    страниц, большие и запросы с параметром cursor — по курсору. Номер
+    страницы больше первой в большой ленте (старые ссылки, закладки)
+    дает 404, а не первую страницу под чужим адресом.
+
     Args:
-        request: HTTP-запрос (для получения номера страницы)
+        request: HTTP-запрос (для получения номера страницы или курсора)
         posts: QuerySet с постами для пагинации
 
     Returns:
-        Page: Объект страницы с постами
+        Page | KeysetPage: Объект страницы с постами
+
+    Raises:
+        Http404: если большая лента запрошена по номеру страницы
+    """
+    cursor = request.GET.get('cursor')
+    if cursor is None:
+        # Ограниченная выборка ключей вместо COUNT(*) по всей ленте
+        post_ids = posts.values_list('id', flat=True)[:MAX_OFFSET_POSTS + 1]
+        total = len(post_ids)
+        if total <= MAX_OFFSET_POSTS:
+            # Получаем номер страницы из GET-параметра,
+            # если не указан - используем DEFAULT_NUM_PAGE
+            page_number = request.GET.get(
+                'page',
+                DEFAULT_NUM_PAGE
+            )
+            # Создаем объект пагинатора с заданным количеством
+            # постов на странице
+            paginator = Paginator(posts, POSTS_ON_PAGE)
+            # Количество уже известно, пагинатор не будет делать COUNT(*)
+            paginator.count = total
+            # Возвращаем запрашиваемую страницу
+            return paginator.get_page(page_number)
+        if not is_first_page(request.GET.get('page')):
+            raise Http404
+    return keyset_pagination(posts, cursor)
+
+
+def is_first_page(page_number):
     """
-    # Получаем номер страницы из GET-параметра, если не указан - используем DEFAULT_NUM_PAGE
-    page_number = request.GET.get(
-        'page',
-        DEFAULT_NUM_PAGE
+    Проверяет, что номер страницы из GET-параметра указывает на первую
+    страницу: не задан, равен 1 или не является числом (Paginator.get_page
+    в этом случае тоже отдает первую страницу).
+    """
+    if page_number is None:
+        return True
+    if page_number == 'last':
+        return False
+    try:
+        return int(page_number) <= 1
+    except ValueError:
+        return True
+
+
+def comments_pagination(comments, cursor=None, per_page=COMMENTS_ON_PAGE):
+    """
+    Выбирает порцию комментариев по курсору (created_at, id).
+
+    Комментарии подгружаются только вперед, поэтому у страницы есть
+    лишь next_cursor.
+
+    Args:
+        comments: QuerySet с комментариями одного поста
+        cursor: токен курсора (None или поврежденный — начало обсуждения)
+        per_page: количество комментариев в порции
+
+    Returns:
+        KeysetPage: порция комментариев
+    """
+    position = decode_cursor(cursor) if cursor else None
+    comments = comments.order_by('created_at', 'id')
+    if position is not None and position[0] == CURSOR_NEXT:
+        _, created_at, pk = position
+        comments = comments.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        )
+    object_list = list(comments[:per_page + 1])
+    return KeysetPage(
+        object_list[:per_page],
+        has_previous=False,
+        has_next=len(object_list) > per_page,
+        field='created_at',
+    )
+
+
+# Комментарий виден читателям и учитывается в Post.comment_count:
+# обсуждение и счетчик строятся по одному условию
+COMMENT_IS_PUBLISHED = Q(is_published=True)
+
+
+def published_comments(post):
+    """
+    Опубликованные комментарии поста вместе с авторами.
+
+    Обсуждение на странице поста показывает те же комментарии, которые
+    учитывает Post.comment_count (см. published_comment_count).
+
+    Args:
+        post: объект поста
+
+    Returns:
+        QuerySet: комментарии, удовлетворяющие COMMENT_IS_PUBLISHED
+    """
+    return post.comments.filter(COMMENT_IS_PUBLISHED).select_related(
+        'author'
+    )
+
+
+def published_comment_count():
+    """
+    Выражение с количеством опубликованных комментариев поста.
+
+    Используется для сверки денормализованного счетчика Post.comment_count.
+
+    Returns:
+        Coalesce: подзапрос COUNT по комментариям, 0 при их отсутствии
+    """
+    comments = Comment.objects.filter(
+        COMMENT_IS_PUBLISHED,
+        post=OuterRef('pk'),
+    ).order_by().values('post').annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(comments), 0)
+
+
+def post_is_visible(post):
+    """
+    Проверяет, виден ли пост посетителям, которые не являются его автором.
+
+    Повторяет в Python фильтр query_post для уже загруженного поста,
+    поэтому требует загруженной через select_related категории.
+
+    Args:
+        post: объект поста
+
+    Returns:
+        bool: True, если пост опубликован, вышел и его категория опубликована
+    """
+    return (
+        post.is_published
+        and post.pub_date < timezone.now()
+        and post.category is not None
+        and post.category.is_published
     )
-    # Создаем объект пагинатора с заданным количеством постов на странице
-    paginator = Paginator(posts, POSTS_ON_PAGE)
-    # Возвращаем запрашиваемую страницу
-    return paginator.get_page(page_number)
+
+
+def get_visible_post(user, post_id):
+    """
+    Загружает пост одним запросом и проверяет, виден ли он пользователю.
+
+    Args:
+        user: текущий пользователь (автору доступны и неопубликованные посты)
+        post_id: ID поста
+
+    Returns:
+        Post: пост с загруженными автором, категорией и местоположением
+
+    Raises:
+        Http404: если поста нет или он скрыт от пользователя
+    """
+    post = get_object_or_404(query_post(filters=False), id=post_id)
+    if post.author != user and not post_is_visible(post):
+        raise Http404
+    return post
 
 
 def query_post(
         manager=Post.objects,
         filters=True,
-        with_comments=True
 ):
     """
     Функция для построения QuerySet с постами с оптимизацией запросов.
 
+    Количество комментариев берется из поля Post.comment_count,
+    поэтому таблица комментариев в запросе не участвует.
+    Посты, удаление которых идет в фоне, скрыты и от автора.
+
     Args:
         manager: менеджер модели (по умолчанию Post.objects)
         filters: флаг для применения фильтров (опубликованные, дата публикации)
-        with_comments: флаг для добавления количества комментариев
 
     Returns:
         QuerySet: отфильтрованный и оптимизированный QuerySet постов
@@ -54,10 +372,12 @@ def query_post(
             pub_date__lt=timezone.now(),  # Дата публикации меньше текущей
             category__is_published=True
         )
-
-    if with_comments:
-        # Добавляем аннотацию с количеством комментариев к каждому посту
-        queryset = queryset.annotate(comment_count=Count('comments'))
+    else:
+        # Опубликованные посты в фоновом удалении не участвуют: перед
+        # постановкой удаления пост снимается с публикации
+        queryset = queryset.exclude(
+            pk__in=Deletion.objects.hidden_ids(Deletion.Target.POST)
+        )
 
     # Сортируем по дате публикации (сначала новые)
-    return queryset.order_by('-pub_date')
\ No newline at end of file
+    return queryset.order_by('-pub_date')
@@ -1,12 +1,33 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 
+from blog import deletion
+from blog.cache import SCOPE_FEEDS, SCOPE_POST, cache_page_for_anonymous
+from blog.conditional import (
+    category_last_modified,
+    conditional_page,
+    index_last_modified,
+    post_last_modified,
+    profile_last_modified,
+)
 from blog.forms import CommentForm, PostForm, ProfileForm
-from blog.models import Category, Comment, Post
-from blog.utils import posts_pagination, query_post
-
-
+from blog.models import Category, Comment, Deletion, Post
+from blog.search import search_posts
+from blog.utils import (
+    comments_pagination,
+    get_visible_post,
+    posts_pagination,
+    published_comments,
+    query_post,
+)
+from blogicum.db.router import replica_reads
+
+
+@replica_reads
+@conditional_page(index_last_modified, SCOPE_FEEDS)
+@cache_page_for_anonymous(SCOPE_FEEDS)
 def index(request):
     """
     Отображает главную страницу с пагинированным списком опубликованных постов.
@@ -23,6 +44,9 @@ def index(request):
     return render(request, 'blog/index.html', context)
 
 
+@replica_reads
+@conditional_page(category_last_modified, SCOPE_FEEDS)
+@cache_page_for_anonymous(SCOPE_FEEDS)
 def category_posts(request, category_slug):
     """
     Отображает список постов в определенной категории.
@@ -49,6 +73,34 @@ def category_posts(request, category_slug):
     return render(request, 'blog/category.html', context)
 
 
+@replica_reads
+def search(request):
+    """
+    Ищет опубликованные посты по заголовку и тексту.
+
+    Args:
+        request: HTTP-запрос (GET-параметры q — строка поиска,
+            cursor — начало страницы результатов)
+
+    Returns:
+        HttpResponse: Отрендеренный шаблон search.html с результатами
+    """
+    query = request.GET.get('q', '').strip()
+    page_obj = None
+    if query:
+        # Те же правила видимости, что и в лентах
+        page_obj = search_posts(
+            query_post(),
+            query,
+            request.GET.get('cursor'),
+        )
+    context = {'query': query, 'page_obj': page_obj}
+    return render(request, 'blog/search.html', context)
+
+
+@replica_reads
+@conditional_page(post_last_modified, SCOPE_POST)
+@cache_page_for_anonymous(SCOPE_POST)
 def post_detail(request, post_id):
     """
     Отображает детали конкретного поста и форму для комментариев.
@@ -60,14 +112,12 @@ def post_detail(request, post_id):
     Returns:
         HttpResponse: Отрендеренный шаблон detail.html с постом и комментариями
     """
-    # Если пользователь - автор поста, показывает ему все посты (включая неопубликованные)
-    post = get_object_or_404(Post, id=post_id)
-    if post.author != request.user:
-        # Для других пользователей показываем только опубликованные посты
-        post = get_object_or_404(query_post(), id=post_id)
+    # Загружаем пост вместе с автором, категорией и местоположением одним запросом
+    post = get_visible_post(request.user, post_id)
 
-    # Получаем все комментарии к посту, отсортированные по дате создания
-    comments = post.comments.order_by('created_at')
+    # Получаем первую порцию комментариев вместе с авторами одним запросом,
+    # остальные подгружаются через post_comments
+    comments = comments_pagination(published_comments(post))
     # Создаем пустую форму для комментариев
     form = CommentForm()
     context = {
@@ -78,6 +128,26 @@ def post_detail(request, post_id):
     return render(request, 'blog/detail.html', context)
 
 
+@replica_reads
+def post_comments(request, post_id):
+    """
+    Отдает HTML-фрагмент со следующей порцией комментариев к посту.
+
+    Args:
+        request: HTTP-запрос (GET-параметр cursor задает начало порции)
+        post_id: ID поста
+
+    Returns:
+        HttpResponse: Отрендеренный шаблон comment_list.html без base.html
+    """
+    post = get_visible_post(request.user, post_id)
+    comments = comments_pagination(
+        published_comments(post), request.GET.get('cursor')
+    )
+    context = {'post': post, 'comments': comments}
+    return render(request, 'includes/comment_list.html', context)
+
+
 @login_required
 def create_post(request):
     """
@@ -116,8 +186,13 @@ def edit_post(request, post_id):
     Returns:
         HttpResponse: Отрендеренный шаблон create.html или редирект на пост
     """
-    # Находим пост по ID
-    post = get_object_or_404(Post, id=post_id)
+    # Находим пост по ID; пост, который удаляется в фоне, не редактируется
+    post = get_object_or_404(
+        Post.objects.exclude(
+            pk__in=Deletion.objects.hidden_ids(Deletion.Target.POST)
+        ),
+        id=post_id,
+    )
     # Проверяем, является ли текущий пользователь автором поста
     if request.user != post.author:
         return redirect('blog:post_detail', post_id)
@@ -151,7 +226,8 @@ def delete_post(request, post_id):
 
     # Проверяем, был ли отправлен POST-запрос для подтверждения удаления
     if request.method == 'POST':
-        post.delete()
+        # Пост с большим обсуждением скрывается сразу и удаляется в фоне
+        deletion.delete_post(post)
         return redirect('blog:index')
 
     # Если GET-запрос, отображаем страницу подтверждения удаления
@@ -160,6 +236,8 @@ def delete_post(request, post_id):
     return render(request, 'blog/create.html', context)
 
 
+@replica_reads
+@conditional_page(profile_last_modified, SCOPE_FEEDS)
 def profile(request, username):
     """
     Отображает профиль пользователя и его посты.
@@ -172,7 +250,12 @@ def profile(request, username):
         HttpResponse: Отрендеренный шаблон profile.html с профилем и постами
     """
     # Находим пользователя по имени
-    profile = get_object_or_404(User, username=username)
+    profile = get_object_or_404(
+        User.objects.exclude(
+            pk__in=Deletion.objects.hidden_ids(Deletion.Target.USER)
+        ),
+        username=username,
+    )
     # Получаем посты пользователя, учитывая права доступа
     posts = query_post(manager=profile.posts, filters=profile != request.user)
     # Пагинируем посты
@@ -223,8 +306,9 @@ def add_comment(request, post_id):
         # Устанавливаем пост и автора
         comment.post = post
         comment.author = request.user
-        # Сохраняем комментарий в базу данных
-        comment.save()
+        # Сохраняем комментарий и обновляем счетчик поста в одной транзакции
+        with transaction.atomic():
+            comment.save()
     return redirect('blog:post_detail', post_id)
 
 
@@ -277,7 +361,9 @@ def delete_comment(request, post_id, comment_id):
 
     # Проверяем, был ли отправлен POST-запрос для подтверждения удаления
     if request.method == "POST":
-        comment.delete()
+        # Удаляем комментарий и обновляем счетчик поста в одной транзакции
+        with transaction.atomic():
+            comment.delete()
         return redirect('blog:post_detail', post_id)
 
     # Если GET-запрос, отображаем страницу подтверждения удаления
@@ -0,0 +1,87 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+# Настройки соединения SQLite для работы под нагрузкой. Значения по
+# умолчанию можно переопределить в DATABASES[...]['OPTIONS']['pragmas'].
+DEFAULT_PRAGMAS = {
+    # Читатели работают со снимком базы и не ждут пишущую транзакцию
+    'journal_mode': 'WAL',
+    # В режиме WAL база не повреждается и без fsync на каждый коммит
+    'synchronous': 'NORMAL',
+    # Сколько миллисекунд ждать освобождения блокировки
+    'busy_timeout': 5000,
+    # Чтение файла базы через mmap (байты) и кеш страниц (минус — КиБ)
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+# Режим начала транзакции: IMMEDIATE сразу берет блокировку записи
+TRANSACTION_MODE = 'IMMEDIATE'
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+# Повторы начала транзакции, если блокировку не дали за busy_timeout
+BUSY_RETRIES = 3
+BUSY_BACKOFF = 0.05
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Бэкенд SQLite с прагмами для конкурентной работы.
+
+    Отличия от django.db.backends.sqlite3:
+    - при открытии соединения выполняются прагмы (WAL, synchronous,
+      busy_timeout, mmap_size, cache_size);
+    - транзакции начинаются с BEGIN IMMEDIATE: в транзакции вида
+      «прочитать, затем записать» SQLite не может дождаться блокировки
+      и сразу отвечает «database is locked», если начало транзакции
+      отложено до первой записи;
+    - если блокировку не дали за busy_timeout, начало транзакции
+      повторяется с экспоненциальной паузой.
+
+    Дополнительные ключи OPTIONS:
+    - pragmas: словарь прагм поверх DEFAULT_PRAGMAS
+    - transaction_mode: DEFERRED, IMMEDIATE (по умолчанию) или EXCLUSIVE
+    - busy_retries: количество повторов начала транзакции
+    - busy_backoff: первая пауза между повторами в секундах
+    """
+
+    pragmas = DEFAULT_PRAGMAS
+    transaction_mode = TRANSACTION_MODE
+    busy_retries = BUSY_RETRIES
+    busy_backoff = BUSY_BACKOFF
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # Собственные ключи OPTIONS не передаются в sqlite3.connect
+        self.pragmas = {**DEFAULT_PRAGMAS, **kwargs.pop('pragmas', {})}
+        self.transaction_mode = kwargs.pop(
+            'transaction_mode', TRANSACTION_MODE
+        ).upper()
+        if self.transaction_mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'Неизвестный режим транзакций: {self.transaction_mode}'
+            )
+        self.busy_retries = kwargs.pop('busy_retries', BUSY_RETRIES)
+        self.busy_backoff = kwargs.pop('busy_backoff', BUSY_BACKOFF)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        for attempt in range(self.busy_retries + 1):
+            try:
+                self.cursor().execute(f'BEGIN {self.transaction_mode}')
+                return
+            except OperationalError as error:
+                if (
+                    'locked' not in str(error)
+                    or attempt == self.busy_retries
+                ):
+                    raise
+            time.sleep(self.busy_backoff * 2 ** attempt)
@@ -0,0 +1,57 @@
+import time
+
+from django.conf import settings
+
+from blogicum.db.router import RequestState, _request_state, replica_alias
+
+# Cookie, закрепляющая чтение за основной базой после записи
+PIN_COOKIE = 'primary_pin'
+
+
+class ReplicaMiddleware:
+    """
+    Направляет чтение представлений, отмеченных replica_reads, в реплику.
+
+    После запроса, который записал данные, пользователю на
+    REPLICA_PIN_SECONDS ставится cookie: пока она действует, его чтение
+    идет в основную базу, и он сразу видит свой новый пост или
+    комментарий, даже если реплика отстает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RequestState()
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        if state.wrote and replica_alias():
+            pin_seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                PIN_COOKIE,
+                str(int(time.time() + pin_seconds)),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in ('GET', 'HEAD')
+            and getattr(view_func, 'replica_reads', False)
+            and not self.pinned(request)
+        ):
+            _request_state.get().read_alias = replica_alias()
+
+    @staticmethod
+    def pinned(request):
+        """Проверяет, закреплено ли чтение за основной базой."""
+        try:
+            expires = int(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            return False
+        return expires > time.time()
@@ -0,0 +1,88 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Состояние текущего запроса: алиас для чтения и признак записи.
+# Заполняется ReplicaMiddleware, вне запроса (команды, воркер) пусто.
+_request_state = ContextVar('replica_request_state', default=None)
+
+
+class RequestState:
+    """
+    Маршрутизация запросов к базе в рамках одного HTTP-запроса.
+
+    Атрибуты:
+    - read_alias: алиас для чтения (None — основная база)
+    - wrote: запрос что-то записал в основную базу
+    """
+
+    def __init__(self):
+        self.read_alias = None
+        self.wrote = False
+
+
+def replica_alias():
+    """
+    Возвращает алиас реплики из DATABASE_REPLICA_ALIAS.
+
+    Returns:
+        str | None: алиас или None, если реплика не настроена
+    """
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    if alias and alias in connections.settings:
+        return alias
+    return None
+
+
+def replica_reads(view):
+    """
+    Отмечает представление, которое только читает данные: для GET и HEAD
+    его запросы к базе идут в реплику (см. ReplicaMiddleware).
+
+    Args:
+        view: функция представления
+
+    Returns:
+        function: то же представление с отметкой
+    """
+    view.replica_reads = True
+    return view
+
+
+class ReplicaRouter:
+    """
+    Роутер, отправляющий чтение отмеченных представлений в реплику,
+    а запись и все остальное — в основную базу.
+
+    Сессии всегда читаются из основной базы: пользователь только что
+    вошел, а реплика еще не получила его сессию. Миграции выполняются
+    только в основной базе: реплика получает схему вместе с данными.
+
+    Страница для неавторизованных, собранная по отставшей реплике,
+    остается в кеше до PAGE_CACHE_TIMEOUT: отставание реплики должно
+    быть заметно меньше этого таймаута.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'sessions':
+            return DEFAULT_DB_ALIAS
+        state = _request_state.get()
+        if state is not None and state.read_alias:
+            return state.read_alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика — копия основной базы, объекты из них совместимы
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
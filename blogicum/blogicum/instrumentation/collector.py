@@ -0,0 +1,223 @@
+import hashlib
+import re
+import threading
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from time import perf_counter
+
+# Сколько раз запрос с одним отпечатком должен выполниться за HTTP-запрос,
+# чтобы считаться повтором (признак N+1)
+DUPLICATE_THRESHOLD = 3
+# Сколько отпечатков повторов хранится на представление
+MAX_FINGERPRINTS = 20
+
+# Запись текущего HTTP-запроса (см. QueryInstrumentationMiddleware)
+_current = ContextVar('instrumentation_record', default=None)
+
+# Списки параметров IN (%s, %s, ...) разной длины дают один отпечаток
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """
+    Приводит SQL к виду, общему для запросов, различающихся только
+    параметрами.
+
+    Args:
+        sql: текст запроса с местами для параметров
+
+    Returns:
+        str: нормализованный текст
+    """
+    return _SPACES.sub(' ', _IN_LIST.sub('(...)', sql)).strip()
+
+
+def fingerprint(sql):
+    """Короткий отпечаток нормализованного запроса."""
+    return hashlib.md5(
+        normalize_sql(sql).encode(), usedforsecurity=False
+    ).hexdigest()[:12]
+
+
+def current_record():
+    """Возвращает запись текущего HTTP-запроса или None."""
+    return _current.get()
+
+
+class RequestRecord:
+    """
+    Замеры одного HTTP-запроса.
+
+    Объект подключается к соединениям через connection.execute_wrapper
+    и считает запросы, их время и повторы. Время рендера шаблонов
+    добавляет бэкенд шаблонов (см. templates.py); SQL, выполненный
+    ленивыми QuerySet во время рендера, входит в оба замера.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += perf_counter() - started
+            self.queries += 1
+            self.statements[normalize_sql(sql)] += 1
+
+    def duplicates(self):
+        """
+        Возвращает повторяющиеся запросы.
+
+        Returns:
+            dict: нормализованный SQL -> количество выполнений
+        """
+        return {
+            sql: count
+            for sql, count in self.statements.most_common()
+            if count >= DUPLICATE_THRESHOLD
+        }
+
+
+class ViewStats:
+    """Накопленные замеры одного представления."""
+
+    def __init__(self):
+        self.requests = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.duplicates = Counter()
+        self.over_budget = Counter()
+
+
+def _label(value):
+    return (
+        str(value).replace('\\', '\\\\').replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+class Metrics:
+    """
+    Агрегаты замеров по представлениям в памяти процесса.
+
+    У каждого процесса сервера свои агрегаты; Prometheus суммирует
+    их при опросе всех процессов.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает накопленные замеры."""
+        self._views = defaultdict(ViewStats)
+
+    def observe(self, view, record, seconds, over_budget=()):
+        """
+        Добавляет замеры запроса к агрегатам представления.
+
+        Args:
+            view: имя представления ('blog:index')
+            record: RequestRecord запроса
+            seconds: длительность обработки запроса
+            over_budget: названия превышенных бюджетов
+        """
+        duplicates = record.duplicates()
+        with self._lock:
+            stats = self._views[view]
+            stats.requests += 1
+            stats.seconds += seconds
+            stats.queries += record.queries
+            stats.sql_seconds += record.sql_seconds
+            stats.template_seconds += record.template_seconds
+            for sql, count in duplicates.items():
+                key = fingerprint(sql)
+                if (
+                    key in stats.duplicates
+                    or len(stats.duplicates) < MAX_FINGERPRINTS
+                ):
+                    stats.duplicates[key] += count
+            stats.over_budget.update(over_budget)
+
+    def snapshot(self):
+        """Копия агрегатов: имя представления -> ViewStats."""
+        with self._lock:
+            return {
+                view: self._copy(stats)
+                for view, stats in sorted(self._views.items())
+            }
+
+    @staticmethod
+    def _copy(stats):
+        copy = ViewStats()
+        copy.__dict__.update({
+            name: value.copy() if isinstance(value, Counter) else value
+            for name, value in stats.__dict__.items()
+        })
+        return copy
+
+
+# Агрегаты процесса
+metrics = Metrics()
+
+
+def render_prometheus(snapshot, extra=()):
+    """
+    Формирует текстовый формат Prometheus.
+
+    Args:
+        snapshot: результат Metrics.snapshot()
+        extra: дополнительные метрики — кортежи
+            (имя, тип, описание, [(метки, значение), ...])
+
+    Returns:
+        str: текст для ответа /metrics/
+    """
+    families = [
+        ('blogicum_requests_total', 'counter', 'Обработано запросов.',
+         [({'view': v}, s.requests) for v, s in snapshot.items()]),
+        ('blogicum_request_seconds_total', 'counter',
+         'Суммарное время обработки запросов.',
+         [({'view': v}, s.seconds) for v, s in snapshot.items()]),
+        ('blogicum_db_queries_total', 'counter', 'Выполнено SQL-запросов.',
+         [({'view': v}, s.queries) for v, s in snapshot.items()]),
+        ('blogicum_db_seconds_total', 'counter',
+         'Суммарное время SQL-запросов.',
+         [({'view': v}, s.sql_seconds) for v, s in snapshot.items()]),
+        ('blogicum_template_seconds_total', 'counter',
+         'Суммарное время рендера шаблонов.',
+         [({'view': v}, s.template_seconds) for v, s in snapshot.items()]),
+        ('blogicum_duplicate_queries_total', 'counter',
+         'Выполнения повторяющихся запросов (N+1) по отпечаткам.',
+         [({'view': v, 'fingerprint': key}, count)
+          for v, s in snapshot.items()
+          for key, count in sorted(s.duplicates.items())]),
+        ('blogicum_over_budget_total', 'counter',
+         'Запросы, превысившие бюджет.',
+         [({'view': v, 'budget': budget}, count)
+          for v, s in snapshot.items()
+          for budget, count in sorted(s.over_budget.items())]),
+        *extra,
+    ]
+    lines = []
+    for name, kind, description, samples in families:
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            rendered = ','.join(
+                f'{key}="{_label(label)}"' for key, label in labels.items()
+            )
+            lines.append(
+                f'{name}{{{rendered}}} {value}' if rendered
+                else f'{name} {value}'
+            )
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,90 @@
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from blogicum.instrumentation.collector import (
+    RequestRecord,
+    _current,
+    metrics,
+)
+
+logger = logging.getLogger('blogicum.instrumentation')
+
+
+def view_budget(view):
+    """
+    Возвращает бюджет представления.
+
+    Args:
+        view: имя представления
+
+    Returns:
+        tuple: (максимум SQL-запросов, максимум секунд)
+    """
+    queries, seconds = getattr(settings, 'VIEW_BUDGETS', {}).get(
+        view, (settings.QUERY_BUDGET, settings.LATENCY_BUDGET)
+    )
+    return queries, seconds
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Замеряет каждый запрос: количество и время SQL, повторяющиеся
+    запросы, время рендера шаблонов и общую длительность.
+
+    Замеры копятся по имени представления (blog:index, blog:post_detail)
+    и отдаются в формате Prometheus по адресу /metrics/. Запросы сверх
+    бюджета (QUERY_BUDGET, LATENCY_BUDGET, VIEW_BUDGETS) пишутся в лог
+    blogicum.instrumentation вместе с повторяющимися SQL.
+
+    В отличие от debug_toolbar, SQL и параметры не сохраняются: каждый
+    запрос к базе стоит двух вызовов perf_counter, нормализации текста
+    двумя регулярными выражениями (normalize_sql) и подсчета в словаре,
+    поэтому middleware можно держать включенным всегда.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        record = RequestRecord()
+        token = _current.set(record)
+        started = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        seconds = perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        max_queries, max_seconds = view_budget(view)
+        over_budget = []
+        if record.queries > max_queries:
+            over_budget.append('queries')
+        if seconds > max_seconds:
+            over_budget.append('latency')
+        metrics.observe(view, record, seconds, over_budget)
+        if over_budget:
+            self.log_over_budget(request, view, record, seconds)
+        return response
+
+    @staticmethod
+    def log_over_budget(request, view, record, seconds):
+        duplicates = ''.join(
+            f'\n  {count} x {sql}'
+            for sql, count in record.duplicates().items()
+        )
+        logger.warning(
+            'Превышен бюджет %s %s (%s): %s запросов, SQL %.3f с,'
+            ' шаблоны %.3f с, всего %.3f с.%s',
+            request.method, request.path, view, record.queries,
+            record.sql_seconds, record.template_seconds, seconds,
+            f' Повторы:{duplicates}' if duplicates else '',
+        )
@@ -0,0 +1,45 @@
+from time import perf_counter
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from blogicum.instrumentation.collector import current_record
+
+
+class TimedTemplate(Template):
+    """
+    Шаблон, добавляющий время рендера к записи текущего запроса.
+
+    Учитывается только внешний рендер: шаблоны, отрендеренные внутри
+    другого (например, карточка поста из тега), второй раз не считаются.
+    """
+
+    def render(self, context=None, request=None):
+        record = current_record()
+        if record is None:
+            return super().render(context, request)
+        record.template_depth += 1
+        started = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record.template_depth -= 1
+            if not record.template_depth:
+                record.template_seconds += perf_counter() - started
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    Бэкенд шаблонов Django, замеряющий время рендера (см. TimedTemplate).
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(
+                self.engine.get_template(template_name), self
+            )
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,64 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from blogicum.instrumentation.collector import metrics, render_prometheus
+from jobs.mail import delivery_metrics
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def email_families():
+    """Метрики очереди писем (см. jobs.mail.delivery_metrics)."""
+    delivery = delivery_metrics()
+    oldest = delivery.pop('oldest_pending_seconds')
+    latency = delivery.pop('avg_delivery_seconds')
+    return [
+        ('blogicum_email_messages', 'gauge', 'Письма в очереди по состояниям.',
+         [({'status': status}, total)
+          for status, total in sorted(delivery.items())]),
+        ('blogicum_email_oldest_pending_seconds', 'gauge',
+         'Возраст самого старого неотправленного письма.', [({}, oldest)]),
+        ('blogicum_email_avg_delivery_seconds', 'gauge',
+         'Средняя задержка отправки за последний час.', [({}, latency)]),
+    ]
+
+
+def metrics_allowed(request):
+    """
+    Проверяет доступ к метрикам.
+
+    Если задан METRICS_TOKEN, нужен заголовок
+    Authorization: Bearer <токен>. Иначе доступ есть только с адресов
+    из INTERNAL_IPS. За обратным прокси REMOTE_ADDR — адрес самого
+    прокси, поэтому там нужно задать METRICS_TOKEN или закрыть /metrics/
+    на прокси.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token:
+        return hmac.compare_digest(
+            request.headers.get('Authorization', '').encode(),
+            f'Bearer {token}'.encode(),
+        )
+    return request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS
+
+
+def metrics_view(request):
+    """
+    Отдает замеры в текстовом формате Prometheus.
+
+    Доступно только после проверки metrics_allowed, для остальных — 404.
+
+    Args:
+        request: HTTP-запрос
+
+    Returns:
+        HttpResponse: метрики процесса и очереди писем
+    """
+    if not metrics_allowed(request):
+        raise Http404
+    return HttpResponse(
+        render_prometheus(metrics.snapshot(), email_families()),
+        content_type=PROMETHEUS_CONTENT_TYPE,
+    )
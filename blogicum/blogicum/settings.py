@@ -37,15 +37,19 @@ INSTALLED_APPS = [
     # Собственные приложения
     'pages.apps.PagesConfig',  # Приложение pages
     'blog.apps.BlogConfig',  # Приложение blog
+    'jobs.apps.JobsConfig',  # Фоновые задачи
 ]
 
 # Промежуточные слои (middleware) для обработки запросов/ответов
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',  # Безопасность
+    # Замеры SQL и шаблонов по представлениям
+    'blogicum.instrumentation.middleware.QueryInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',  # Сессии
     'django.middleware.common.CommonMiddleware',  # Общие функции
     'django.middleware.csrf.CsrfViewMiddleware',  # Защита от CSRF
     'django.contrib.auth.middleware.AuthenticationMiddleware',  # Аутентификация
+    'blogicum.db.middleware.ReplicaMiddleware',  # Чтение из реплики
     'django.contrib.messages.middleware.MessageMiddleware',  # Сообщения
     'django.middleware.clickjacking.XFrameOptionsMiddleware',  # Защита от clickjacking
     'debug_toolbar.middleware.DebugToolbarMiddleware',  # Debug toolbar
@@ -60,7 +64,10 @@ TEMPLATES_DIR = BASE_DIR / 'templates'
 # Конфигурация шаблонизатора Django
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates с замером времени рендера
+        'BACKEND': (
+            'blogicum.instrumentation.templates.InstrumentedDjangoTemplates'
+        ),
         'DIRS': [TEMPLATES_DIR],  # Директория для поиска шаблонов
         'APP_DIRS': True,  # Искать шаблоны в директориях приложений
         'OPTIONS': {
@@ -77,14 +84,77 @@ TEMPLATES = [
 # WSGI-приложение для production-серверов
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
-# Конфигурация базы данных
+# Конфигурация базы данных: SQLite с WAL, прагмами и BEGIN IMMEDIATE
+# (см. blogicum/db/base.py)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',  # Используем SQLite
+        'ENGINE': 'blogicum.db',  # Используем SQLite
         'NAME': BASE_DIR / 'db.sqlite3',  # Путь к файлу базы данных
+        # Соединение переиспользуется между запросами потока
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            # Переопределение прагм из blogicum.db.base.DEFAULT_PRAGMAS
+            'pragmas': {
+                'busy_timeout': 5000,
+            },
+        },
     }
 }
 
+# Реплика для чтения: представления, отмеченные replica_reads, читают
+# из нее (см. blogicum/db/router.py). Пока алиаса нет в DATABASES, все
+# запросы идут в default. Пример:
+# DATABASES['replica'] = {
+#     **DATABASES['default'],
+#     'NAME': BASE_DIR / 'replica.sqlite3',
+#     'TEST': {'MIRROR': 'default'},
+# }
+DATABASE_REPLICA_ALIAS = 'replica'
+DATABASE_ROUTERS = ['blogicum.db.router.ReplicaRouter']
+# Сколько секунд после записи пользователь читает из основной базы
+REPLICA_PIN_SECONDS = 5
+
+# Кеши: default - общий, pages - страницы для неавторизованных посетителей,
+# template_fragments - карточки постов.
+# Для файлового кеша страниц укажите
+# 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+# 'LOCATION': BASE_DIR / 'cache' / 'pages'
+# Кеши страниц и карточек общие для всех процессов: счетчики поколений
+# (blog/cache.py) сбрасывают и веб-процессы, и воркер run_jobs (после
+# обработки изображений), и планировщик publish_scheduled. Кеш в памяти
+# процесса таких сбросов не увидит. В production лучше Redis или Memcached.
+CACHE_DIR = BASE_DIR / 'cache'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'pages',
+    },
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'fragments',
+    },
+}
+
+# Алиас кеша страниц и время жизни страницы в секундах
+PAGE_CACHE_ALIAS = 'pages'
+PAGE_CACHE_TIMEOUT = 60
+
+# Алиас кеша карточек постов и время жизни карточки в секундах
+POST_CARD_CACHE_ALIAS = 'template_fragments'
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Максимум одновременно выполняемых задач в очереди (manage.py run_jobs);
+# обработка изображений нагружает процессор и память
+JOBS_QUEUE_CONCURRENCY = {
+    'images': 2,
+}
+
 # Валидаторы паролей - обеспечивают безопасность
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -129,10 +199,38 @@ STATICFILES_DIRS = [
 LOGIN_REDIRECT_URL = 'blog:index'  # Редирект после логина
 LOGIN_URL = 'login'  # URL для страницы логина
 
-# Настройка email-бэкенда для сохранения писем в файл
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма ставятся в очередь и отправляются воркером run_jobs пачками
+# через бэкенд QUEUED_EMAIL_BACKEND (здесь - сохранение писем в файл)
+EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+QUEUED_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# Бюджет запроса: сверх него запрос пишется в лог blogicum.instrumentation
+# (см. blogicum/instrumentation/middleware.py); VIEW_BUDGETS задает бюджет
+# отдельных представлений: {'blog:index': (запросов, секунд)}
+QUERY_BUDGET = 15
+LATENCY_BUDGET = 0.5
+VIEW_BUDGETS = {}
+# Токен доступа к /metrics/ (заголовок Authorization: Bearer <токен>).
+# Без токена метрики доступны только с INTERNAL_IPS; за обратным прокси
+# REMOTE_ADDR — адрес прокси, поэтому там задайте токен или закройте
+# /metrics/ на прокси
+METRICS_TOKEN = None
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'blogicum.instrumentation': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
 # Кастомный обработчик CSRF-ошибок
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
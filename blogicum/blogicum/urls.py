@@ -5,6 +5,7 @@ from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
 
 from blogicum import settings
+from blogicum.instrumentation.views import metrics_view
 
 # Обработчики ошибок
 handler404 = 'pages.views.page_not_found'  # Страница 404 Not Found
@@ -29,6 +30,11 @@ urlpatterns = [
     # Административная панель
     path('admin/', admin.site.urls),
 
+    # Метрики в формате Prometheus: по заголовку Authorization: Bearer
+    # с METRICS_TOKEN, а если токен не задан — только с INTERNAL_IPS
+    # (за обратным прокси нужен токен, см. metrics_allowed)
+    path('metrics/', metrics_view, name='metrics'),
+
     # Основные маршруты блога
     path('', include('blog.urls', namespace='blog')),
 ]
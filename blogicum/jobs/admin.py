@@ -0,0 +1,60 @@
+from django.contrib import admin
+
+from jobs.models import Job, QueuedEmail
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """
+    Админская панель для модели Job.
+
+    Поля, отображаемые в списке:
+    - name: задача
+    - queue: очередь
+    - status: состояние
+    - attempts: сделанные попытки
+    - run_after: время следующего запуска
+    - updated_at: дата изменения
+
+    Фильтры: status, queue
+    """
+    list_display = (
+        'name',
+        'queue',
+        'status',
+        'attempts',
+        'run_after',
+        'updated_at',
+    )
+    list_filter = ('status', 'queue')
+    search_fields = ('name',)
+    readonly_fields = ('locked_by', 'locked_at', 'last_error', 'created_at')
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    """
+    Админская панель для модели QueuedEmail.
+
+    Поля, отображаемые в списке:
+    - subject: тема
+    - recipients: получатели
+    - status: состояние
+    - attempts: сделанные попытки
+    - created_at: дата постановки в очередь
+    - sent_at: дата отправки
+
+    Фильтры: status
+    """
+    list_display = (
+        'subject',
+        'recipients',
+        'status',
+        'attempts',
+        'created_at',
+        'sent_at',
+    )
+    list_filter = ('status',)
+    search_fields = ('recipients', 'subject')
+    exclude = ('message',)
+    readonly_fields = ('batch', 'last_error', 'created_at', 'sent_at')
@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    """
+    Конфигурация приложения jobs (фоновые задачи в очереди на базе БД).
+
+    default_auto_field: указывает тип автоинкрементного поля по умолчанию
+    name: имя приложения
+    verbose_name: отображаемое имя приложения в админке
+    """
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+    verbose_name = 'Фоновые задачи'
+
+    def ready(self):
+        # Регистрируем задачи из модулей tasks.py установленных приложений
+        autodiscover_modules('tasks')
@@ -0,0 +1,17 @@
+DEFAULT_QUEUE = 'default'
+MAX_ATTEMPTS = 3
+# Задержка перед повтором: RETRY_DELAY * 2 ** (попытка - 1) секунд
+RETRY_DELAY = 10
+# Через сколько секунд задача зависшего воркера возвращается в очередь
+LOCK_TIMEOUT = 10 * 60
+# Как часто (в секундах) работающий воркер ищет зависшие задачи
+RELEASE_INTERVAL = 60
+# Сколько секунд воркер ждет, если очередь пуста
+POLL_INTERVAL = 1
+MAX_NAME_LENGTH = 128
+MAX_LENGTH = 256
+MAX_ERROR_LENGTH = 2000
+# Очередь и размер пачки писем, отправляемых через одно соединение
+MAIL_QUEUE = 'mail'
+EMAIL_BATCH_SIZE = 100
+MAX_EMAIL_ATTEMPTS = 3
@@ -0,0 +1,204 @@
+import logging
+import pickle
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import Avg, Count, F, Min
+from django.utils import timezone
+
+from jobs.constants import (
+    EMAIL_BATCH_SIZE,
+    LOCK_TIMEOUT,
+    MAX_EMAIL_ATTEMPTS,
+    MAX_ERROR_LENGTH,
+    MAX_LENGTH,
+)
+from jobs.models import Job, QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+# Бэкенд, через который воркер отправляет письма из очереди
+DEFAULT_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+
+def delivery_backend():
+    """Возвращает путь к бэкенду фактической отправки писем."""
+    return getattr(
+        settings, 'QUEUED_EMAIL_BACKEND', DEFAULT_DELIVERY_BACKEND
+    )
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Почтовый бэкенд, который не отправляет письма, а сохраняет их
+    в очередь QueuedEmail и ставит задачу отправки.
+
+    Запрос (например, восстановление пароля) не ждет SMTP-сервера:
+    письма отправляет воркер run_jobs пачками через одно соединение
+    бэкенда из настройки QUEUED_EMAIL_BACKEND.
+
+    Подключение: EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+    """
+
+    def send_messages(self, email_messages):
+        queued = []
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            # Соединение не сериализуется, воркер откроет свое
+            message.connection = None
+            queued.append(QueuedEmail(
+                message=pickle.dumps(message),
+                subject=str(message.subject)[:MAX_LENGTH],
+                recipients=', '.join(message.recipients()),
+            ))
+        if not queued:
+            return 0
+        QueuedEmail.objects.bulk_create(queued)
+        schedule_flush()
+        return len(queued)
+
+
+def schedule_flush(run_after=None):
+    """
+    Ставит задачу отправки писем, если она еще не ждет в очереди.
+
+    Письма, добавленные до запуска задачи, уйдут той же пачкой.
+
+    Args:
+        run_after: не запускать раньше этого времени (по умолчанию сразу)
+    """
+    from jobs.tasks import send_queued_emails
+
+    pending = Job.objects.filter(
+        name=send_queued_emails.name,
+        status=Job.Status.PENDING,
+    )
+    if not pending.exists():
+        send_queued_emails.delay(run_after=run_after)
+
+
+def _claim_batch(batch_size):
+    """Захватывает пачку писем и возвращает ее метку."""
+    expired = timezone.now() - timedelta(seconds=LOCK_TIMEOUT)
+    # Письма воркера, упавшего во время отправки, возвращаем в очередь
+    QueuedEmail.objects.filter(
+        status=QueuedEmail.Status.SENDING,
+        updated_at__lt=expired,
+    ).update(status=QueuedEmail.Status.PENDING, batch='')
+
+    batch = uuid.uuid4().hex
+    ids = QueuedEmail.objects.filter(
+        status=QueuedEmail.Status.PENDING,
+    ).values_list('id', flat=True)[:batch_size]
+    QueuedEmail.objects.filter(
+        pk__in=list(ids),
+        status=QueuedEmail.Status.PENDING,
+    ).update(
+        status=QueuedEmail.Status.SENDING,
+        batch=batch,
+        attempts=F('attempts') + 1,
+        updated_at=timezone.now(),
+    )
+    return batch
+
+
+def flush_email_queue(batch_size=EMAIL_BATCH_SIZE):
+    """
+    Отправляет пачку писем из очереди через одно соединение.
+
+    Ошибка отдельного письма не прерывает пачку: письмо возвращается
+    в очередь до MAX_EMAIL_ATTEMPTS попыток. Если не удалось открыть
+    соединение, вся пачка возвращается в очередь, а исключение
+    передается воркеру для повтора задачи.
+
+    Args:
+        batch_size: максимальное количество писем в пачке
+
+    Returns:
+        int: количество отправленных писем
+    """
+    batch = _claim_batch(batch_size)
+    emails = list(QueuedEmail.objects.filter(batch=batch))
+    if not emails:
+        return 0
+
+    connection = get_connection(delivery_backend(), fail_silently=False)
+    try:
+        connection.open()
+    except Exception:
+        QueuedEmail.objects.filter(batch=batch).update(
+            status=QueuedEmail.Status.PENDING,
+            batch='',
+        )
+        raise
+
+    sent, failed = [], []
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([pickle.loads(email.message)])
+            except Exception as error:
+                logger.exception('Не удалось отправить письмо %s', email.pk)
+                failed.append((email, repr(error)[:MAX_ERROR_LENGTH]))
+            else:
+                sent.append(email.pk)
+    finally:
+        connection.close()
+
+    now = timezone.now()
+    QueuedEmail.objects.filter(pk__in=sent).update(
+        status=QueuedEmail.Status.SENT,
+        sent_at=now,
+        last_error='',
+    )
+    for email, error in failed:
+        QueuedEmail.objects.filter(pk=email.pk).update(
+            status=(
+                QueuedEmail.Status.FAILED
+                if email.attempts >= MAX_EMAIL_ATTEMPTS
+                else QueuedEmail.Status.PENDING
+            ),
+            batch='',
+            last_error=error,
+        )
+    logger.info(
+        'Пачка писем %s: отправлено %s, ошибок %s',
+        batch, len(sent), len(failed),
+    )
+    return len(sent)
+
+
+def delivery_metrics(window=timedelta(hours=1)):
+    """
+    Собирает метрики доставки писем.
+
+    Args:
+        window: период, за который считается средняя задержка отправки
+
+    Returns:
+        dict: количество писем по состояниям, возраст самого старого
+            письма в очереди и средняя задержка отправки в секундах
+    """
+    now = timezone.now()
+    metrics = {status: 0 for status in QueuedEmail.Status.values}
+    metrics.update(
+        QueuedEmail.objects.values_list('status').annotate(total=Count('id'))
+    )
+    oldest = QueuedEmail.objects.filter(
+        status=QueuedEmail.Status.PENDING,
+    ).aggregate(oldest=Min('created_at'))['oldest']
+    latency = QueuedEmail.objects.filter(
+        status=QueuedEmail.Status.SENT,
+        sent_at__gte=now - window,
+    ).aggregate(latency=Avg(F('sent_at') - F('created_at')))['latency']
+    metrics['oldest_pending_seconds'] = (
+        (now - oldest).total_seconds() if oldest else 0
+    )
+    metrics['avg_delivery_seconds'] = (
+        latency.total_seconds() if latency else 0
+    )
+    return metrics
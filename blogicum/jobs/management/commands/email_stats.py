@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.mail import delivery_metrics
+
+
+class Command(BaseCommand):
+    """
+    Выводит метрики доставки писем из очереди.
+    """
+    help = 'Показывает состояние очереди писем и задержку отправки.'
+
+    def handle(self, *args, **options):
+        for name, value in delivery_metrics().items():
+            self.stdout.write(f'{name}: {value}')
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from jobs.constants import POLL_INTERVAL
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    """
+    Запускает воркер фоновых задач.
+    """
+    help = 'Выполняет задачи из очереди jobs.Job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue',
+            action='append',
+            dest='queues',
+            help='Обрабатывать только эту очередь (можно указать несколько).',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Количество потоков воркера.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=POLL_INTERVAL,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            queues=options['queues'],
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+        )
+        self.stdout.write(f'Воркер {worker.worker_id} запущен')
+        try:
+            worker.run(until_empty=options['once'])
+        except KeyboardInterrupt:
+            worker.stop()
+        self.stdout.write('Воркер остановлен')
@@ -0,0 +1,167 @@
+from django.db import models
+
+from jobs.constants import (
+    DEFAULT_QUEUE,
+    MAX_ATTEMPTS,
+    MAX_LENGTH,
+    MAX_NAME_LENGTH,
+)
+
+
+class Job(models.Model):
+    """
+    Фоновая задача в очереди.
+
+    Атрибуты:
+    - name: имя зарегистрированной задачи (см. jobs/registry.py)
+    - queue: очередь; для очереди можно ограничить число одновременных задач
+    - payload: именованные аргументы задачи
+    - status: состояние задачи
+    - attempts: количество сделанных попыток
+    - max_attempts: после стольких неудач задача помечается ошибочной
+    - run_after: задача не запускается раньше этого времени
+    - locked_by: воркер, выполняющий задачу
+    - locked_at: время захвата задачи воркером
+    - last_error: текст последней ошибки
+    - created_at: дата создания
+    - updated_at: дата изменения
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField(max_length=MAX_NAME_LENGTH, verbose_name='Задача')
+    queue = models.CharField(
+        max_length=MAX_NAME_LENGTH,
+        default=DEFAULT_QUEUE,
+        verbose_name='Очередь',
+    )
+    payload = models.JSONField(default=dict, verbose_name='Аргументы')
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Состояние',
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Попытки')
+    max_attempts = models.PositiveIntegerField(
+        default=MAX_ATTEMPTS,
+        verbose_name='Максимум попыток',
+    )
+    run_after = models.DateTimeField(verbose_name='Запустить после')
+    locked_by = models.CharField(
+        max_length=MAX_NAME_LENGTH,
+        blank=True,
+        verbose_name='Воркер',
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Захвачена',
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено',
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменено')
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after', 'id')
+        indexes = (
+            # Выбор следующей задачи воркером
+            models.Index(
+                fields=('queue', 'run_after'),
+                condition=models.Q(status='pending'),
+                name='job_pending_idx',
+            ),
+            # Подсчет выполняемых задач и поиск зависших
+            models.Index(
+                fields=('status', 'queue'),
+                name='job_status_idx',
+            ),
+        )
+
+    def __str__(self):
+        """
+        Возвращает строковое представление задачи.
+        """
+        return f'{self.name} #{self.pk} ({self.get_status_display()})'
+
+
+class QueuedEmail(models.Model):
+    """
+    Письмо, ожидающее отправки воркером (см. jobs/mail.py).
+
+    Атрибуты:
+    - message: сериализованный EmailMessage
+    - subject: тема письма (для админки)
+    - recipients: адреса получателей (для админки)
+    - status: состояние отправки
+    - attempts: количество сделанных попыток
+    - batch: метка пачки, захватившей письмо
+    - last_error: текст последней ошибки
+    - created_at: дата постановки в очередь
+    - updated_at: дата изменения
+    - sent_at: дата отправки
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        SENDING = 'sending', 'Отправляется'
+        SENT = 'sent', 'Отправлено'
+        FAILED = 'failed', 'Ошибка'
+
+    message = models.BinaryField(verbose_name='Письмо')
+    subject = models.CharField(
+        max_length=MAX_LENGTH,
+        blank=True,
+        verbose_name='Тема',
+    )
+    recipients = models.TextField(blank=True, verbose_name='Получатели')
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Состояние',
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Попытки')
+    batch = models.CharField(
+        max_length=MAX_NAME_LENGTH,
+        blank=True,
+        verbose_name='Пачка',
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено',
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменено')
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Отправлено',
+    )
+
+    class Meta:
+        verbose_name = 'письмо в очереди'
+        verbose_name_plural = 'Письма в очереди'
+        ordering = ('created_at', 'id')
+        indexes = (
+            # Выбор пачки писем и подсчет метрик по состояниям
+            models.Index(
+                fields=('status', 'created_at'),
+                name='email_status_idx',
+            ),
+        )
+
+    def __str__(self):
+        """
+        Возвращает строковое представление письма.
+        """
+        return f'{self.subject} → {self.recipients}'
@@ -0,0 +1,95 @@
+from django.utils import timezone
+
+from jobs.constants import DEFAULT_QUEUE, MAX_ATTEMPTS
+from jobs.models import Job
+
+# Зарегистрированные задачи: имя -> Task
+_tasks = {}
+
+
+class UnknownTask(Exception):
+    """Задача с таким именем не зарегистрирована."""
+
+
+class Task:
+    """
+    Функция, которую можно выполнить сразу или поставить в очередь.
+
+    Аргументы задачи передаются только по имени и должны сериализоваться
+    в JSON: они хранятся в Job.payload.
+    """
+
+    def __init__(self, func, name, queue, max_attempts):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.max_attempts = max_attempts
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def delay(self, run_after=None, **kwargs):
+        """
+        Ставит задачу в очередь.
+
+        Запись создается в текущей транзакции, поэтому воркер увидит задачу
+        только вместе с данными, ради которых она создана.
+
+        Args:
+            run_after: не запускать раньше этого времени (по умолчанию сразу)
+            kwargs: аргументы задачи
+
+        Returns:
+            Job: созданная запись очереди
+        """
+        return Job.objects.create(
+            name=self.name,
+            queue=self.queue,
+            payload=kwargs,
+            max_attempts=self.max_attempts,
+            run_after=run_after or timezone.now(),
+        )
+
+
+def task(name=None, queue=DEFAULT_QUEUE, max_attempts=MAX_ATTEMPTS):
+    """
+    Декоратор, регистрирующий функцию как фоновую задачу.
+
+    Пример:
+        @task('blog.process_post_image', queue='images')
+        def process_post_image(post_id):
+            ...
+
+        process_post_image.delay(post_id=post.pk)
+
+    Args:
+        name: имя задачи (по умолчанию module.function)
+        queue: очередь задачи
+        max_attempts: количество попыток до пометки задачи ошибочной
+
+    Returns:
+        function: декоратор, возвращающий Task
+    """
+    def decorator(func):
+        registered = Task(
+            func,
+            name or f'{func.__module__}.{func.__name__}',
+            queue,
+            max_attempts,
+        )
+        _tasks[registered.name] = registered
+        return registered
+    return decorator
+
+
+def get_task(name):
+    """
+    Возвращает зарегистрированную задачу по имени.
+
+    Raises:
+        UnknownTask: если задача не зарегистрирована
+    """
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise UnknownTask(name) from None
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from jobs.constants import MAIL_QUEUE, RETRY_DELAY
+from jobs.mail import flush_email_queue, schedule_flush
+from jobs.models import QueuedEmail
+from jobs.registry import task
+
+
+@task('jobs.send_queued_emails', queue=MAIL_QUEUE)
+def send_queued_emails():
+    """
+    Отправляет письма из очереди пачками.
+
+    Пока в очереди остаются письма, задача ставит себя снова, чтобы
+    другие очереди воркера не ждали окончания большой рассылки. Если
+    в пачке не ушло ни одного письма, повтор откладывается.
+    """
+    sent = flush_email_queue()
+    if QueuedEmail.objects.filter(status=QueuedEmail.Status.PENDING).exists():
+        schedule_flush(
+            run_after=None if sent
+            else timezone.now() + timedelta(seconds=RETRY_DELAY)
+        )
@@ -0,0 +1,222 @@
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Count, F
+from django.utils import timezone
+
+from jobs.constants import (
+    LOCK_TIMEOUT,
+    MAX_ERROR_LENGTH,
+    POLL_INTERVAL,
+    RELEASE_INTERVAL,
+    RETRY_DELAY,
+)
+from jobs.models import Job
+from jobs.registry import UnknownTask, get_task
+
+logger = logging.getLogger(__name__)
+
+# Сколько задач-кандидатов просматривается за одну попытку захвата
+CLAIM_BATCH = 10
+
+
+class Worker:
+    """
+    Выполняет задачи из очереди Job в нескольких потоках.
+
+    Задача захватывается условным UPDATE (status='pending' -> 'running'),
+    поэтому несколько воркеров, в том числе в разных процессах, не
+    выполнят ее дважды. Ограничения из JOBS_QUEUE_CONCURRENCY считаются
+    по всем воркерам через число выполняемых задач очереди. Задачи
+    упавших воркеров возвращаются в очередь при запуске и затем раз
+    в RELEASE_INTERVAL секунд.
+    """
+
+    def __init__(
+            self,
+            queues=None,
+            concurrency=1,
+            poll_interval=POLL_INTERVAL,
+    ):
+        self.queues = list(queues or [])
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.limits = getattr(settings, 'JOBS_QUEUE_CONCURRENCY', {})
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopped = threading.Event()
+        self._release_lock = threading.Lock()
+        self._next_release = 0
+
+    def release_stale(self):
+        """Возвращает в очередь задачи, захваченные слишком давно."""
+        expired = timezone.now() - timedelta(seconds=LOCK_TIMEOUT)
+        released = Job.objects.filter(
+            status=Job.Status.RUNNING,
+            locked_at__lt=expired,
+        ).update(status=Job.Status.PENDING, locked_by='', locked_at=None)
+        if released:
+            logger.warning('В очередь возвращено зависших задач: %s', released)
+        return released
+
+    def _release_stale_periodically(self):
+        # Зависшие задачи ищет только один поток воркера
+        if not self._release_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() >= self._next_release:
+                self._next_release = time.monotonic() + RELEASE_INTERVAL
+                self.release_stale()
+        finally:
+            self._release_lock.release()
+
+    def _full_queues(self):
+        if not self.limits:
+            return []
+        running = dict(
+            Job.objects.filter(
+                status=Job.Status.RUNNING,
+                queue__in=self.limits,
+            ).values_list('queue').annotate(total=Count('id'))
+        )
+        return [
+            queue for queue, limit in self.limits.items()
+            if running.get(queue, 0) >= limit
+        ]
+
+    def claim(self):
+        """
+        Захватывает следующую готовую к запуску задачу.
+
+        Returns:
+            Job | None: захваченная задача или None, если очередь пуста
+        """
+        candidates = Job.objects.filter(
+            status=Job.Status.PENDING,
+            run_after__lte=timezone.now(),
+        ).exclude(queue__in=self._full_queues())
+        if self.queues:
+            candidates = candidates.filter(queue__in=self.queues)
+        for job_id in candidates.values_list('id', flat=True)[:CLAIM_BATCH]:
+            claimed = Job.objects.filter(
+                pk=job_id,
+                status=Job.Status.PENDING,
+            ).update(
+                status=Job.Status.RUNNING,
+                locked_by=self.worker_id,
+                locked_at=timezone.now(),
+                attempts=F('attempts') + 1,
+                updated_at=timezone.now(),
+            )
+            if claimed:
+                return Job.objects.get(pk=job_id)
+        return None
+
+    def execute(self, job):
+        """
+        Выполняет захваченную задачу и записывает результат.
+
+        При ошибке задача возвращается в очередь с экспоненциальной
+        задержкой, пока не исчерпаны попытки.
+        """
+        try:
+            get_task(job.name)(**job.payload)
+        except UnknownTask:
+            logger.error('Неизвестная задача %s', job)
+            self._finish(job, Job.Status.FAILED, 'Задача не зарегистрирована')
+        except Exception:
+            error = traceback.format_exc()[-MAX_ERROR_LENGTH:]
+            if job.attempts >= job.max_attempts:
+                logger.exception('Задача %s завершилась ошибкой', job)
+                self._finish(job, Job.Status.FAILED, error)
+            else:
+                logger.warning('Задача %s будет повторена', job)
+                delay = RETRY_DELAY * 2 ** (job.attempts - 1)
+                self._finish(
+                    job,
+                    Job.Status.PENDING,
+                    error,
+                    run_after=timezone.now() + timedelta(seconds=delay),
+                )
+        else:
+            self._finish(job, Job.Status.DONE)
+
+    def _finish(self, job, status, error='', **fields):
+        Job.objects.filter(pk=job.pk).update(
+            status=status,
+            locked_by='',
+            locked_at=None,
+            last_error=error,
+            updated_at=timezone.now(),
+            **fields,
+        )
+
+    def _loop(self, until_empty):
+        try:
+            while not self.stopped.is_set():
+                close_old_connections()
+                self._release_stale_periodically()
+                job = self.claim()
+                if job is not None:
+                    self.execute(job)
+                elif until_empty:
+                    return
+                else:
+                    self.stopped.wait(self.poll_interval)
+        finally:
+            connection.close()
+
+    def run(self, until_empty=False):
+        """
+        Запускает потоки воркера.
+
+        Args:
+            until_empty: завершиться, когда готовых задач не останется
+        """
+        if self.concurrency == 1:
+            self._run_in_current_thread(until_empty)
+            return
+        threads = [
+            threading.Thread(target=self._loop, args=(until_empty,))
+            for _ in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+    def _run_in_current_thread(self, until_empty):
+        # Без отдельных потоков: соединение с БД текущего потока не закрываем
+        while not self.stopped.is_set():
+            self._release_stale_periodically()
+            job = self.claim()
+            if job is not None:
+                self.execute(job)
+            elif until_empty:
+                return
+            else:
+                self.stopped.wait(self.poll_interval)
+
+    def stop(self):
+        """Просит потоки завершиться после текущей задачи."""
+        self.stopped.set()
+
+
+def run_pending_jobs(queues=None):
+    """
+    Выполняет в текущем потоке все готовые задачи и возвращает управление.
+
+    Удобно для тестов и разовых запусков из cron.
+    """
+    Worker(queues=queues).run(until_empty=True)
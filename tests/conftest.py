@@ -96,6 +96,16 @@ pytest_plugins = [
 ]
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core.cache import caches
+
+    # База откатывается после каждого теста, а кеши - нет
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
 @pytest.fixture
 def mixer():
     return _mixer
@@ -363,6 +373,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -0,0 +1,153 @@
+"""
+Проверка того, что число SQL-запросов страницы не зависит от объема
+данных: страница открывается при малом и большом количестве постов
+и комментариев, списки запросов сравниваются, а при расхождении
+выводится diff нормализованного SQL.
+"""
+import difflib
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import pytest
+from django.contrib import admin
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+# Количество постов и комментариев при первом и втором замере
+SMALL = 2
+LARGE = 12
+
+# Литералы в SQL: строки и числа (id, даты, LIMIT)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"IN \((?:\?, )*\?\)")
+
+
+def normalize(sql):
+    """Заменяет литералы на ? и схлопывает IN-списки."""
+    return _IN_LIST.sub("IN (...)", _LITERALS.sub("?", sql))
+
+
+def _walk(patterns, namespace):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(
+                pattern.url_patterns, pattern.namespace or namespace
+            )
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f"{namespace}:{pattern.name}", list(
+                pattern.pattern.converters
+            )
+
+
+def site_routes(namespaces=("blog", "pages")):
+    """
+    Маршруты приложений: имя маршрута -> имена его параметров.
+    """
+    routes = {}
+    for pattern in get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver) and (
+            pattern.namespace in namespaces
+        ):
+            routes.update(_walk(pattern.url_patterns, pattern.namespace))
+    return routes
+
+
+def admin_changelists():
+    """Имена маршрутов списков всех моделей админки."""
+    return sorted(
+        f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist"
+        for model in admin.site._registry
+    )
+
+
+@dataclass
+class World:
+    """
+    Данные для обхода страниц: у автора посты в одной категории,
+    у первого поста комментарии разных пользователей.
+    """
+    mixer: object
+    author: object
+    category: object = None
+    location: object = None
+    posts: list = field(default_factory=list)
+    comments: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.category = self.mixer.blend("blog.Category", is_published=True)
+        self.location = self.mixer.blend("blog.Location", is_published=True)
+
+    @property
+    def post(self):
+        return self.posts[0]
+
+    def grow(self, size):
+        """Доводит количество постов и комментариев до size."""
+        while len(self.posts) < size:
+            self.posts.append(self.mixer.blend(
+                "blog.Post",
+                author=self.author,
+                category=self.category,
+                location=self.location,
+                is_published=True,
+                pub_date=timezone.now() - timedelta(days=len(self.posts) + 1),
+                image="",
+            ))
+        while len(self.comments) < size:
+            # Первый комментарий — автора: его можно редактировать
+            author = self.author if not self.comments else (
+                self.mixer.blend("auth.User")
+            )
+            self.comments.append(self.mixer.blend(
+                "blog.Comment", post=self.post, author=author,
+                is_published=True,
+            ))
+
+    def url(self, name, params=()):
+        values = {
+            "post_id": self.post.pk,
+            "comment_id": self.comments[0].pk,
+            "category_slug": self.category.slug,
+            "username": self.author.username,
+        }
+        return reverse(name, kwargs={param: values[param] for param in params})
+
+
+def capture(client, url):
+    """Открывает страницу с чистыми кешами и возвращает ее SQL."""
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code < 500, url
+    return [normalize(query["sql"]) for query in queries.captured_queries]
+
+
+def assert_constant_queries(client, world, name, params=()):
+    """
+    Проверяет, что число запросов страницы одинаково при SMALL и LARGE
+    постах и комментариях, иначе падает с diff SQL.
+    """
+    world.grow(SMALL)
+    url = world.url(name, params)
+    small = capture(client, url)
+    world.grow(LARGE)
+    large = capture(client, url)
+    if len(small) != len(large):
+        diff = "\n".join(difflib.unified_diff(
+            small, large,
+            fromfile=f"{SMALL} объектов: {len(small)} запросов",
+            tofile=f"{LARGE} объектов: {len(large)} запросов",
+            lineterm="",
+        ))
+        pytest.fail(
+            f"Число запросов страницы {name} ({url}) растет с объемом"
+            f" данных:\n{diff}",
+            pytrace=False,
+        )
+    return len(large)
@@ -0,0 +1,117 @@
+import pytest
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+pytestmark = [pytest.mark.django_db]
+
+
+def changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+@pytest.mark.parametrize("model", ["post", "comment"])
+def test_changelist_queries_do_not_grow(admin_client, mixer, model):
+    url = f"/admin/blog/{model}/"
+    mixer.cycle(2).blend("blog.Comment")
+    _, few = changelist_queries(admin_client, url)
+    mixer.cycle(10).blend("blog.Comment")
+    _, many = changelist_queries(admin_client, url)
+    assert many == few, (
+        "Убедитесь, что список в админке не делает запрос на каждую строку."
+    )
+
+
+def test_text_is_truncated_in_sql(admin_client, mixer):
+    from blog.constants import ADMIN_TEXT_PREVIEW
+
+    mixer.blend("blog.Post", text="Начало " + "слово " * 1000)
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/admin/blog/post/")
+    content = response.content.decode()
+    assert "Начало" in content and "слово " * 100 not in content
+    select = next(
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith('SELECT "blog_post"."id"')
+    )
+    assert f'SUBSTR("blog_post"."text", 1, {ADMIN_TEXT_PREVIEW + 1})' in (
+        select
+    )
+    assert select.count('"blog_post"."text"') == 1, (
+        "Убедитесь, что полный текст поста не загружается в список."
+    )
+
+
+def test_large_tables_use_estimated_count(mixer, monkeypatch):
+    from blog import admin_performance
+    from blog.admin_performance import EstimatedCountPaginator
+    from blog.models import Post
+
+    monkeypatch.setattr(admin_performance, "EXACT_COUNT_LIMIT", 3)
+    posts = mixer.cycle(5).blend("blog.Post")
+    Post.objects.filter(pk=posts[0].pk).delete()
+    paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+    assert paginator.count == posts[-1].pk, (
+        "Убедитесь, что большие таблицы не пересчитываются COUNT(*)."
+    )
+    small = EstimatedCountPaginator(Post.objects.filter(pk=posts[1].pk), 2)
+    assert small.count == 1
+
+
+def test_filtered_large_lists_show_lower_bound(
+        admin_client, mixer, monkeypatch
+):
+    from blog import admin_performance
+    from blog.admin_performance import EstimatedCountPaginator
+    from blog.models import Post
+
+    monkeypatch.setattr(admin_performance, "EXACT_COUNT_LIMIT", 3)
+    mixer.cycle(6).blend("blog.Post", is_published=False)
+    mixer.blend("blog.Post", is_published=True)
+    paginator = EstimatedCountPaginator(
+        Post.objects.filter(is_published=False), 2
+    )
+    assert paginator.count == 4, (
+        "Убедитесь, что отфильтрованный список не оценивается"
+        " по максимальному id всей таблицы."
+    )
+    assert paginator.count_is_lower_bound
+    assert paginator.num_pages == 2
+
+    response = admin_client.get("/admin/blog/post/?is_published__exact=0")
+    assert "более 3 " in response.content.decode()
+
+
+def test_foreign_keys_use_autocomplete(admin_client, mixer):
+    post = mixer.blend("blog.Post")
+    comment = mixer.blend("blog.Comment", post=post)
+    other = mixer.blend("auth.User", username="не_выбранный")
+    for url in (
+        f"/admin/blog/post/{post.pk}/change/",
+        f"/admin/blog/comment/{comment.pk}/change/",
+    ):
+        content = admin_client.get(url).content.decode()
+        assert "admin-autocomplete" in content
+        assert other.username not in content, (
+            "Убедитесь, что связанные объекты выбираются автодополнением,"
+            " а не полным списком."
+        )
+
+
+def test_list_editable_still_saves(admin_client, mixer):
+    post = mixer.blend("blog.Post", text="Полный текст поста")
+    category = mixer.blend("blog.Category")
+    response = admin_client.post("/admin/blog/post/", {
+        "form-TOTAL_FORMS": 1,
+        "form-INITIAL_FORMS": 1,
+        "form-0-id": post.pk,
+        "form-0-is_published": "",
+        "form-0-category": category.pk,
+        "_save": "Сохранить",
+    })
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.category == category and not post.is_published
+    assert post.text == "Полный текст поста"
@@ -0,0 +1,76 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def changelist(admin_client, model, **params):
+    response = admin_client.get(f"/admin/blog/{model}/", params)
+    assert response.status_code == 200
+    return list(response.context["cl"].result_list)
+
+
+@pytest.fixture
+def posts(mixer, published_category):
+    other = mixer.blend("blog.Category", is_published=True)
+    return {
+        "lake": mixer.blend(
+            "blog.Post", title="Зимний БАЙКАЛ", category=published_category
+        ),
+        "hidden": mixer.blend(
+            "blog.Post", title="Байкал летом", category=other,
+            is_published=False,
+        ),
+        "other": mixer.blend("blog.Post", title="Алтай"),
+    }
+
+
+def test_post_search_uses_index(admin_client, posts, published_category):
+    found = changelist(admin_client, "post", q="байкал")
+    assert set(found) == {posts["lake"], posts["hidden"]}, (
+        "Убедитесь, что поиск в админке находит подстроку без учета регистра."
+    )
+    assert changelist(admin_client, "post", q="йкал зим") == [posts["lake"]]
+
+    filtered = changelist(
+        admin_client, "post", q="байкал",
+        category__id__exact=published_category.id,
+    )
+    assert filtered == [posts["lake"]], (
+        "Убедитесь, что фильтры списка работают вместе с поиском."
+    )
+    assert changelist(
+        admin_client, "post", q="байкал", is_published__exact=0
+    ) == [posts["hidden"]]
+
+
+def test_index_follows_edits(admin_client, posts):
+    post = posts["other"]
+    post.title = "Телецкое озеро"
+    post.save()
+    assert changelist(admin_client, "post", q="алтай") == []
+    assert changelist(admin_client, "post", q="телецк") == [post]
+
+
+def test_short_terms_fall_back_to_icontains(admin_client, posts):
+    assert changelist(admin_client, "post", q="ал") != []
+
+
+def test_category_and_location_search(admin_client, mixer):
+    category = mixer.blend("blog.Category", title="Путешествия")
+    location = mixer.blend("blog.Location", name="Санкт-Петербург")
+    assert changelist(admin_client, "category", q="шеств") == [category]
+    assert changelist(admin_client, "location", q="петерб") == [location]
+
+
+def test_search_plan_reads_trigram_index(posts):
+    from blog.admin_search import TrigramSearchBackend
+    from blog.models import Post
+
+    queryset = TrigramSearchBackend("blog_post_trigram").search(
+        Post.objects.all(), "байкал"
+    )
+    plan = queryset.explain()
+    assert "SCAN blog_post_trigram VIRTUAL TABLE" in plan
+    assert "SEARCH blog_post USING INTEGER PRIMARY KEY" in plan, (
+        "Убедитесь, что поиск не сканирует таблицу постов."
+    )
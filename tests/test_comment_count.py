@@ -0,0 +1,75 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def refreshed_count(post: Model) -> int:
+    post.refresh_from_db(fields=["comment_count"])
+    return post.comment_count
+
+
+def test_counter_follows_comment_views(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Первый"})
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Второй"})
+    assert refreshed_count(post) == 2, (
+        "Убедитесь, что добавление комментария увеличивает"
+        " `Post.comment_count`."
+    )
+
+    comment = post.comments.first()
+    user_client.post(
+        f"/posts/{post.id}/delete_comment/{comment.id}/"
+    )
+    assert refreshed_count(post) == 1, (
+        "Убедитесь, что удаление комментария уменьшает"
+        " `Post.comment_count`."
+    )
+
+
+def test_counter_counts_only_published(mixer, post_with_published_location):
+    post = post_with_published_location
+    another_post = mixer.blend("blog.Post")
+    comment = mixer.blend("blog.Comment", post=post, is_published=True)
+    mixer.blend("blog.Comment", post=post, is_published=False)
+    assert refreshed_count(post) == 1
+
+    comment.is_published = False
+    comment.save()
+    assert refreshed_count(post) == 0
+
+    comment.is_published = True
+    comment.post = another_post
+    comment.save()
+    assert refreshed_count(post) == 0
+    assert refreshed_count(another_post) == 1
+
+
+def test_listing_does_not_join_comments(post_with_published_location, client):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/")
+    assert not any("blog_comment" in q["sql"] for q in ctx.captured_queries)
+
+
+def test_recount_comments_fixes_drift(mixer, post_with_published_location):
+    from blog.models import Post
+
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, is_published=True)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    out = StringIO()
+    call_command("recount_comments", "--dry-run", stdout=out)
+    assert "1" in out.getvalue()
+    assert refreshed_count(post) == 42
+
+    call_command("recount_comments", stdout=StringIO())
+    assert refreshed_count(post) == 3
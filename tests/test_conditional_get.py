@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def page_urls(post_with_published_location, user):
+    post = post_with_published_location
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+        f"/posts/{post.id}/",
+    ]
+
+
+def test_validators_answer_304_without_rendering(
+        page_urls, user_client, django_assert_max_num_queries
+):
+    for url in page_urls:
+        # Первый ответ может выставить CSRF-cookie, от которой зависит ETag
+        user_client.get(url)
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header("Last-Modified"), url
+        etag = response["ETag"]
+
+        # Сессия, пользователь и запрос даты изменения
+        with django_assert_max_num_queries(3):
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что страница `{url}` отвечает 304 на совпадающий"
+            " If-None-Match."
+        )
+        assert not response.templates
+
+
+def test_etag_changes_with_content(
+        post_with_published_location, user_client, client
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    etag = user_client.get(url)["ETag"]
+    assert client.get(url)["ETag"] != etag, (
+        "Убедитесь, что ETag различается для разных пользователей."
+    )
+
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Новый"})
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "Новый" in response.content.decode()
+
+    etag = response["ETag"]
+    post.title = "Исправленный заголовок"
+    post.save()
+    response = user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,176 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def small_limits(monkeypatch):
+    from blog import deletion, tasks
+
+    monkeypatch.setattr(deletion, "INLINE_DELETE_LIMIT", 3)
+    monkeypatch.setattr(deletion, "DELETE_CHUNK_SIZE", 2)
+    monkeypatch.setattr(tasks, "DELETE_CHUNKS_PER_JOB", 2)
+
+
+def test_small_post_is_deleted_inline(
+        mixer, post_with_published_location, user_client
+):
+    from blog.models import Deletion, Post
+
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not Deletion.objects.exists()
+
+
+def test_large_post_is_hidden_and_deleted_in_chunks(
+        mixer, post_with_published_location, user_client
+):
+    from blog.models import Comment, Deletion, Post
+    from jobs.models import Job
+    from jobs.worker import run_pending_jobs
+
+    post = post_with_published_location
+    mixer.cycle(7).blend("blog.Comment", post=post)
+    user_client.post(f"/posts/{post.id}/delete/")
+
+    assert Post.objects.filter(pk=post.pk).exists()
+    assert user_client.get(f"/posts/{post.id}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    ), "Убедитесь, что пост скрывается сразу, даже от автора."
+    assert post.title not in user_client.get("/").content.decode()
+
+    run_pending_jobs()
+    deletion = Deletion.objects.get()
+    assert deletion.status == Deletion.Status.DONE
+    assert (deletion.total, deletion.deleted) == (7, 7)
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.exists()
+    # 4 порции комментариев и удаление поста: задача поставлена трижды
+    assert Job.objects.filter(name="blog.run_deletion").count() == 3
+
+
+def test_user_deletion_keeps_other_counters(
+        mixer, user, another_user, post_with_published_location, client
+):
+    from blog import deletion
+    from blog.models import Comment, Post
+    from django.contrib.auth.models import User
+    from jobs.worker import run_pending_jobs
+
+    other_post = mixer.blend(
+        "blog.Post", author=another_user,
+        category=post_with_published_location.category,
+        is_published=True,
+    )
+    mixer.cycle(3).blend("blog.Comment", author=user, post=other_post)
+    mixer.cycle(2).blend(
+        "blog.Comment", author=another_user,
+        post=post_with_published_location,
+    )
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 3
+
+    assert deletion.delete_user(user) is not None
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 0, (
+        "Убедитесь, что комментарии удаляемого пользователя сразу скрываются"
+        " и не учитываются в счетчиках."
+    )
+    assert client.get(f"/profile/{user.username}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+    run_pending_jobs()
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not Comment.objects.exists()
+    assert list(Post.objects.all()) == [other_post]
+
+
+def test_admin_shows_progress(admin_client, mixer, post_with_published_location):
+    from blog import deletion
+    from blog.models import Deletion
+
+    mixer.cycle(5).blend("blog.Comment", post=post_with_published_location)
+    record = deletion.delete_post(post_with_published_location)
+    deletion.start_deletion(record.pk)
+    deletion.delete_chunk(record)
+
+    response = admin_client.get("/admin/blog/deletion/")
+    assert "2 из 5 (40%)" in response.content.decode()
+    assert Deletion.objects.get().status == Deletion.Status.RUNNING
+
+
+def test_admin_confirmation_skips_large_cascade(
+        admin_client, mixer, post_with_published_location,
+        django_assert_max_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(10).blend("blog.Comment", post=post)
+    url = f"/admin/blog/post/{post.id}/delete/"
+    with django_assert_max_num_queries(10):
+        response = admin_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    response = admin_client.post(url, {"post": "yes"})
+    assert response.status_code == HTTPStatus.FOUND
+    assert "удаляются в фоне" in admin_client.get(
+        "/admin/blog/post/"
+    ).content.decode()
+
+
+def test_post_in_deletion_cannot_be_republished_or_edited(
+        mixer, post_with_published_location, user_client, admin_client
+):
+    from blog import deletion
+    from blog.models import Deletion, Post
+    from blog.moderation import set_published
+
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    record = deletion.delete_post(post)
+    assert deletion.delete_post(post) == record
+    assert Deletion.objects.count() == 1, (
+        "Убедитесь, что повторное удаление не ставит вторую задачу."
+    )
+
+    assert set_published(Post.objects.filter(pk=post.pk), True) == 0
+    admin_client.post("/admin/blog/post/", {
+        "action": "publish", "_selected_action": [post.pk],
+    })
+    assert user_client.get(f"/posts/{post.id}/edit/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert user_client.post(f"/posts/{post.id}/edit/", {
+        "title": "Снова в ленте", "text": "Текст",
+        "pub_date": "2020-01-01 00:00", "is_published": True,
+    }).status_code == HTTPStatus.NOT_FOUND
+    assert admin_client.post(f"/admin/blog/post/{post.id}/change/", {
+        "is_published": "on",
+    }).status_code == HTTPStatus.FORBIDDEN
+    post.refresh_from_db()
+    assert not post.is_published
+
+
+def test_admin_bulk_delete_splits_selection(
+        admin_client, mixer, post_with_published_location
+):
+    from blog.models import Deletion, Post
+
+    large = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=large)
+    small = mixer.cycle(3).blend(
+        "blog.Post", author=large.author, category=large.category
+    )
+    response = admin_client.post("/admin/blog/post/", {
+        "action": "delete_selected", "post": "yes",
+        "_selected_action": [large.pk, *(post.pk for post in small)],
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    assert list(Post.objects.all()) == [large]
+    assert list(Deletion.objects.values_list("object_id", flat=True)) == [
+        large.pk
+    ]
@@ -0,0 +1,105 @@
+import logging
+import re
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    from blogicum.instrumentation.collector import metrics
+
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def sample(text, name, **labels):
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(
+        rf"^{name}{{{re.escape(rendered)}}} (\S+)$", text, re.MULTILINE
+    )
+    assert match, f"Метрика {name}{{{rendered}}} не найдена."
+    return float(match.group(1))
+
+
+def test_metrics_by_view(post_with_published_location, user_client):
+    post = post_with_published_location
+    user_client.get("/")
+    user_client.get("/")
+    user_client.get(f"/posts/{post.id}/")
+
+    response = user_client.get("/metrics/")
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.content.decode()
+    assert sample(text, "blogicum_requests_total", view="blog:index") == 2
+    assert sample(
+        text, "blogicum_requests_total", view="blog:post_detail"
+    ) == 1
+    assert sample(text, "blogicum_db_queries_total", view="blog:index") > 0
+    assert sample(
+        text, "blogicum_template_seconds_total", view="blog:index"
+    ) > 0, "Убедитесь, что замеряется время рендера шаблонов."
+    assert sample(text, "blogicum_email_messages", status="pending") == 0
+
+
+def test_metrics_are_local_only(client):
+    response = client.get("/metrics/", REMOTE_ADDR="10.0.0.1")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_metrics_token_replaces_address_check(client, settings):
+    settings.METRICS_TOKEN = "секрет"
+    assert client.get("/metrics/").status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что с токеном адрес из INTERNAL_IPS не дает доступа:"
+        " за прокси это адрес самого прокси."
+    )
+    assert client.get(
+        "/metrics/", HTTP_AUTHORIZATION="Bearer неверный"
+    ).status_code == HTTPStatus.NOT_FOUND
+    assert client.get(
+        "/metrics/", REMOTE_ADDR="10.0.0.1",
+        HTTP_AUTHORIZATION="Bearer секрет",
+    ).status_code == HTTPStatus.OK
+
+
+def test_duplicate_fingerprints():
+    from blogicum.instrumentation.collector import RequestRecord, fingerprint
+
+    record = RequestRecord()
+
+    def execute(sql, params, many, context):
+        return None
+
+    for count in (1, 2, 3):
+        record(
+            execute,
+            "SELECT * FROM blog_comment WHERE post_id IN ("
+            + ", ".join(["%s"] * count) + ")",
+            None, False, {},
+        )
+    record(execute, "SELECT 1", None, False, {})
+    assert record.queries == 4
+    duplicates = record.duplicates()
+    assert list(duplicates.values()) == [3], (
+        "Убедитесь, что запросы с разной длиной IN-списка дают один отпечаток."
+    )
+    assert len({fingerprint(sql) for sql in duplicates}) == 1
+
+
+@override_settings(QUERY_BUDGET=1)
+def test_over_budget_is_logged(
+        post_with_published_location, user_client, caplog
+):
+    with caplog.at_level(logging.WARNING, "blogicum.instrumentation"):
+        user_client.get("/")
+    assert any("blog:index" in message for message in caplog.messages)
+    text = user_client.get("/metrics/").content.decode()
+    assert sample(
+        text, "blogicum_over_budget_total", view="blog:index",
+        budget="queries",
+    ) == 1
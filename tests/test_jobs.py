@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import task
+from jobs.worker import Worker, run_pending_jobs
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@task("tests.record", queue="tests")
+def record(value):
+    calls.append(value)
+
+
+@task("tests.explode", queue="tests", max_attempts=2)
+def explode():
+    raise RuntimeError("Сбой задачи")
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def test_job_runs_once():
+    job = record.delay(value=1)
+    run_pending_jobs()
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert calls == [1]
+    assert job.status == Job.Status.DONE
+    assert job.attempts == 1
+
+
+def test_delayed_job_waits():
+    job = record.delay(value=1, run_after=timezone.now() + timedelta(hours=1))
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.Status.PENDING and calls == []
+
+
+def test_failed_job_is_retried_with_backoff():
+    job = explode.delay()
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.Status.PENDING, (
+        "Убедитесь, что упавшая задача возвращается в очередь."
+    )
+    assert job.run_after > timezone.now()
+    assert "Сбой задачи" in job.last_error
+
+    Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED, (
+        "Убедитесь, что после max_attempts попыток задача помечается ошибочной."
+    )
+    assert job.attempts == 2
+
+
+@override_settings(JOBS_QUEUE_CONCURRENCY={"tests": 1})
+def test_queue_concurrency_limit():
+    record.delay(value=1)
+    record.delay(value=2)
+    worker = Worker()
+    first = worker.claim()
+    assert first is not None
+    assert worker.claim() is None, (
+        "Убедитесь, что воркер не превышает лимит одновременных задач очереди."
+    )
+    worker.execute(first)
+    assert worker.claim() is not None
+
+
+def test_stale_jobs_are_released():
+    job = record.delay(value=1)
+    worker = Worker()
+    assert worker.claim() == job
+    Job.objects.filter(pk=job.pk).update(
+        locked_at=timezone.now() - timedelta(days=1)
+    )
+    run_pending_jobs()
+    assert calls == [1]
+
+
+
+
+@task("tests.stall_other", queue="tests")
+def stall_other(job_id):
+    # Задача другого воркера зависает, пока этот воркер уже работает
+    Job.objects.filter(pk=job_id).update(
+        status=Job.Status.RUNNING,
+        locked_at=timezone.now() - timedelta(days=1),
+        run_after=timezone.now(),
+    )
+
+
+def test_stale_jobs_are_released_while_running(monkeypatch):
+    from jobs import worker as worker_module
+
+    monkeypatch.setattr(worker_module, "RELEASE_INTERVAL", 0)
+    stale = record.delay(value=1)
+    Job.objects.filter(pk=stale.pk).update(
+        run_after=timezone.now() + timedelta(days=1)
+    )
+    stall_other.delay(job_id=stale.pk)
+    run_pending_jobs()
+    assert calls == [1], (
+        "Убедитесь, что воркер возвращает зависшие задачи не только"
+        " при запуске."
+    )
+    assert Job.objects.get(pk=stale.pk).status == Job.Status.DONE
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def run_action(admin_client, model, action, objects, **data):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post(f"/admin/blog/{model}/", {
+            "action": action,
+            "_selected_action": [obj.pk for obj in objects],
+            **data,
+        })
+    assert response.status_code == 302
+    return len(queries)
+
+
+def make_old(queryset):
+    queryset.update(updated_at=timezone.now() - timedelta(days=1))
+
+
+def test_unpublish_is_one_update(admin_client, mixer, published_category):
+    from blog.models import Post
+
+    queries = []
+    for count in (3, 30):
+        posts = mixer.cycle(count).blend(
+            "blog.Post", category=published_category, is_published=True
+        )
+        make_old(Post.objects.filter(is_published=True))
+        queries.append(run_action(admin_client, "post", "unpublish", posts))
+    assert queries[0] == queries[1], (
+        "Убедитесь, что массовое действие выполняется одним UPDATE."
+    )
+    assert not Post.objects.filter(is_published=True).exists()
+    assert not Post.objects.filter(
+        updated_at__lt=timezone.now() - timedelta(hours=1)
+    ).exists(), "Убедитесь, что массовое действие сдвигает `updated_at`."
+
+
+def test_actions_invalidate_page_cache(
+        admin_client, client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in client.get("/").content.decode()
+    run_action(admin_client, "post", "unpublish", [post])
+    assert post.title not in client.get("/").content.decode(), (
+        "Убедитесь, что массовое действие сбрасывает кеш страниц."
+    )
+    run_action(admin_client, "category", "publish", [post.category])
+    run_action(admin_client, "post", "publish", [post])
+    assert post.title in client.get("/").content.decode()
+
+
+def test_recategorize(admin_client, mixer, post_with_published_location):
+    post = post_with_published_location
+    category = mixer.blend("blog.Category", is_published=True)
+    run_action(
+        admin_client, "post", "recategorize", [post], category=category.pk
+    )
+    post.refresh_from_db()
+    assert post.category == category
+
+
+def test_hide_comments_fixes_counters(
+        admin_client, mixer, post_with_published_location
+):
+    from blog.models import Comment
+
+    post = post_with_published_location
+    other = mixer.blend("blog.Post")
+    mixer.cycle(3).blend("blog.Comment", post=post, is_published=True)
+    mixer.cycle(2).blend("blog.Comment", post=other, is_published=True)
+
+    run_action(admin_client, "post", "hide_post_comments", [post])
+    post.refresh_from_db()
+    other.refresh_from_db()
+    assert post.comment_count == 0
+    assert other.comment_count == 2
+
+    comment = Comment.objects.filter(post=post).first()
+    run_action(admin_client, "comment", "show_comments", [comment])
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что массовые действия пересчитывают счетчики комментариев."
+    )
+
+
+def test_hidden_comments_are_not_shown(
+        admin_client, user_client, client, mixer, post_with_published_location
+):
+    from blog.models import Comment
+
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Comment", post=post, is_published=True, text="Скрыть меня"
+    )
+    mixer.blend("blog.Comment", post=post, is_published=True, text="Видно")
+    run_action(admin_client, "comment", "hide_comments", [hidden])
+    assert not Comment.objects.get(pk=hidden.pk).is_published
+
+    url = f"/posts/{post.id}/"
+    for reader in (client, user_client):
+        content = reader.get(url).content.decode()
+        assert "Видно" in content
+        assert "Скрыть меня" not in content, (
+            "Убедитесь, что скрытый комментарий не показывается на странице"
+            " поста."
+        )
+        fragment = reader.get(f"{url}comments/").content.decode()
+        assert "Скрыть меня" not in fragment
@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=["locmem", "filebased"])
+def page_cache_backend(request, tmp_path):
+    backends = {
+        "locmem": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-pages",
+        },
+        "filebased": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "pages"),
+        },
+    }
+    caches = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "pages": backends[request.param],
+        "template_fragments": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+    with override_settings(CACHES=caches):
+        yield
+
+
+def test_anonymous_pages_are_cached(
+        page_cache_backend, post_with_published_location, client,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    for url in ("/", f"/category/{post.category.slug}/", f"/posts/{post.id}/"):
+        first = client.get(url)
+        assert first.status_code == HTTPStatus.OK
+        # Остается только запрос даты изменения для ETag/Last-Modified
+        with django_assert_num_queries(1):
+            second = client.get(url)
+        assert second.content == first.content
+
+
+def test_page_number_is_part_of_key(
+        page_cache_backend, post_with_published_location, client,
+        django_assert_max_num_queries
+):
+    client.get("/")
+    with django_assert_max_num_queries(1):
+        client.get("/")
+    response = client.get("/?page=2")
+    assert response.status_code == HTTPStatus.OK
+    assert response.context is not None, (
+        "Убедитесь, что разные страницы ленты кешируются под разными ключами."
+    )
+
+
+def test_logged_in_pages_are_not_cached(
+        page_cache_backend, post_with_published_location, user_client
+):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert response.context is not None
+
+
+@pytest.mark.parametrize(
+    "unpublish", ["post", "category", "comment"]
+)
+def test_changes_invalidate_cached_pages(
+        page_cache_backend, mixer, post_with_published_location, client,
+        unpublish
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, text="Спам")
+    detail_url = f"/posts/{post.id}/"
+    assert "Спам" in client.get(detail_url).content.decode()
+    assert client.get("/").context["page_obj"]
+
+    if unpublish == "post":
+        post.is_published = False
+        post.save()
+    elif unpublish == "category":
+        post.category.is_published = False
+        post.category.save()
+    else:
+        comment.delete()
+
+    response = client.get(detail_url)
+    if unpublish == "comment":
+        assert "Спам" not in response.content.decode()
+    else:
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert not list(client.get("/").context["page_obj"])
+
+
+def test_only_author_name_changes_invalidate_pages(
+        page_cache_backend, mixer, post_with_published_location
+):
+    from blog.cache import SCOPE_SITE, cache_version
+
+    author = post_with_published_location.author
+    version = cache_version([SCOPE_SITE])
+    mixer.blend("auth.User")
+    author.email = "new@example.com"
+    author.save()
+    author.set_password("новый-пароль")
+    author.save(update_fields=["password"])
+    assert cache_version([SCOPE_SITE]) == version, (
+        "Убедитесь, что новые пользователи и изменения, которые не видны"
+        " на страницах, не сбрасывают кеш сайта."
+    )
+    author.first_name = "Новое имя"
+    author.save()
+    assert cache_version([SCOPE_SITE]) != version
+
+
+def test_invalid_page_params_are_not_cached(
+        page_cache_backend, post_with_published_location, client
+):
+    client.get("/?page=1")
+    assert client.get("/?page=01").context is None, (
+        "Убедитесь, что номер страницы приводится к каноническому виду."
+    )
+    for query in ("page=abc", "page=0", "page=100000", "cursor=мусор"):
+        assert client.get(f"/?{query}").status_code == HTTPStatus.OK
+        assert client.get(f"/?{query}").context is not None, (
+            "Убедитесь, что страницы с неверными page и cursor"
+            " не кешируются."
+        )
@@ -0,0 +1,126 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 25
+
+
+@pytest.fixture
+def many_posts(mixer: Mixer, user, published_category):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            is_published=True,
+            # Пары постов с одинаковой датой проверяют сортировку по id
+            pub_date=now - timedelta(days=1 + i // 2),
+        )
+        for i in range(N_POSTS)
+    ]
+
+
+def test_keyset_walks_feed_both_ways(many_posts):
+    from blog.utils import keyset_pagination, query_post
+
+    expected = list(
+        query_post().order_by("-pub_date", "-id").values_list("id", flat=True)
+    )
+    seen = []
+    pages = []
+    page = keyset_pagination(query_post())
+    while True:
+        pages.append(page)
+        seen.extend(post.id for post in page)
+        if not page.has_next():
+            break
+        page = keyset_pagination(query_post(), page.next_cursor)
+    assert seen == expected, (
+        "Убедитесь, что переход по курсору `next_cursor` проходит всю ленту"
+        " без пропусков и повторов."
+    )
+
+    page = pages[-1]
+    for previous in reversed(pages[:-1]):
+        page = keyset_pagination(query_post(), page.previous_cursor)
+        assert [p.id for p in page] == [p.id for p in previous]
+    assert not page.has_previous()
+
+
+def test_broken_cursor_falls_back_to_first_page(many_posts):
+    from blog.utils import keyset_pagination, query_post
+
+    first = keyset_pagination(query_post())
+    broken = keyset_pagination(query_post(), "not-a-cursor")
+    assert [p.id for p in broken] == [p.id for p in first]
+
+
+def test_large_feed_switches_to_cursor(
+        monkeypatch, many_posts, user_client
+):
+    from blog import utils
+
+    monkeypatch.setattr(utils, "MAX_OFFSET_POSTS", N_POSTS - 1)
+    response = user_client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    page_obj = response.context["page_obj"]
+    assert getattr(page_obj, "is_keyset", False)
+    assert f"?cursor={page_obj.next_cursor}" in response.content.decode()
+
+    response = user_client.get(f"/?cursor={page_obj.next_cursor}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["page_obj"].has_previous()
+
+
+def test_large_feed_rejects_page_numbers(monkeypatch, many_posts, client):
+    from blog import utils
+
+    monkeypatch.setattr(utils, "MAX_OFFSET_POSTS", N_POSTS - 1)
+    assert client.get("/?page=1").status_code == HTTPStatus.OK
+    for page in ("2", "last"):
+        assert client.get(f"/?page={page}").status_code == (
+            HTTPStatus.NOT_FOUND
+        ), (
+            "Убедитесь, что большая лента не отдает первую страницу"
+            " по адресу другой страницы."
+        )
+
+
+def test_small_feed_keeps_page_numbers(many_posts, user_client):
+    response = user_client.get("/?page=2")
+    assert response.status_code == HTTPStatus.OK
+    page_obj = response.context["page_obj"]
+    assert page_obj.number == 2
+    assert page_obj.paginator.count == N_POSTS
+
+
+@pytest.mark.parametrize("payload", [
+    ["n", "2020-01-01T00:00:00+00:00", 10 ** 30],
+    ["n", "0001-01-01T00:00:00+14:00", 1],
+    ["p", "9999-12-31T23:59:59-14:00", 1],
+])
+def test_out_of_range_cursor_falls_back_to_first_page(
+        many_posts, post_with_published_location, user_client, payload
+):
+    import base64
+    import json
+
+    token = base64.urlsafe_b64encode(
+        json.dumps(payload).encode()
+    ).decode().rstrip("=")
+    first = user_client.get("/").context["page_obj"]
+    response = user_client.get(f"/?cursor={token}")
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что курсор со значениями вне диапазона базы"
+        " не приводит к ошибке сервера."
+    )
+    assert list(response.context["page_obj"]) == list(first)
+    post = post_with_published_location
+    response = user_client.get(f"/posts/{post.id}/comments/?cursor={token}")
+    assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,73 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+POST_CARD = "includes/post_card.html"
+UNPUBLISHED_WARNING = "Пост снят с публикации админом"
+
+
+def rendered_cards(response):
+    return [t.name for t in response.templates].count(POST_CARD)
+
+
+def test_card_is_shared_between_feeds(
+        post_with_published_location, user, user_client
+):
+    post = post_with_published_location
+    response = user_client.get("/")
+    assert rendered_cards(response) == 1
+    for url in ("/", f"/category/{post.category.slug}/",
+                f"/profile/{user.username}/"):
+        response = user_client.get(url)
+        assert rendered_cards(response) == 0, (
+            "Убедитесь, что карточка поста берется из кеша во всех лентах."
+        )
+        assert post.title in response.content.decode()
+
+
+def test_card_is_rerendered_after_save(
+        post_with_published_location, user_client
+):
+    post = post_with_published_location
+    user_client.get("/")
+    post.title = "Новый заголовок"
+    post.save()
+    response = user_client.get("/")
+    assert rendered_cards(response) == 1
+    assert "Новый заголовок" in response.content.decode()
+
+
+def test_card_follows_database_changes_without_invalidation(
+        post_with_published_location, user_client
+):
+    from django.utils import timezone
+
+    from blog.models import Post
+
+    post = post_with_published_location
+    user_client.get("/")
+    # Так пост меняют воркер и планировщик в других процессах: их сброс
+    # кеша в памяти до веб-процесса не доходит
+    Post.objects.filter(pk=post.pk).update(
+        title="Обработан воркером", updated_at=timezone.now()
+    )
+    response = user_client.get("/")
+    assert rendered_cards(response) == 1, (
+        "Убедитесь, что ключ карточки зависит от updated_at поста из базы."
+    )
+    assert "Обработан воркером" in response.content.decode()
+
+def test_author_warnings_are_not_cached(
+        post_with_published_location, user, user_client
+):
+    post = post_with_published_location
+    profile_url = f"/profile/{user.username}/"
+    assert UNPUBLISHED_WARNING not in (
+        user_client.get(profile_url).content.decode()
+    )
+    post.is_published = False
+    post.save()
+    for _ in range(2):
+        response = user_client.get(profile_url)
+        assert UNPUBLISHED_WARNING in response.content.decode()
+        assert rendered_cards(response) == 1
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+# Дата изменения для ETag/Last-Modified, пост с автором, категорией
+# и местоположением, комментарии с авторами
+ANONYMOUS_QUERY_BUDGET = 3
+# Плюс сессия и пользователь
+LOGGED_QUERY_BUDGET = ANONYMOUS_QUERY_BUDGET + 2
+
+
+@pytest.mark.parametrize("n_comments", [1, 15])
+def test_detail_query_budget(
+        mixer, post_with_published_location, client, user_client,
+        django_assert_num_queries, n_comments
+):
+    post = post_with_published_location
+    mixer.cycle(n_comments).blend("blog.Comment", post=post)
+    url = f"/posts/{post.id}/"
+    with django_assert_num_queries(ANONYMOUS_QUERY_BUDGET):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    with django_assert_num_queries(LOGGED_QUERY_BUDGET):
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize(
+    "hidden",
+    [
+        {"is_published": False},
+        {"pub_date": timezone.now() + timedelta(days=1)},
+        {"category__is_published": False},
+    ],
+)
+def test_detail_hides_unpublished_from_others(
+        mixer, user, user_client, another_user_client, hidden
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        **{
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            "category__is_published": True,
+            **hidden,
+        },
+    )
+    url = f"/posts/{post.id}/"
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    assert another_user_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_comments_are_loaded_in_portions(
+        mixer, post_with_published_location, client
+):
+    from blog.constants import COMMENTS_ON_PAGE
+
+    post = post_with_published_location
+    n_comments = COMMENTS_ON_PAGE + 5
+    mixer.cycle(n_comments).blend("blog.Comment", post=post)
+
+    response = client.get(f"/posts/{post.id}/")
+    comments = response.context["comments"]
+    assert len(comments) == COMMENTS_ON_PAGE
+    assert comments.has_next()
+    fragment_url = f"/posts/{post.id}/comments/?cursor={comments.next_cursor}"
+    assert fragment_url in response.content.decode()
+
+    response = client.get(fragment_url)
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode()
+    assert "<html" not in content, (
+        "Убедитесь, что следующая порция комментариев отдается без base.html."
+    )
+    rest = response.context["comments"]
+    assert len(rest) == n_comments - COMMENTS_ON_PAGE
+    assert not rest.has_next()
+    seen = {c.id for c in comments} | {c.id for c in rest}
+    assert seen == set(post.comments.values_list("id", flat=True))
+
+
+def test_comments_fragment_respects_visibility(
+        mixer, user, another_user_client
+):
+    post = mixer.blend("blog.Post", author=user, is_published=False)
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,137 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from jobs.worker import run_pending_jobs
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_image(size, mode="RGB", fmt="JPEG", name="photo.jpg"):
+    buffer = BytesIO()
+    Image.new(mode, size, color=(73, 109, 137)).save(buffer, format=fmt)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@pytest.fixture
+def big_image_post(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        image=make_image((2000, 1000)),
+    )
+    run_pending_jobs()
+    return post
+
+
+def test_upload_is_processed_by_worker(mixer, user, user_client):
+    post = mixer.blend("blog.Post", author=user, image=make_image((800, 400)))
+    post.refresh_from_db()
+    assert post.image_variants == {}, (
+        "Убедитесь, что изображение не обрабатывается при сохранении поста."
+    )
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert "data-image-pending" in content and "<picture>" not in content
+
+    run_pending_jobs()
+    post.refresh_from_db()
+    assert post.image_variants["source"] == post.image.name
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert "<picture>" in content, (
+        "Убедитесь, что после обработки заглушка сменяется изображением."
+    )
+
+
+def test_variants_are_built_on_upload(big_image_post):
+    from blog.constants import POST_IMAGE_WIDTHS, RETINA_FACTOR
+
+    post = big_image_post
+    post.refresh_from_db()
+    variants = post.image_variants
+    assert variants["source"] == post.image.name
+    assert (variants["width"], variants["height"]) == (2000, 1000)
+    for name, width in POST_IMAGE_WIDTHS.items():
+        widths = [c["width"] for c in variants[name]]
+        assert widths == [width, width * RETINA_FACTOR]
+        for candidate in variants[name]:
+            assert candidate["height"] == candidate["width"] // 2
+            for key in ("webp", "jpeg"):
+                assert post.image.storage.exists(candidate[key])
+    with Image.open(post.image.storage.path(variants["card"][0]["webp"])) as img:
+        assert img.format == "WEBP"
+        assert img.size == (POST_IMAGE_WIDTHS["card"], 304)
+
+
+def test_small_images_are_not_upscaled(mixer):
+    post = mixer.blend(
+        "blog.Post", image=make_image((100, 50), "RGBA", "PNG", "small.png")
+    )
+    run_pending_jobs()
+    post.refresh_from_db()
+    card = post.image_variants["card"]
+    assert [c["width"] for c in card] == [100]
+
+
+def test_templates_emit_srcset(big_image_post, user_client):
+    post = big_image_post
+    for url in ("/", f"/posts/{post.id}/"):
+        content = user_client.get(url).content.decode()
+        assert "<picture>" in content
+        assert 'type="image/webp"' in content
+        assert "sizes=" in content and "srcset=" in content
+        assert 'width="' in content and 'height="' in content
+
+
+def test_removed_image_clears_variants(big_image_post):
+    post = big_image_post
+    post.image = None
+    post.save()
+    post.refresh_from_db()
+    assert post.image_variants == {}
+
+
+def test_decompression_bomb_is_not_retried(mixer, monkeypatch):
+    from jobs.models import Job
+
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+    post = mixer.blend("blog.Post", image=make_image((2000, 1000)))
+    run_pending_jobs()
+    post.refresh_from_db()
+    assert post.image_variants == {"source": post.image.name}
+    job = Job.objects.get(name="blog.process_post_image")
+    assert (job.status, job.attempts) == (Job.Status.DONE, 1), (
+        "Убедитесь, что слишком большое изображение отклоняется сразу."
+    )
+
+
+def test_old_variant_files_are_deleted(
+        big_image_post, django_capture_on_commit_callbacks
+):
+    from blog.images import variant_files
+
+    post = big_image_post
+    post.refresh_from_db()
+    storage = post.image.storage
+    old_files = variant_files(post.image_variants)
+    assert old_files and all(map(storage.exists, old_files))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = make_image((1200, 600), name="other.jpg")
+        post.save()
+        run_pending_jobs()
+    post.refresh_from_db()
+    new_files = variant_files(post.image_variants)
+    assert new_files and all(map(storage.exists, new_files))
+    assert not any(map(storage.exists, old_files)), (
+        "Убедитесь, что производные прежнего изображения удаляются."
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert not any(map(storage.exists, new_files)), (
+        "Убедитесь, что производные удаляются вместе с постом."
+    )
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer, post_with_published_location):
+    from blog.models import Post
+
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() + timedelta(minutes=10),
+        updated_at=timezone.now() - timedelta(days=1),
+    )
+    post.refresh_from_db()
+    return post
+
+
+def test_page_timeout_is_bounded_by_next_publication(scheduled_post):
+    from blog.cache import (
+        invalidate_page_cache,
+        next_scheduled_change,
+        page_cache_timeout,
+        SCOPE_FEEDS,
+    )
+
+    assert next_scheduled_change() == scheduled_post.pub_date
+    with override_settings(PAGE_CACHE_TIMEOUT=3600):
+        invalidate_page_cache(SCOPE_FEEDS)
+        assert 590 < page_cache_timeout() <= 600, (
+            "Убедитесь, что страница кешируется не дольше, чем до выхода"
+            " ближайшего отложенного поста."
+        )
+    scheduled_post.pub_date = timezone.now() - timedelta(minutes=1)
+    scheduled_post.save()
+    assert next_scheduled_change() is None
+
+
+def test_scheduler_publishes_due_posts(scheduled_post, client):
+    from blog.models import Post
+    from blog.publication import publish_due_posts
+
+    assert scheduled_post.title not in client.get("/").content.decode()
+    assert publish_due_posts() == 0
+
+    Post.objects.filter(pk=scheduled_post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1),
+    )
+    # Ленту без сброса кеша отдала бы закешированная страница
+    assert publish_due_posts() == 1
+    assert scheduled_post.title in client.get("/").content.decode(), (
+        "Убедитесь, что выход отложенного поста сбрасывает кеш лент."
+    )
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.updated_at >= scheduled_post.pub_date
+    assert publish_due_posts() == 0
+
+
+def test_scheduler_publishes_in_constant_queries(
+        mixer, scheduled_post, django_assert_max_num_queries
+):
+    from blog.models import Post
+    from blog.publication import publish_due_posts
+
+    mixer.cycle(20).blend(
+        "blog.Post", author=scheduled_post.author,
+        category=scheduled_post.category, is_published=True,
+    )
+    Post.objects.update(
+        pub_date=timezone.now() - timedelta(seconds=1),
+        updated_at=timezone.now() - timedelta(days=1),
+    )
+    with django_assert_max_num_queries(4):
+        assert publish_due_posts() == 21
+
+def test_scheduler_window(scheduled_post):
+    from blog.models import Post
+    from blog.publication import PublicationScheduler
+
+    scheduler = PublicationScheduler(max_sleep=30)
+    assert 0 < scheduler.tick() <= 30
+    Post.objects.filter(pk=scheduled_post.pk).update(
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    # После первой проверки смотрится только окно с ее момента
+    scheduler.tick()
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.updated_at < scheduled_post.pub_date
+
+    call_command("publish_scheduled", "--once")
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.updated_at >= scheduled_post.pub_date
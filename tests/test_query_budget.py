@@ -0,0 +1,48 @@
+import pytest
+
+from query_budget import (
+    World,
+    admin_changelists,
+    assert_constant_queries,
+    site_routes,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+ROUTES = site_routes()
+
+
+@pytest.fixture
+def world(mixer, user):
+    return World(mixer, user)
+
+
+@pytest.mark.parametrize("name", sorted(ROUTES))
+def test_site_pages(world, user_client, client, name):
+    # Автору доступны и страницы редактирования
+    assert_constant_queries(user_client, world, name, ROUTES[name])
+    assert_constant_queries(client, world, name, ROUTES[name])
+
+
+@pytest.mark.parametrize("name", admin_changelists())
+def test_admin_changelists(world, admin_client, name):
+    assert_constant_queries(admin_client, world, name)
+
+
+def test_violation_shows_sql_diff(world):
+    from django.http import HttpResponse
+
+    from blog.models import Comment
+
+    class NPlusOneClient:
+        """Страница, загружающая автора каждого комментария отдельно."""
+
+        def get(self, url):
+            names = [c.author.username for c in Comment.objects.all()]
+            return HttpResponse(", ".join(names))
+
+    with pytest.raises(pytest.fail.Exception) as failure:
+        assert_constant_queries(NPlusOneClient(), world, "blog:index")
+    message = str(failure.value)
+    assert "растет с объемом данных" in message
+    assert '+SELECT "auth_user"' in message
@@ -0,0 +1,83 @@
+import pytest
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import override_settings
+
+from jobs.mail import delivery_metrics
+from jobs.models import Job, QueuedEmail
+from jobs.worker import run_pending_jobs
+
+pytestmark = [pytest.mark.django_db]
+
+
+class Broken(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError("SMTP недоступен")
+
+
+@pytest.fixture
+def sent_emails(tmp_path):
+    path = tmp_path / "sent_emails"
+    with override_settings(
+        EMAIL_BACKEND="jobs.mail.QueuedEmailBackend",
+        QUEUED_EMAIL_BACKEND="django.core.mail.backends.filebased.EmailBackend",
+        EMAIL_FILE_PATH=path,
+    ):
+        yield path
+
+
+def sink_files(path):
+    return sorted(path.iterdir()) if path.exists() else []
+
+
+def test_password_reset_is_queued(sent_emails, user, client):
+    user.email = "reader@example.com"
+    user.save()
+    response = client.post(
+        "/auth/password_reset/", data={"email": user.email}
+    )
+    assert response.status_code == 302
+    assert not sink_files(sent_emails), (
+        "Убедитесь, что письмо не отправляется в запросе."
+    )
+    assert QueuedEmail.objects.filter(recipients=user.email).exists()
+
+    run_pending_jobs()
+    files = sink_files(sent_emails)
+    assert len(files) == 1
+    assert user.email in files[0].read_text()
+    assert delivery_metrics()["sent"] == 1
+
+
+def test_batch_uses_one_connection(sent_emails):
+    for number in range(5):
+        EmailMessage(f"Письмо {number}", "Текст", to=[f"{number}@a.ru"]).send()
+    assert Job.objects.filter(status=Job.Status.PENDING).count() == 1, (
+        "Убедитесь, что письма отправляются одной задачей."
+    )
+
+    run_pending_jobs()
+    # Файловый бэкенд открывает новый файл на каждое соединение
+    files = sink_files(sent_emails)
+    assert len(files) == 1, (
+        "Убедитесь, что пачка писем отправляется через одно соединение."
+    )
+    assert files[0].read_text().count("Subject:") == 5
+    assert not QueuedEmail.objects.exclude(status=QueuedEmail.Status.SENT)
+
+
+def test_failed_delivery_is_retried(sent_emails):
+    broken = f"{__name__}.Broken"
+    with override_settings(QUEUED_EMAIL_BACKEND=broken):
+        EmailMessage("Тема", "Текст", to=["a@ex.com"]).send()
+        run_pending_jobs()
+    email = QueuedEmail.objects.get()
+    assert email.status == QueuedEmail.Status.PENDING
+    assert "SMTP недоступен" in email.last_error
+    metrics = delivery_metrics()
+    assert metrics["pending"] == 1 and metrics["sent"] == 0
+
+    Job.objects.update(run_after=email.created_at)
+    run_pending_jobs()
+    email.refresh_from_db()
+    assert email.status == QueuedEmail.Status.SENT
@@ -0,0 +1,112 @@
+import sqlite3
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+REPLICA = "replica"
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """
+    Реплика в отдельном файле SQLite. Вместо репликации — копия
+    основной базы через backup API по вызову sync().
+    """
+    path = str(tmp_path / "replica.sqlite3")
+    connections.settings[REPLICA] = {
+        **connections["default"].settings_dict,
+        "NAME": path,
+    }
+
+    def sync():
+        connections[REPLICA].close()
+        primary = connections["default"]
+        primary.ensure_connection()
+        target = sqlite3.connect(path)
+        primary.connection.backup(target)
+        target.close()
+
+    sync()
+    yield sync
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def make_post(mixer, post, title):
+    return mixer.blend(
+        "blog.Post",
+        title=title,
+        author=post.author,
+        category=post.category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_read_only_views_use_replica(
+        mixer, post_with_published_location, client, replica
+):
+    from blog.cache import page_cache
+
+    make_post(mixer, post_with_published_location, "Еще не в реплике")
+    content = client.get("/").content.decode()
+    assert post_with_published_location.title in content
+    assert "Еще не в реплике" not in content, (
+        "Убедитесь, что главная страница читает из реплики."
+    )
+    replica()
+    # Страница, собранная по отставшей реплике, живет в кеше до таймаута
+    page_cache().clear()
+    assert "Еще не в реплике" in client.get("/").content.decode()
+
+
+def test_reads_are_pinned_after_own_write(
+        post_with_published_location, user_client, replica
+):
+    from blogicum.db.middleware import PIN_COOKIE
+
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    response = user_client.post(f"{url}comment/", data={"text": "Свой"})
+    assert PIN_COOKIE in response.cookies
+    assert "Свой" in user_client.get(url).content.decode(), (
+        "Убедитесь, что после записи пользователь читает из основной базы."
+    )
+
+    del user_client.cookies[PIN_COOKIE]
+    assert "Свой" not in user_client.get(url).content.decode()
+
+
+def test_router_without_replica(post_with_published_location, client):
+    from blogicum.db.router import ReplicaRouter
+    from blog.models import Post
+
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) == "default"
+    assert router.db_for_write(Post) == "default"
+    assert router.allow_migrate("default", "blog") is None
+    response = client.get("/")
+    assert post_with_published_location.title in response.content.decode()
+
+
+def test_search_reads_index_from_replica(
+        mixer, post_with_published_location, client, replica
+):
+    from django.test.utils import CaptureQueriesContext
+
+    found = make_post(mixer, post_with_published_location, "Озеро в реплике")
+    replica()
+    with CaptureQueriesContext(connections["default"]) as primary:
+        with CaptureQueriesContext(connections[REPLICA]) as secondary:
+            response = client.get("/search/", {"q": "озеро"})
+    assert f"/posts/{found.id}/" in response.content.decode()
+    assert any("blog_post_fts" in q["sql"] for q in secondary), (
+        "Убедитесь, что поиск по индексу идет в ту же базу, что и"
+        " загрузка постов."
+    )
+    assert not any("blog_post_fts" in q["sql"] for q in primary)
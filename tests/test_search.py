@@ -0,0 +1,106 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, text="Текст", **fields):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **fields,
+        }
+        return mixer.blend("blog.Post", title=title, text=text, **fields)
+    return make
+
+
+def search(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+def test_results_are_ranked_and_highlighted(make_post, client):
+    in_text = make_post("Заметки", "Поездка на Байкал зимой")
+    in_title = make_post("Байкал", "Лед и ветер")
+    make_post("Другое", "Ничего общего")
+
+    page = search(client, "байкал").context["page_obj"]
+    assert list(page) == [in_title, in_text], (
+        "Убедитесь, что совпадения в заголовке ранжируются выше."
+    )
+    assert "<mark>Байкал</mark>" in page[0].search_title
+    assert "<mark>Байкал</mark>" in page[1].search_snippet
+
+
+def test_prefix_and_escaping(make_post, client):
+    make_post("<script>", "Путешествия по горам")
+    content = search(client, 'путешеств"* (').content.decode()
+    assert "<mark>Путешествия</mark>" in content
+    assert "<script>" not in content
+
+
+def test_index_follows_edits(make_post, client):
+    post = make_post("Старый заголовок")
+    post.title = "Новый заголовок"
+    post.save()
+    assert not search(client, "старый").context["page_obj"]
+    assert list(search(client, "новый").context["page_obj"]) == [post]
+    post.delete()
+    assert not search(client, "новый").context["page_obj"]
+
+
+def test_hidden_posts_are_not_found(make_post, mixer, client):
+    make_post("Скрытый", is_published=False)
+    make_post("Скрытый", pub_date=timezone.now() + timedelta(days=1))
+    make_post(
+        "Скрытый",
+        category=mixer.blend("blog.Category", is_published=False),
+    )
+    assert not search(client, "скрытый").context["page_obj"]
+
+
+def test_cursor_pagination(make_post, client, django_assert_max_num_queries):
+    from blog.constants import POSTS_ON_PAGE
+
+    posts = {make_post(f"Озеро {i}") for i in range(POSTS_ON_PAGE + 3)}
+    first = search(client, "озеро").context["page_obj"]
+    assert len(first) == POSTS_ON_PAGE and first.has_next()
+    # Индекс с проверкой видимости и загрузка страницы, без COUNT(*)
+    with django_assert_max_num_queries(2):
+        second = search(
+            client, "озеро", cursor=first.next_cursor
+        ).context["page_obj"]
+    assert len(second) == 3 and not second.has_next()
+    assert set(first) | set(second) == posts
+
+
+def test_visibility_is_checked_before_limit(make_post):
+    from blog.search import rank_candidates
+    from blog.utils import query_post
+
+    visible = make_post("Озеро")
+    for _ in range(3):
+        make_post("Озеро", is_published=False)
+    assert [pk for _, pk in rank_candidates("озеро", query_post(), 2)] == [
+        visible.pk
+    ], "Убедитесь, что скрытые посты не вытесняют видимые из кандидатов."
+
+
+def test_missing_candidates_are_skipped(make_post, monkeypatch):
+    from blog import search
+    from blog.utils import query_post
+
+    post = make_post("Озеро")
+    monkeypatch.setattr(
+        search, "rank_candidates",
+        lambda query, posts: [(-2.0, post.pk + 100), (-1.0, post.pk)],
+    )
+    assert list(search.search_posts(query_post(), "озеро")) == [post]
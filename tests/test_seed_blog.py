@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def seed(**options):
+    out = StringIO()
+    call_command("seed_blog", seed=1, stdout=out, **{
+        "users": 20, "categories": 5, "locations": 4, "posts": 400,
+        "comments": 2000, "batch_size": 64, **options,
+    })
+    return out.getvalue()
+
+
+def test_seed_counts_and_distributions():
+    from django.db.models import Count, F
+
+    from blog.models import Comment, Post, User
+    from blog.utils import published_comment_count
+
+    output = seed()
+    assert "posts — 400" in output
+    assert User.objects.count() == 20
+    assert Comment.objects.count() == 2000
+    posts = Post.objects.all()
+    assert posts.count() == 400
+
+    future = posts.filter(pub_date__gt=timezone.now())
+    assert future.exists(), "Убедитесь, что создаются отложенные посты."
+    assert not future.filter(updated_at__gte=F("pub_date")).exists(), (
+        "Отложенные посты должны ждать выпуска планировщиком."
+    )
+    assert posts.filter(is_published=False).exists()
+    assert posts.filter(location=None).exists()
+
+    assert not posts.annotate(actual=published_comment_count()).exclude(
+        comment_count=F("actual")
+    ).exists(), "Убедитесь, что comment_count заполнен после вставки."
+    counts = list(posts.values_list("comment_count", flat=True))
+    assert max(counts) > 10 * sum(counts) / len(counts), (
+        "Убедитесь, что комментарии распределены неравномерно."
+    )
+    authors = list(
+        User.objects.annotate(total=Count("posts")).order_by("-total")
+    )
+    assert authors[0].total > 3 * authors[len(authors) // 2].total
+
+
+def test_seed_writes_in_batches():
+    with CaptureQueriesContext(connection) as queries:
+        seed(users=10, categories=2, locations=0, posts=50, comments=0,
+             batch_size=20)
+    inserts = [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith('INSERT INTO "blog_post"')
+    ]
+    # 50 постов пачками по 20: 20 + 20 + 10
+    assert len(inserts) == 3
+
+
+def test_seed_is_repeatable():
+    from blog.models import Category
+
+    seed(posts=0, comments=0)
+    seed(posts=0, comments=0)
+    assert Category.objects.count() == 10, (
+        "Повторный запуск не должен конфликтовать по slug и username."
+    )
+    with pytest.raises(CommandError):
+        seed(users=0)
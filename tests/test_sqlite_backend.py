@@ -0,0 +1,152 @@
+import threading
+import time
+
+import pytest
+from django.db import connections, transaction
+
+pytestmark = [pytest.mark.django_db]
+
+WRITERS = 8
+WRITES = 25
+
+
+@pytest.fixture
+def stress_db(tmp_path):
+    """Регистрирует в каждом потоке соединение с отдельным файлом базы."""
+    from blogicum.db.base import DatabaseWrapper
+
+    settings_dict = {
+        **connections["default"].settings_dict,
+        "NAME": str(tmp_path / "stress.sqlite3"),
+        "OPTIONS": {"pragmas": {"busy_timeout": 10_000}},
+    }
+
+    def connect(alias="stress", **options):
+        wrapper = DatabaseWrapper(
+            {**settings_dict, "OPTIONS": {
+                **settings_dict["OPTIONS"], **options
+            }},
+            alias,
+        )
+        connections[alias] = wrapper
+        return wrapper
+
+    with connect().cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER)"
+        )
+        cursor.execute("INSERT INTO counter VALUES (1, 0)")
+    yield connect
+    for alias in ("stress", "reader"):
+        if alias in connections:
+            connections[alias].close()
+
+
+def in_thread(target):
+    errors = []
+
+    def run():
+        try:
+            target()
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connections["stress"].close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, errors
+
+
+def test_pragmas_are_applied(stress_db):
+    with stress_db().cursor() as cursor:
+        pragmas = {
+            name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("journal_mode", "synchronous", "busy_timeout")
+        }
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "busy_timeout": 10_000,
+    }
+
+
+def test_concurrent_read_modify_write(stress_db):
+    def increment():
+        connection = stress_db()
+        for _ in range(WRITES):
+            with transaction.atomic(using="stress"):
+                with connection.cursor() as cursor:
+                    value = cursor.execute(
+                        "SELECT value FROM counter WHERE id = 1"
+                    ).fetchone()[0]
+                    cursor.execute(
+                        "UPDATE counter SET value = %s WHERE id = 1",
+                        [value + 1],
+                    )
+
+    threads = [in_thread(increment) for _ in range(WRITERS)]
+    for thread, _ in threads:
+        thread.join()
+    errors = [error for _, thread_errors in threads for error in thread_errors]
+    assert not errors, (
+        "Убедитесь, что конкурентные транзакции не падают с"
+        f" «database is locked»: {errors[:3]}"
+    )
+    with stress_db().cursor() as cursor:
+        total = cursor.execute("SELECT value FROM counter").fetchone()[0]
+    assert total == WRITERS * WRITES, "Обновления не должны теряться."
+
+
+def test_readers_do_not_block_during_writes(stress_db):
+    write_started = threading.Event()
+    write_done = threading.Event()
+
+    def write():
+        connection = stress_db()
+        with transaction.atomic(using="stress"):
+            with connection.cursor() as cursor:
+                cursor.execute("UPDATE counter SET value = 100")
+            write_started.set()
+            # Держим пишущую транзакцию открытой
+            write_done.wait(5)
+
+    writer, writer_errors = in_thread(write)
+    assert write_started.wait(5)
+    durations = []
+
+    def read():
+        connection = stress_db()
+        for _ in range(20):
+            started = time.monotonic()
+            with connection.cursor() as cursor:
+                value = cursor.execute(
+                    "SELECT value FROM counter"
+                ).fetchone()[0]
+            durations.append(time.monotonic() - started)
+            assert value == 0, "Читатель видит снимок до коммита."
+
+    readers = [in_thread(read) for _ in range(4)]
+    for thread, _ in readers:
+        thread.join()
+    write_done.set()
+    writer.join()
+    assert not writer_errors
+    assert not [error for _, errors in readers for error in errors]
+    assert max(durations) < 0.5, (
+        "Убедитесь, что читатели не ждут окончания пишущей транзакции."
+    )
+
+    # Коммит пишущей транзакции не ждет открытых читателей
+    reader = stress_db(alias="reader")
+    reader.set_autocommit(False)
+    with reader.cursor() as cursor:
+        cursor.execute("SELECT value FROM counter").fetchone()
+    writer = stress_db()
+    started = time.monotonic()
+    with transaction.atomic(using="stress"):
+        with writer.cursor() as cursor:
+            cursor.execute("UPDATE counter SET value = 200")
+    assert time.monotonic() - started < 0.5
+    reader.rollback()
+    reader.set_autocommit(True)
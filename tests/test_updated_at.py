@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_old(instance):
+    old = timezone.now() - timedelta(days=1)
+    type(instance).objects.filter(pk=instance.pk).update(updated_at=old)
+    instance.refresh_from_db()
+    return old
+
+
+def test_partial_save_updates_timestamp(post_with_published_location):
+    post = post_with_published_location
+    old = make_old(post)
+    post.is_published = False
+    # Так сохраняет строки list_editable в админке и save(update_fields=...)
+    post.save(update_fields=["is_published"])
+    post.refresh_from_db()
+    assert post.updated_at > old, (
+        "Убедитесь, что `updated_at` обновляется и при частичном сохранении."
+    )
+
+
+def test_last_modified_by_scope(mixer, post_with_published_location):
+    from blog.models import Comment, Post
+
+    post = post_with_published_location
+    assert Comment.objects.filter(post=post).last_modified() is None
+
+    comment = mixer.blend("blog.Comment", post=post)
+    assert post.comments.last_modified() == comment.updated_at
+    assert post.category.posts.last_modified() == (
+        Post.objects.get(pk=post.pk).updated_at
+    )
+    assert post.author.posts.last_modified() is not None
+
+
+def test_comment_delete_touches_post(mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    old = make_old(post)
+    comment.delete()
+    post.refresh_from_db()
+    assert post.updated_at > old